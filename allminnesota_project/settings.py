@@ -5,8 +5,11 @@ Uses django-environ for SECRET_KEY and DATABASE_URL from .env.
 """
 
 import environ
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -76,6 +79,76 @@ DATABASES = {
         default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'.replace('\\', '/'),
     )
 }
+# Keep connections open between requests (seconds; 0 = close after each request) and check
+# them before reuse so a restarted database doesn't cause errors.
+DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+# PostgreSQL only. DB_POOL: psycopg 3 connection pool per process (psycopg[pool] in
+# requirements.txt); replaces persistent connections. DB_PGBOUNCER: DATABASE_URL points at pgbouncer in
+# transaction mode, which can't keep server-side cursors open across statements.
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    if env.bool('DB_POOL', default=False):
+        if find_spec('psycopg_pool') is None:
+            # Otherwise the first connection fails with a confusing driver error
+            raise ImproperlyConfigured('DB_POOL needs psycopg 3 with its pool: pip install -r requirements.txt')
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=1),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=4),
+            'timeout': env.int('DB_POOL_TIMEOUT', default=10),
+        }
+    if env.bool('DB_PGBOUNCER', default=False):
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Cache: must be shared across gunicorn workers in production so signal-driven
+# invalidation reaches every process. Use CACHE_URL (e.g. rediscache://...) to override.
+CACHES = {
+    'default': env.cache(
+        'CACHE_URL',
+        default='locmemcache://' if DEBUG else f'filecache://{BASE_DIR / "cache"}'.replace('\\', '/'),
+    )
+}
+
+# Sessions: read from the cache, written through to the database so they survive a cache clear
+SESSION_ENGINE = env('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+# Logged-in staff are loaded from the in-process staff cache (core/staff.py). Logins get the
+# first backend; ModelBackend stays so sessions that were started with it remain valid.
+AUTHENTICATION_BACKENDS = ['core.staff.StaffCacheBackend', 'django.contrib.auth.backends.ModelBackend']
+
+# Public page cache (core.cache): seconds a rendered page may be served before re-rendering.
+# Pages are also invalidated on model changes and when the next upcoming event starts.
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=3600)
+
+# Background jobs (core/jobs.py) are processed by `manage.py run_worker`, in development too.
+# JOBS_EAGER runs them in-process right after commit instead (no worker needed).
+JOBS_EAGER = env.bool('JOBS_EAGER', default=False)
+
+# E-mail staff about new volunteer sign-ups and contact messages (sent as jobs)
+STAFF_NOTIFICATIONS = env.bool('STAFF_NOTIFICATIONS', default=False)
+SITE_URL = env('SITE_URL', default='')
+email_config = env.email_url('EMAIL_URL', default='consolemail://')
+EMAIL_BACKEND = email_config['EMAIL_BACKEND']
+EMAIL_HOST = email_config['EMAIL_HOST'] or 'localhost'
+EMAIL_PORT = email_config['EMAIL_PORT'] or 25
+EMAIL_HOST_USER = email_config['EMAIL_HOST_USER'] or ''
+EMAIL_HOST_PASSWORD = email_config['EMAIL_HOST_PASSWORD'] or ''
+EMAIL_USE_TLS = email_config.get('EMAIL_USE_TLS', False)
+EMAIL_USE_SSL = email_config.get('EMAIL_USE_SSL', False)
+EMAIL_FILE_PATH = email_config['EMAIL_FILE_PATH'] or None
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+
+# Browser/proxy cache lifetime (seconds) of the Coming Soon page served to anonymous visitors
+COMING_SOON_MAX_AGE = env.int('COMING_SOON_MAX_AGE', default=60)
+
+# Throttle public form POSTs per client IP and per e-mail (core/ratelimit.py; buckets in CACHES)
+RATELIMIT_ENABLED = env.bool('RATELIMIT_ENABLED', default=True)
+# META key holding the client address; nginx sets X-Real-IP. Use '' when not behind a proxy.
+RATELIMIT_IP_HEADER = env('RATELIMIT_IP_HEADER', default='HTTP_X_REAL_IP')
+# Per-form overrides of the view defaults, e.g. {'volunteer': {'ip': '10/10m', 'email': '3/d'}}
+RATELIMIT_RATES = {}
+
+# Dashboard analytics (core/analytics.py): a panel taking longer than this (ms) is logged
+ANALYTICS_PANEL_MS = env.int('ANALYTICS_PANEL_MS', default=100)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -93,6 +166,19 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'core' / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Fingerprinted file names (style.3f2a9c1b4e7d.css) so nginx can cache them forever. Needs the
+# manifest written by collectstatic (`python manage.py build_assets`), so it is switched on where
+# that has run (production) rather than following DEBUG.
+STATIC_MANIFEST = env.bool('STATIC_MANIFEST', default=False)
+if STATIC_MANIFEST:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+    }
+# Serve Bootstrap/Font Awesome/SortableJS and the resized logo from our static files instead
+# of the CDNs. Until `python manage.py build_assets` has built them (a fresh checkout) the
+# templates fall back to the CDNs; `manage.py check` warns about that when DEBUG is off.
+SELF_HOSTED_ASSETS = env.bool('SELF_HOSTED_ASSETS', default=True)
 
 # Media files (event images, etc.)
 MEDIA_URL = 'media/'
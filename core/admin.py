@@ -1,13 +1,27 @@
 """
 Django admin registration for All Minnesota models.
 Includes distribution sites, donations, food orders, meal kit distributions, partners.
+Volunteers, donations and distributions can be exported as streaming CSV/JSONL (core.exports);
+volunteers, donations, sites and partners can be imported from CSV/XLSX (core.imports).
+Pending volunteers can be assigned to sites in bulk (core.assignment), after a preview.
+Duplicate sign-up candidates (core.dedup) are listed here; they are merged on the dashboard.
+Changelists join the foreign keys they display (list_select_related) and annotate their
+counts, so a page costs the same number of queries however many rows it shows; large
+tables skip the unfiltered total count (show_full_result_count). core/tests.py checks this.
 """
 
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from .assignment import assign_volunteers
+from .exports import ExportAdminMixin
+from .imports import ImportAdminMixin
 from .models import (
     FundraisingGoal,
     Event,
     VolunteerSignUp,
+    DuplicateCandidate,
     ContactMessage,
     ImpactUpdate,
     DistributionSite,
@@ -17,6 +31,7 @@ from .models import (
     PartnerOrganization,
     PartnerContact,
     Task,
+    Job,
 )
 
 
@@ -26,6 +41,15 @@ class FundraisingGoalAdmin(admin.ModelAdmin):
         'goal_title', 'target_amount', 'current_amount',
         'meals_funded', 'volunteers_count', 'last_updated',
     ]
+    # Totals are maintained from donations/distributions/sign-ups (core.totals)
+    readonly_fields = ['current_amount', 'meals_funded', 'volunteers_count']
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Don't write back stale totals over concurrent F() increments
+            obj.save(update_fields=[*form.changed_data, 'last_updated'])
+        else:
+            super().save_model(request, obj, form, change)
 
 
 @admin.register(Event)
@@ -35,29 +59,77 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(DistributionSite)
-class DistributionSiteAdmin(admin.ModelAdmin):
+class DistributionSiteAdmin(ImportAdminMixin, admin.ModelAdmin):
     list_display = [
-        'name', 'city_state', 'capacity_meals', 'capacity_volunteers',
-        'is_active', 'updated_at',
+        'name', 'city_state', 'region', 'capacity_meals', 'capacity_volunteers',
+        'volunteer_count', 'is_active', 'updated_at',
     ]
-    list_filter = ['is_active']
+    list_filter = ['is_active', 'region']
     search_fields = ['name', 'city_state', 'address']
+    import_kind = 'sites'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            volunteer_count=Count('volunteers', filter=~Q(volunteers__status='inactive')),
+        )
+
+    @admin.display(description='Volunteers', ordering='volunteer_count')
+    def volunteer_count(self, obj):
+        return obj.volunteer_count
 
 
 @admin.register(VolunteerSignUp)
-class VolunteerSignUpAdmin(admin.ModelAdmin):
+class VolunteerSignUpAdmin(ImportAdminMixin, ExportAdminMixin, admin.ModelAdmin):
     list_display = [
         'first_name', 'last_name', 'email', 'region',
         'site', 'status', 'submitted_at',
     ]
     list_filter = ['status', 'region']
+    list_select_related = ['site']
+    show_full_result_count = False
     search_fields = ['first_name', 'last_name', 'email']
     raw_id_fields = ['site']
+    import_kind = 'volunteers'
+    export_fields = [
+        ('id', 'id'), ('first_name', 'first_name'), ('last_name', 'last_name'),
+        ('email', 'email'), ('phone', 'phone'), ('region', 'region'),
+        ('availability', 'availability'), ('notes', 'notes'), ('status', 'status'),
+        ('site__name', 'site'), ('submitted_at', 'submitted_at'),
+    ]
+    actions = [*ExportAdminMixin.actions, 'assign_to_sites']
+
+    @admin.action(description='Assign selected pending volunteers to sites', permissions=['change'])
+    def assign_to_sites(self, request, queryset):
+        """Show the planned assignment; the confirmation form posts back with apply=1 to save it."""
+        if request.POST.get('apply'):
+            plan, updated = assign_volunteers(queryset)
+            sites = sum(1 for load in plan.sites if load.volunteer_ids)
+            self.message_user(request, f'{updated} volunteer(s) assigned to {sites} site(s).')
+            return None
+        plan, _updated = assign_volunteers(queryset, dry_run=True)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Assign volunteers to sites',
+            'plan': plan,
+            'selected': request.POST.getlist(admin.helpers.ACTION_CHECKBOX_NAME),
+            'action': 'assign_to_sites',
+        }
+        return TemplateResponse(request, 'admin/core/assign_volunteers.html', context)
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ['first', 'second', 'score', 'reasons', 'status', 'created_at']
+    list_filter = ['status']
+    list_select_related = ['first', 'second']
+    raw_id_fields = ['first', 'second']
 
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'submitted_at']
+    show_full_result_count = False
     search_fields = ['name', 'email', 'subject']
 
 
@@ -67,17 +139,26 @@ class ImpactUpdateAdmin(admin.ModelAdmin):
         'amount_raised', 'meals_funded', 'volunteers',
         'updated_at', 'updated_by',
     ]
+    list_select_related = ['updated_by']
 
 
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
+class DonationAdmin(ImportAdminMixin, ExportAdminMixin, admin.ModelAdmin):
     list_display = [
         'amount', 'received_at', 'donor_name', 'source',
         'recorded_at', 'recorded_by',
     ]
     list_filter = ['source']
+    list_select_related = ['recorded_by']
+    show_full_result_count = False
     search_fields = ['donor_name', 'note']
     date_hierarchy = 'received_at'
+    import_kind = 'donations'
+    export_fields = [
+        ('id', 'id'), ('amount', 'amount'), ('received_at', 'received_at'),
+        ('donor_name', 'donor_name'), ('source', 'source'), ('note', 'note'),
+        ('recorded_at', 'recorded_at'), ('recorded_by__username', 'recorded_by'),
+    ]
 
 
 @admin.register(FoodOrder)
@@ -87,47 +168,85 @@ class FoodOrderAdmin(admin.ModelAdmin):
         'site', 'ordered_by', 'created_at',
     ]
     list_filter = ['status']
+    list_select_related = ['site', 'ordered_by']
     search_fields = ['supplier', 'description']
     raw_id_fields = ['site', 'ordered_by']
     date_hierarchy = 'order_date'
 
 
 @admin.register(MealKitDistribution)
-class MealKitDistributionAdmin(admin.ModelAdmin):
+class MealKitDistributionAdmin(ExportAdminMixin, admin.ModelAdmin):
     list_display = [
         'distribution_date', 'site', 'meal_kits_count', 'format',
         'recorded_at', 'recorded_by',
     ]
     list_filter = ['format']
+    list_select_related = ['site', 'recorded_by']
+    show_full_result_count = False
     raw_id_fields = ['site', 'recorded_by']
     date_hierarchy = 'distribution_date'
+    export_fields = [
+        ('id', 'id'), ('distribution_date', 'distribution_date'), ('site__name', 'site'),
+        ('meal_kits_count', 'meal_kits_count'), ('format', 'format'), ('notes', 'notes'),
+        ('recorded_at', 'recorded_at'), ('recorded_by__username', 'recorded_by'),
+    ]
 
 
 class PartnerContactInline(admin.TabularInline):
     model = PartnerContact
     extra = 1
 
+    def get_queryset(self, request):
+        # Each row's label (PartnerContact.__str__) shows the partner's name
+        return super().get_queryset(request).select_related('partner')
+
 
 @admin.register(PartnerOrganization)
-class PartnerOrganizationAdmin(admin.ModelAdmin):
-    list_display = ['name', 'org_type', 'phone', 'email', 'is_active', 'updated_at']
+class PartnerOrganizationAdmin(ImportAdminMixin, admin.ModelAdmin):
+    list_display = ['name', 'org_type', 'phone', 'email', 'contact_count', 'is_active', 'updated_at']
     list_filter = ['org_type', 'is_active']
     search_fields = ['name', 'email', 'notes']
+    import_kind = 'partners'
     inlines = [PartnerContactInline]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(contact_count=Count('contacts'))
+
+    @admin.display(description='Contacts', ordering='contact_count')
+    def contact_count(self, obj):
+        return obj.contact_count
+
 
 @admin.register(PartnerContact)
 class PartnerContactAdmin(admin.ModelAdmin):
     list_display = ['name', 'partner', 'role', 'email', 'phone', 'is_primary']
     list_filter = ['is_primary']
+    list_select_related = ['partner']
     search_fields = ['name', 'email']
     raw_id_fields = ['partner']
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ['title', 'status', 'assigned_to', 'due_date', 'order', 'updated_at']
+    list_display = ['title', 'status', 'assigned_to', 'due_date', 'rank', 'updated_at']
     list_filter = ['status']
+    list_select_related = ['assigned_to']
     search_fields = ['title', 'description']
     raw_id_fields = ['assigned_to', 'created_by']
     date_hierarchy = 'due_date'
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    show_full_result_count = False
+    readonly_fields = ['locked_at', 'locked_by', 'last_error', 'created_at', 'finished_at']
+    actions = ['retry_jobs']
+
+    @admin.action(description='Retry selected jobs now')
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status='running').update(
+            status='queued', attempts=0, run_after=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f'{count} job(s) queued.')
@@ -0,0 +1,211 @@
+"""
+Operations analytics (dashboard/analytics/): donations by month and source, meal kits by
+site and format, food spend by supplier and cost per kit by site and month.
+Each panel is one GROUP BY query (cost per kit: one per side) run under a query budget;
+the result is cached until a Donation, FoodOrder, MealKitDistribution or DistributionSite
+changes (signals and imports bump ANALYTICS_VERSION_KEY after commit), so repeat views run
+no queries. After each change a refresh_analytics job recomputes the default period in the
+background, so with years of rows staff still get cached panels.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .jobs import enqueue, job
+from .models import Donation, FoodOrder, MealKitDistribution
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_VERSION_KEY = 'core:analytics:version'
+REFRESH_QUEUED_KEY = 'core:analytics:refresh_queued'
+ANALYTICS_TIMEOUT = 24 * 3600
+DEFAULT_MONTHS = 24
+
+
+def get_analytics_version():
+    version = cache.get(ANALYTICS_VERSION_KEY)
+    if version is None:
+        cache.add(ANALYTICS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(ANALYTICS_VERSION_KEY)
+    return version
+
+
+def invalidate_analytics():
+    """
+    Drop the cached panels. Call it after commit (a view could otherwise cache data from
+    before the change under the new version) and the panels are recomputed by a job.
+    """
+    cache.set(ANALYTICS_VERSION_KEY, time.time_ns(), None)
+    # One refresh job at a time: a bulk change shouldn't queue one per row
+    if cache.add(REFRESH_QUEUED_KEY, True, 300):
+        enqueue('refresh_analytics')
+
+
+@contextmanager
+def query_budget(name, max_queries, max_ms=None):
+    """
+    Count the queries (and time) spent in the block. Going over max_queries or max_ms
+    (default ANALYTICS_PANEL_MS) logs a warning; the page still renders and shows the
+    counts in red. Yields a dict filled with 'queries' and 'ms'.
+    """
+    stats = {'queries': 0, 'ms': 0.0}
+
+    def count(execute, sql, params, many, context):
+        stats['queries'] += 1
+        return execute(sql, params, many, context)
+
+    if max_ms is None:
+        max_ms = getattr(settings, 'ANALYTICS_PANEL_MS', 100)
+    started = time.perf_counter()
+    with connection.execute_wrapper(count):
+        yield stats
+    stats['ms'] = round((time.perf_counter() - started) * 1000, 1)
+    if stats['queries'] > max_queries:
+        logger.warning('%s: %s queries, budget is %s', name, stats['queries'], max_queries)
+    if stats['ms'] > max_ms:
+        logger.warning('%s took %s ms, budget is %s ms', name, stats['ms'], max_ms)
+
+
+def first_month(months, today=None):
+    """First day of the month `months - 1` months before today's month."""
+    today = today or timezone.localdate()
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month(value):
+    # TruncMonth of a DateField comes back as a date; some backends return a datetime
+    return value.date() if hasattr(value, 'date') else value
+
+
+def donations_by_month(since):
+    """[{month, source, label, amount, count}] newest month first."""
+    labels = dict(Donation.SOURCE_CHOICES)
+    rows = (
+        Donation.objects.filter(received_at__gte=since)
+        .annotate(month=TruncMonth('received_at'))
+        .values('month', 'source')
+        .annotate(amount=Sum('amount'), count=Count('pk'))
+        .order_by('-month', 'source')
+    )
+    return [
+        {**row, 'month': _month(row['month']), 'label': labels.get(row['source'], row['source'])}
+        for row in rows
+    ]
+
+
+def kits_by_site(since):
+    """[{site, format, label, kits, count}] by site name."""
+    labels = dict(MealKitDistribution.FORMAT_CHOICES)
+    rows = (
+        MealKitDistribution.objects.filter(distribution_date__gte=since)
+        .values('site__name', 'format')
+        .annotate(kits=Sum('meal_kits_count'), count=Count('pk'))
+        .order_by('site__name', 'format')
+    )
+    return [
+        {'site': row['site__name'], 'format': row['format'], 'label': labels.get(row['format'], row['format']),
+         'kits': row['kits'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _spend_orders():
+    return FoodOrder.objects.exclude(status='cancelled').filter(total_cost__isnull=False)
+
+
+def spend_by_supplier(since):
+    """[{supplier, spend, count}] highest spend first; cancelled and unpriced orders don't count."""
+    return list(
+        _spend_orders().filter(order_date__gte=since)
+        .values('supplier')
+        .annotate(spend=Sum('total_cost'), count=Count('pk'))
+        .order_by('-spend', 'supplier')
+    )
+
+
+def cost_per_kit(since):
+    """
+    [{site, month, spend, kits, cost}] newest month first: food spend ordered for a site in
+    a month divided by the kits it distributed that month (cost is None without kits).
+    """
+    cells = defaultdict(lambda: {'spend': Decimal('0'), 'kits': 0})
+    spend = (
+        _spend_orders().filter(order_date__gte=since, site__isnull=False)
+        .annotate(month=TruncMonth('order_date'))
+        .values('site__name', 'month')
+        .annotate(total=Sum('total_cost'))
+        .order_by()
+    )
+    for row in spend:
+        cells[row['site__name'], _month(row['month'])]['spend'] += row['total']
+    kits = (
+        MealKitDistribution.objects.filter(distribution_date__gte=since)
+        .annotate(month=TruncMonth('distribution_date'))
+        .values('site__name', 'month')
+        .annotate(total=Sum('meal_kits_count'))
+        .order_by()
+    )
+    for row in kits:
+        cells[row['site__name'], _month(row['month'])]['kits'] += row['total']
+    rows = [
+        {'site': site, 'month': month, **cell,
+         'cost': (cell['spend'] / cell['kits']).quantize(Decimal('0.01')) if cell['kits'] else None}
+        for (site, month), cell in cells.items()
+    ]
+    rows.sort(key=lambda r: (-r['month'].toordinal(), r['site']))
+    return rows
+
+
+# name -> (title, function(since), max queries)
+PANELS = {
+    'donations_by_month': ('Donations by month and source', donations_by_month, 1),
+    'kits_by_site': ('Meal kits by site and format', kits_by_site, 1),
+    'spend_by_supplier': ('Food spend by supplier', spend_by_supplier, 1),
+    'cost_per_kit': ('Cost per kit by site and month', cost_per_kit, 2),
+}
+
+
+def get_panel(name, months=DEFAULT_MONTHS):
+    """
+    (rows, stats) for one panel over the last `months` months. stats holds the queries and
+    ms of the run that filled the cache, and cached=True when this call didn't run it.
+    """
+    key = f'core:analytics:{get_analytics_version()}:{name}:{months}'
+    cached = cache.get(key)
+    if cached is not None:
+        rows, stats = cached
+        return rows, {**stats, 'cached': True}
+    title, compute, max_queries = PANELS[name]
+    with query_budget(f'analytics panel {name}', max_queries) as stats:
+        rows = compute(first_month(months))
+    stats = {**stats, 'budget': max_queries, 'cached': False}
+    cache.set(key, (rows, stats), ANALYTICS_TIMEOUT)
+    return rows, stats
+
+
+def get_panels(months=DEFAULT_MONTHS):
+    """[{name, title, rows, stats}] for every panel, in PANELS order."""
+    panels = []
+    for name, (title, _compute, _budget) in PANELS.items():
+        rows, stats = get_panel(name, months)
+        panels.append({'name': name, 'title': title, 'rows': rows, 'stats': stats})
+    return panels
+
+
+@job('refresh_analytics', max_attempts=1)
+def refresh_analytics():
+    """Fill the cache for the default period so staff don't wait for the queries."""
+    cache.delete(REFRESH_QUEUED_KEY)
+    get_panels()
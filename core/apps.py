@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connect receivers)
+        from . import notifications  # noqa: F401  (register jobs; see core.jobs)
+        from . import assets  # noqa: F401  (register system checks)
+        from .search import check_sqlite_fts_triggers
+        post_migrate.connect(check_sqlite_fts_triggers, sender=self)
@@ -0,0 +1,220 @@
+"""
+Self-hosted front-end assets, built by `python manage.py build_assets` (run from deploy.sh).
+Bootstrap, SortableJS and the Font Awesome solid icons are downloaded at pinned versions into
+core/static/core/dist/ (not in git). Font Awesome is trimmed to the icons our templates use.
+The optimized logo and favicon sizes are written to the same place.
+collectstatic then fingerprints every file (ManifestStaticFilesStorage when STATIC_MANIFEST is
+on), and .gz/.br copies are written next to the collected files for nginx gzip_static.
+Templates use the dist/ files when SELF_HOSTED_ASSETS is on (the default) and they have been
+built; otherwise they link the CDNs and the original logo, so development works without a build.
+check_built_assets() warns when a production deploy is missing the build.
+"""
+
+import gzip
+import re
+import urllib.request
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core import checks
+from PIL import Image
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz files are written without it
+    brotli = None
+
+DIST_DIR = Path(__file__).resolve().parent / 'static' / 'core' / 'dist'
+DIST_PREFIX = 'core/dist/'
+
+BOOTSTRAP_VERSION = '5.3.2'
+FONT_AWESOME_VERSION = '6.5.1'
+SORTABLE_VERSION = '1.15.2'
+
+# name in dist/ -> pinned CDN URL (also used directly when SELF_HOSTED_ASSETS is off or before a build)
+VENDOR_FILES = {
+    'bootstrap.min.css': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css',
+    'bootstrap.bundle.min.js': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/js/bootstrap.bundle.min.js',
+    'Sortable.min.js': f'https://cdn.jsdelivr.net/npm/sortablejs@{SORTABLE_VERSION}/Sortable.min.js',
+    'css/fontawesome.min.css': f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONT_AWESOME_VERSION}/css/all.min.css',
+}
+FONT_AWESOME_BASE = f'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@{FONT_AWESOME_VERSION}'
+FONT_AWESOME_FONT = 'webfonts/fa-solid-900.woff2'
+
+# Logo heights in CSS pixels as used by the templates -> files rendered at 2x
+LOGO_HEIGHTS = {48: 'logo-96.png', 120: 'logo-240.png'}
+FAVICON_SIZES = (16, 32, 48)
+APPLE_TOUCH_SIZE = 180
+
+COMPRESS_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.xml', '.map', '.ico', '.html'}
+COMPRESS_MIN_SIZE = 512
+
+_SOURCE_MAP = re.compile(rb'\n?/[*/]# sourceMappingURL=[^\n]*?(\*/)?(?=\n|$)')
+_ICON_RULE = re.compile(r'((?:\.fa-[a-z0-9-]+:(?:before|after),?)+)\{content:"([^"]*)"\}')
+_ICON_CLASS = re.compile(r'\bfa-[a-z0-9-]+')
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def strip_source_map(data):
+    """Drop sourceMappingURL comments; the maps aren't vendored and collectstatic would look for them."""
+    return _SOURCE_MAP.sub(b'', data)
+
+
+def used_icons(roots):
+    """fa-* class names found in the templates and scripts under `roots`."""
+    names = set()
+    for root in roots:
+        for path in Path(root).rglob('*'):
+            if path.suffix in ('.html', '.js', '.py') and path.is_file():
+                names.update(_ICON_CLASS.findall(path.read_text(errors='ignore')))
+    return names
+
+
+def trim_font_awesome(core_css, solid_css, icons):
+    """
+    fontawesome.min.css + solid.min.css with only the icon rules in `icons` and the font
+    loaded as woff2 only. Returns (css, codepoints kept).
+    """
+    codepoints = set()
+
+    def keep(match):
+        selectors = match.group(1).rstrip(',').split(',')
+        if any(sel.split(':')[0][1:] in icons for sel in selectors):
+            codepoint = re.match(r'\\([0-9a-f]+)', match.group(2))
+            if codepoint:
+                codepoints.add(int(codepoint.group(1), 16))
+            return match.group(0)
+        return ''
+
+    css = _ICON_RULE.sub(keep, core_css)
+    solid_css = re.sub(r'src:[^;}]+', f'src:url(../{FONT_AWESOME_FONT}) format("woff2")', solid_css)
+    return css + '\n' + solid_css, codepoints
+
+
+def subset_font(data, codepoints):
+    """Subset the woff2 font to `codepoints` if fontTools (and brotli) are installed."""
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return data
+    font = TTFont(BytesIO(data))
+    subsetter = subset.Subsetter(subset.Options(flavor='woff2', layout_features=['*']))
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    out = BytesIO()
+    font.flavor = 'woff2'
+    font.save(out)
+    return out.getvalue()
+
+
+def vendor_assets(icon_roots):
+    """Download and trim the third-party files into DIST_DIR; returns the names written."""
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, url in VENDOR_FILES.items():
+        if name == 'css/fontawesome.min.css':
+            continue  # trimmed below
+        (DIST_DIR / name).write_bytes(strip_source_map(fetch(url)))
+        written.append(name)
+
+    core_css = strip_source_map(fetch(f'{FONT_AWESOME_BASE}/css/fontawesome.min.css')).decode()
+    solid_css = strip_source_map(fetch(f'{FONT_AWESOME_BASE}/css/solid.min.css')).decode()
+    css, codepoints = trim_font_awesome(core_css, solid_css, used_icons(icon_roots))
+    # The stylesheet sits in dist/css/ so the font's relative url() resolves to dist/webfonts/
+    (DIST_DIR / 'css').mkdir(exist_ok=True)
+    (DIST_DIR / 'css' / 'fontawesome.min.css').write_text(css)
+    (DIST_DIR / 'webfonts').mkdir(exist_ok=True)
+    font = subset_font(fetch(f'{FONT_AWESOME_BASE}/{FONT_AWESOME_FONT}'), codepoints)
+    (DIST_DIR / FONT_AWESOME_FONT).write_bytes(font)
+    written += ['css/fontawesome.min.css', FONT_AWESOME_FONT]
+    return written
+
+
+def _resize_to_height(image, height):
+    width = max(1, round(image.width * height / image.height))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def build_logo_variants(source):
+    """Logo at 2x each template height, plus favicon.ico, favicon-32.png and apple-touch-icon.png."""
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as image:
+        image = image.convert('RGBA')
+        written = []
+        for height, name in LOGO_HEIGHTS.items():
+            _resize_to_height(image, height * 2).save(DIST_DIR / name, optimize=True)
+            written.append(name)
+        side = max(image.size)
+        square = Image.new('RGBA', (side, side))
+        square.paste(image, ((side - image.width) // 2, (side - image.height) // 2))
+        square = square.resize((256, 256), Image.Resampling.LANCZOS)
+        square.save(DIST_DIR / 'favicon.ico', sizes=[(s, s) for s in FAVICON_SIZES])
+        square.resize((32, 32), Image.Resampling.LANCZOS).save(DIST_DIR / 'favicon-32.png', optimize=True)
+        # iOS fills transparency with black; put the icon on white
+        touch = Image.new('RGBA', (APPLE_TOUCH_SIZE, APPLE_TOUCH_SIZE), 'white')
+        icon = square.resize((APPLE_TOUCH_SIZE, APPLE_TOUCH_SIZE), Image.Resampling.LANCZOS)
+        touch.alpha_composite(icon)
+        touch.convert('RGB').save(DIST_DIR / 'apple-touch-icon.png', optimize=True)
+        written += ['favicon.ico', 'favicon-32.png', 'apple-touch-icon.png']
+    return written
+
+
+def compress_static(root=None):
+    """
+    Write .gz (and .br with brotli installed) next to every compressible file in STATIC_ROOT
+    that is missing one or is newer than it. Returns (files compressed, bytes before, bytes after gzip).
+    """
+    root = Path(root or settings.STATIC_ROOT)
+    count = before = after = 0
+    for path in root.rglob('*'):
+        if path.suffix not in COMPRESS_EXTENSIONS or not path.is_file():
+            continue
+        data = path.read_bytes()
+        if len(data) < COMPRESS_MIN_SIZE:
+            continue
+        encodings = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encodings.append(('.br', lambda d: brotli.compress(d, quality=11)))
+        for suffix, compress in encodings:
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                compressed = target.stat().st_size
+            else:
+                encoded = compress(data)
+                compressed = len(encoded)
+                if compressed >= len(data) * 0.95:
+                    continue
+                target.write_bytes(encoded)
+            if suffix == '.gz':
+                count += 1
+                before += len(data)
+                after += compressed
+    return count, before, after
+
+
+@checks.register(checks.Tags.staticfiles)
+def check_built_assets(app_configs=None, **kwargs):
+    """Warn when production settings expect build_assets output that isn't there."""
+    if settings.DEBUG:
+        return []
+    warnings = []
+    missing = [name for name in VENDOR_FILES if not (DIST_DIR / name).is_file()]
+    if settings.SELF_HOSTED_ASSETS and missing:
+        warnings.append(checks.Warning(
+            f'SELF_HOSTED_ASSETS is on but {len(missing)} vendored file(s) are missing, so pages link the CDNs.',
+            hint='Run `python manage.py build_assets`.',
+            id='core.W001',
+        ))
+    if settings.STATIC_MANIFEST and not (Path(settings.STATIC_ROOT) / 'staticfiles.json').is_file():
+        warnings.append(checks.Warning(
+            'STATIC_MANIFEST is on but STATIC_ROOT has no staticfiles.json; pages will fail to render.',
+            hint='Run `python manage.py build_assets` (it runs collectstatic).',
+            id='core.W002',
+        ))
+    return warnings
@@ -0,0 +1,297 @@
+"""
+Volunteer-to-site assignment: the "Assign to sites" admin action on volunteers and
+`python manage.py assign_volunteers [--dry-run]`.
+Pending volunteers without a site are placed at active sites that have room left
+(capacity_volunteers minus the volunteers already there; sites with capacity 0 never have room),
+in their own region first and then at sites open to any region (blank region).
+Volunteers with the same region and location (ZIP code, core/geo.py) are interchangeable,
+so the matching is a min-cost max-flow over those groups and the sites instead of volunteer
+rows: as many volunteers as possible are placed, at the lowest total distance. A group
+with coordinates links to its NEAREST_SITES closest sites by distance and to every other
+site through a per-region overflow node costing OVERFLOW_COST; a group without coordinates
+links to every site. Regional sites are preferred and sites fill evenly (each site's room is
+split into FILL_STEPS slices of rising cost). Earlier sign-ups in a group are placed first.
+The plan is written with one UPDATE per site, only touching rows that are still pending.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .geo import nearest_sites
+from .models import DistributionSite, VolunteerSignUp
+
+# Costs are in units of COST_UNIT_KM of travel; coarser units mean fewer solver phases
+COST_UNIT_KM = 5
+FILL_STEPS = 4
+FILL_STEP_COST = 1  # per slice of a site's room already used
+ANY_REGION_COST = 10  # site open to any region rather than the volunteer's own
+NEAREST_SITES = 8
+OVERFLOW_COST = 200  # any site beyond the nearest ones; more than the width of the state
+UPDATE_BATCH_SIZE = 1000
+
+
+class MinCostFlow:
+    """
+    Min-cost max-flow, primal-dual: Dijkstra with potentials finds the current shortest path
+    length, then a blocking flow (Dinic) saturates every path of that length at once, so there
+    is one Dijkstra per distinct path cost rather than per path. Costs must be >= 0.
+    """
+
+    def __init__(self, nodes):
+        self.graph = [[] for _ in range(nodes)]
+
+    def add_edge(self, u, v, capacity, cost):
+        """Add an edge; returns a handle for flow()."""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return u, len(self.graph[u]) - 1
+
+    def flow(self, edge):
+        u, i = edge
+        v, _capacity, _cost, rev = self.graph[u][i]
+        return self.graph[v][rev][1]
+
+    def _shortest_paths(self, source, potential):
+        dist = [None] * len(self.graph)
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, capacity, cost, _rev in self.graph[u]:
+                if capacity > 0:
+                    nd = d + cost + potential[u] - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        return dist
+
+    def _blocking_flow(self, source, sink, potential):
+        """Push flow along zero reduced-cost edges until the sink is cut off; returns the amount."""
+        graph = self.graph
+        # Edges on a shortest path have zero reduced cost; only those are used in this phase
+        admissible = [
+            [edge for edge in edges if edge[1] > 0 and edge[2] + potential[u] - potential[edge[0]] == 0]
+            for u, edges in enumerate(graph)
+        ]
+        pushed = 0
+        while True:
+            level = [None] * len(graph)
+            level[source] = 0
+            queue = [source]
+            for u in queue:
+                for edge in admissible[u]:
+                    if edge[1] > 0 and level[edge[0]] is None:
+                        level[edge[0]] = level[u] + 1
+                        queue.append(edge[0])
+            if level[sink] is None:
+                return pushed
+            progress = [0] * len(graph)
+            while True:
+                # Iterative DFS for one augmenting path in the level graph
+                path, u = [], source
+                while u != sink:
+                    edges = admissible[u]
+                    while progress[u] < len(edges):
+                        edge = edges[progress[u]]
+                        if edge[1] > 0 and level[edge[0]] == level[u] + 1:
+                            break
+                        progress[u] += 1
+                    if progress[u] == len(edges):
+                        if u == source:
+                            break
+                        level[u] = None  # dead end
+                        u = path.pop()
+                        progress[u] += 1
+                        continue
+                    path.append(u)
+                    u = edges[progress[u]][0]
+                if u != sink:
+                    break
+                amount = min(admissible[v][progress[v]][1] for v in path)
+                for v in path:
+                    edge = admissible[v][progress[v]]
+                    edge[1] -= amount
+                    graph[edge[0]][edge[3]][1] += amount
+                pushed += amount
+
+    def solve(self, source, sink):
+        """Push as much flow as possible at minimum cost; returns (flow, cost)."""
+        potential = [0] * len(self.graph)
+        total_flow = total_cost = 0
+        while True:
+            dist = self._shortest_paths(source, potential)
+            if dist[sink] is None:
+                return total_flow, total_cost
+            # Capped at the sink's distance so reduced costs stay >= 0 for unreached nodes too
+            for v, d in enumerate(dist):
+                potential[v] += dist[sink] if d is None else min(d, dist[sink])
+            pushed = self._blocking_flow(source, sink, potential)
+            total_flow += pushed
+            total_cost += pushed * (potential[sink] - potential[source])
+
+
+@dataclass
+class SiteLoad:
+    site: DistributionSite
+    current: int  # volunteers already at the site (not inactive)
+    volunteer_ids: list = field(default_factory=list)  # to be assigned here
+
+    @property
+    def room(self):
+        return max(0, self.site.capacity_volunteers - self.current)
+
+
+@dataclass
+class AssignmentPlan:
+    sites: list  # SiteLoad, by site name
+    unplaced: dict  # region -> volunteers left pending
+
+    @property
+    def assigned(self):
+        return sum(len(load.volunteer_ids) for load in self.sites)
+
+
+def site_loads():
+    """
+    Active sites with their current volunteer counts (one query). Sites with capacity 0 are
+    included with no room, so previews list them as full instead of leaving them out.
+    """
+    sites = (
+        DistributionSite.objects.filter(is_active=True)
+        .annotate(current=Count('volunteers', filter=~Q(volunteers__status='inactive')))
+        .order_by('name')
+    )
+    return [SiteLoad(site, site.current) for site in sites]
+
+
+def pending_volunteers(queryset=None):
+    """(pk, region, latitude, longitude) of pending volunteers without a site, earliest sign-up first."""
+    queryset = VolunteerSignUp.objects.all() if queryset is None else queryset
+    return list(
+        queryset.filter(status='pending', site__isnull=True)
+        .order_by('submitted_at', 'pk')
+        .values_list('pk', 'region', 'latitude', 'longitude')
+    )
+
+
+def _slices(room):
+    """Split `room` into FILL_STEPS nearly equal parts (larger parts first)."""
+    size, extra = divmod(room, FILL_STEPS)
+    return [size + (1 if step < extra else 0) for step in range(FILL_STEPS)]
+
+
+def _region_cost(site, region):
+    return 0 if site.region == region else ANY_REGION_COST
+
+
+def plan_assignments(queryset=None):
+    """Compute (but don't save) where the pending volunteers in `queryset` (default: all) go."""
+    all_loads = site_loads()
+    loads = [load for load in all_loads if load.room]
+    groups = {}
+    for pk, region, lat, lon in pending_volunteers(queryset):
+        point = None if lat is None or lon is None else (round(lat, 3), round(lon, 3))
+        groups.setdefault((region, point), []).append(pk)
+
+    keys = list(groups)
+    regions = sorted({region for region, _point in keys})
+    network = MinCostFlow(2 + len(keys) + len(regions) + len(loads))
+    source, sink = 0, 1
+    group_node = {key: 2 + i for i, key in enumerate(keys)}
+    overflow_node = {region: 2 + len(keys) + i for i, region in enumerate(regions)}
+    site_node = {load.site.pk: 2 + len(keys) + len(regions) + i for i, load in enumerate(loads)}
+    by_pk = {load.site.pk: load for load in loads}
+
+    def allowed(site, region):
+        return site.region in (region, '')
+
+    direct, overflow_in, overflow_out = [], [], []  # (handle, group key or region, site pk)
+    for key in keys:
+        region, point = key
+        node, count = group_node[key], len(groups[key])
+        network.add_edge(source, node, count, 0)
+        if point is None:
+            for load in loads:
+                if allowed(load.site, region):
+                    handle = network.add_edge(node, site_node[load.site.pk], count, _region_cost(load.site, region))
+                    direct.append((handle, key, load.site.pk))
+            continue
+        for site, km in nearest_sites(*point, k=NEAREST_SITES, region=region, accept=lambda s: s.pk in by_pk):
+            cost = round(km / COST_UNIT_KM) + _region_cost(site, region)
+            direct.append((network.add_edge(node, site_node[site.pk], count, cost), key, site.pk))
+        overflow_in.append((network.add_edge(node, overflow_node[region], count, OVERFLOW_COST), key, region))
+    for region in regions:
+        for load in loads:
+            if allowed(load.site, region):
+                handle = network.add_edge(
+                    overflow_node[region], site_node[load.site.pk], load.room, _region_cost(load.site, region),
+                )
+                overflow_out.append((handle, region, load.site.pk))
+    for load in loads:
+        for step, size in enumerate(_slices(load.room)):
+            if size:
+                network.add_edge(site_node[load.site.pk], sink, size, step * FILL_STEP_COST)
+    network.solve(source, sink)
+
+    def place(key, site_pk, count):
+        by_pk[site_pk].volunteer_ids += groups[key][:count]
+        del groups[key][:count]
+
+    for handle, key, site_pk in direct:
+        count = network.flow(handle)
+        if count:
+            place(key, site_pk, count)
+    # Volunteers sent through an overflow node: all of a region's groups cost the same there,
+    # so hand out each site's share in group order.
+    waiting = {region: [] for region in regions}
+    for handle, key, region in overflow_in:
+        count = network.flow(handle)
+        if count:
+            waiting[region].append([key, count])
+    for handle, region, site_pk in overflow_out:
+        count = network.flow(handle)
+        while count:
+            entry = waiting[region][0]
+            take = min(count, entry[1])
+            place(entry[0], site_pk, take)
+            entry[1] -= take
+            count -= take
+            if not entry[1]:
+                waiting[region].pop(0)
+
+    unplaced = {}
+    for (region, _point), pks in groups.items():
+        if pks:
+            unplaced[region] = unplaced.get(region, 0) + len(pks)
+    return AssignmentPlan(all_loads, unplaced)
+
+
+def apply_plan(plan):
+    """Assign the planned volunteers that are still pending; returns how many were updated."""
+    updated = 0
+    with transaction.atomic():
+        for load in plan.sites:
+            ids = load.volunteer_ids
+            for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+                updated += VolunteerSignUp.objects.filter(
+                    pk__in=ids[start:start + UPDATE_BATCH_SIZE], status='pending', site__isnull=True,
+                ).update(site=load.site, status='assigned')
+    return updated
+
+
+def assign_volunteers(queryset=None, dry_run=False):
+    """
+    Plan and (unless dry_run) apply the assignment; returns (plan, rows updated).
+    The sites are locked for the whole run so two runs can't both fill the same room.
+    """
+    with transaction.atomic():
+        if not dry_run:
+            list(DistributionSite.objects.select_for_update().filter(is_active=True).values_list('pk'))
+        plan = plan_assignments(queryset)
+        updated = 0 if dry_run else apply_plan(plan)
+    return plan, updated
@@ -0,0 +1,177 @@
+"""
+Page cache for public pages (home, impact, events).
+Rendered responses are stored for anonymous visitors so repeat hits cost no DB queries.
+Invalidation: signals bump a version counter (see core/signals.py); pages that list
+upcoming events also expire when the next upcoming event starts.
+Conditional GET: ConditionalGetMixin answers If-None-Match / If-Modified-Since with 304
+before rendering, using ETags built from model timestamps, the cache version and the user.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+PAGE_CACHE_VERSION_KEY = 'core:page_cache:version'
+
+
+def get_page_cache_version():
+    """Current page cache version; a new one is stored if the key was evicted."""
+    version = cache.get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(PAGE_CACHE_VERSION_KEY, version, None)
+        version = cache.get(PAGE_CACHE_VERSION_KEY, version)
+    return version
+
+
+def invalidate_page_cache():
+    """Drop every cached public page (old keys simply age out of the cache)."""
+    cache.set(PAGE_CACHE_VERSION_KEY, time.time_ns(), None)
+
+
+def page_cache_key(request):
+    """Key on path only: query strings would let anyone fill the cache with copies."""
+    return f'core:page:{get_page_cache_version()}:{request.path}'
+
+
+def has_pending_messages(request):
+    """Flash messages waiting to be shown (cookie or session storage)."""
+    if 'messages' in request.COOKIES:
+        return True
+    return settings.SESSION_COOKIE_NAME in request.COOKIES and '_messages' in request.session
+
+
+def is_cacheable_request(request):
+    """Anonymous GET/HEAD without a session or pending flash messages."""
+    if request.method not in ('GET', 'HEAD') or has_pending_messages(request):
+        return False
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        # Only now is it worth loading the session to find out who this is.
+        return not request.user.is_authenticated
+    return True
+
+
+def seconds_until_next_event(now=None):
+    """Seconds until the next upcoming published event starts, or None if there is none."""
+    from .models import Event
+
+    now = now or timezone.now()
+    next_date = (
+        Event.objects.filter(is_published=True, date__gte=now)
+        .order_by('date')
+        .values_list('date', flat=True)
+        .first()
+    )
+    if next_date is None:
+        return None
+    return max(1, int((next_date - now).total_seconds()) + 1)
+
+
+class PageCacheMixin:
+    """
+    Serve cached rendered responses to anonymous visitors.
+    Set page_cache_tracks_events = True on pages that filter on date__gte=now so the
+    cached copy expires when the next event starts.
+    """
+    page_cache_timeout = None
+    page_cache_tracks_events = False
+
+    def get_page_cache_timeout(self):
+        timeout = self.page_cache_timeout
+        if timeout is None:
+            timeout = settings.PAGE_CACHE_TIMEOUT
+        if self.page_cache_tracks_events:
+            until_next = seconds_until_next_event()
+            if until_next is not None:
+                timeout = min(timeout, until_next)
+        return timeout
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            # Cached with the ETag/Last-Modified set by ConditionalGetMixin, if the view uses it
+            not_modified = get_conditional_response(
+                request, etag=response.get('ETag'), last_modified=_last_modified_timestamp(response), response=response,
+            )
+            return not_modified or response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            patch_vary_headers(response, ['Cookie'])
+            timeout = self.get_page_cache_timeout()
+
+            def store(rendered):
+                cache.set(key, rendered, timeout)
+
+            if hasattr(response, 'add_post_render_callback'):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+        return response
+
+
+def _last_modified_timestamp(response):
+    return parse_http_date_safe(response['Last-Modified']) if response.has_header('Last-Modified') else None
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs with 304 Not Modified without rendering the page.
+    Views must define get_validators() (checked when the class is created), returning
+    (parts, last_modified) or None to skip validation: `parts` is any
+    repr()-able value that changes whenever the page would (typically model timestamps
+    and row counts, which also catch deletions) and `last_modified` the newest timestamp
+    or None. The ETag also covers the page cache version and the user, so staff and
+    visitors never share a validator. For logged-in users it covers the session and CSRF
+    token too, since the page embeds the token (logout form) and both change on every
+    login; they get no Last-Modified, which alone could match across logins.
+    Skipped while flash messages are waiting to be shown.
+    Put it after PageCacheMixin so cached pages keep their validators.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, 'get_validators', None)):
+            raise ImproperlyConfigured(f'{cls.__name__} uses ConditionalGetMixin but does not define get_validators().')
+
+    def get_etag(self, parts):
+        request = self.request
+        viewer = None
+        if request.user.is_authenticated:
+            viewer = (request.user.pk, request.session.session_key, request.META.get('CSRF_COOKIE'))
+        key = repr((viewer, get_page_cache_version(), parts))
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or has_pending_messages(request):
+            return super().dispatch(request, *args, **kwargs)
+        validators = self.get_validators()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+        parts, last_modified = validators
+        if request.user.is_authenticated:
+            last_modified = None
+        etag = self.get_etag(parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(timestamp)
+            # Always revalidate; the page may show who is logged in.
+            if request.user.is_authenticated:
+                patch_cache_control(response, no_cache=True, private=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Cookie'])
+        return response
@@ -0,0 +1,270 @@
+"""
+Duplicate detection for volunteer sign-ups.
+People re-submit the volunteer form with a different e-mail case, a typo or another phone
+format. Comparing every pair of sign-ups is O(n^2), so each sign-up carries three blocking
+keys in indexed columns, set when it is saved: the normalized e-mail, the normalized phone
+number and a phonetic name key (Soundex of the last name plus the first initial). Only
+sign-ups sharing a key are compared; large blocks (a common surname) are compared within a
+sliding window after sorting by name. Pairs scoring at least MIN_SCORE on name similarity,
+e-mail (equal or one typo apart) and phone are stored as DuplicateCandidate rows and
+reviewed on the dashboard.
+`python manage.py find_duplicate_volunteers` scans the whole table; new sign-ups are checked
+against their own blocks by the 'find_volunteer_duplicates' job.
+"""
+
+import difflib
+import unicodedata
+from collections import defaultdict, namedtuple
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Q
+
+from .jobs import enqueue, job
+from .models import DuplicateCandidate, VolunteerSignUp
+
+# Same name alone scores 0.5 and needs a matching phone or a (nearly) matching e-mail to pass
+MIN_SCORE = 0.6
+MAX_BLOCK_SIZE = 50  # larger blocks are compared within WINDOW neighbours only
+WINDOW = 10
+WEIGHTS = {'name': 0.4, 'email': 0.4, 'phone': 0.3}  # phone only counts when both have one
+EMAIL_TYPO_SCORE = 0.9
+
+_GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+_SOUNDEX_CODES = {
+    letter: str(digit)
+    for digit, letters in enumerate(['aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r'])
+    for letter in letters
+}
+
+
+def _ascii(text):
+    """'Zoë  Ångström' -> 'zoe angstrom'"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+    return ' '.join(text.lower().split())
+
+
+def normalize_email(email):
+    """'John.Doe+food@GoogleMail.com' -> 'johndoe@gmail.com': lowercase, no +tag, Gmail dots dropped."""
+    email = (email or '').strip().lower()
+    local, at, domain = email.rpartition('@')
+    if not at:
+        return email
+    local = local.split('+', 1)[0]
+    if domain in _GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def normalize_phone(phone):
+    """'+1 (612) 555-0100' -> '6125550100'; '' for anything too short to be a phone number."""
+    digits = ''.join(c for c in phone or '' if c.isdigit())
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    return digits[:20] if len(digits) >= 7 else ''
+
+
+def soundex(word):
+    """American Soundex: 'Robert' and 'Rupert' -> 'R163'; '' without letters."""
+    letters = [c for c in _ascii(word) if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code, last = letters[0].upper(), _SOUNDEX_CODES[letters[0]]
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES[letter]
+        if digit != '0' and digit != last:
+            code += digit
+        if letter not in 'hw':  # h and w don't separate letters with the same code
+            last = digit
+    return (code + '000')[:4]
+
+
+def name_key(first_name, last_name):
+    """Soundex of the last name plus the first initial: ('Jon', 'Smyth') -> 'S530J'."""
+    first = _ascii(first_name)
+    if not _ascii(last_name):
+        return soundex(first)
+    return soundex(last_name) + first[:1].upper()
+
+
+# Blocking key -> (function, fields it is computed from)
+BLOCKING_KEYS = {
+    'email_normalized': (normalize_email, ('email',)),
+    'name_key': (name_key, ('first_name', 'last_name')),
+    'phone_normalized': (normalize_phone, ('phone',)),
+}
+
+
+def set_blocking_keys(instance):
+    """Set the blocking keys of a VolunteerSignUp whose source fields are loaded (not deferred)."""
+    for key, (func, sources) in BLOCKING_KEYS.items():
+        if all(name in instance.__dict__ for name in sources):
+            setattr(instance, key, func(*(getattr(instance, name) for name in sources)))
+
+
+# -- scoring -----------------------------------------------------------------------
+
+_Row = namedtuple('_Row', 'pk name email phone name_key')
+
+
+def _rows(queryset):
+    fields = ('pk', 'first_name', 'last_name', 'email_normalized', 'phone_normalized', 'name_key')
+    return [
+        _Row(pk, _ascii(f'{first} {last}'), email, phone, key)
+        for pk, first, last, email, phone, key in queryset.values_list(*fields).iterator(chunk_size=5000)
+    ]
+
+
+def _one_typo_apart(a, b):
+    """
+    True if `a` and `b` (not equal) differ by one inserted, deleted or replaced character,
+    or by two swapped neighbours.
+    """
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i, n = 0, min(len(a), len(b))
+    while i < n and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        # one replaced character, or a[i] and a[i + 1] swapped
+        return a[i + 1:] == b[i + 1:] or (a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:])
+    if len(a) > len(b):
+        a, b = b, a
+    return a[i:] == b[i + 1:]
+
+
+def score_pair(a, b, min_score=0.0):
+    """
+    (score from 0 to 1, matching keys) for two _Rows, or None if the score is below `min_score`.
+    E-mails count fully when equal and EMAIL_TYPO_SCORE when one typo apart; the (slower)
+    name similarity is only computed when the pair can still reach `min_score`.
+    """
+    if a.email == b.email:
+        email = 1.0
+    else:
+        email = EMAIL_TYPO_SCORE if _one_typo_apart(a.email, b.email) else 0.0
+    parts = {'email': email}
+    if a.phone and b.phone:
+        parts['phone'] = 1.0 if a.phone == b.phone else 0.0
+    total_weight = WEIGHTS['name'] + sum(WEIGHTS[name] for name in parts)
+    partial = sum(WEIGHTS[name] * value for name, value in parts.items())
+    if (partial + WEIGHTS['name']) / total_weight < min_score:
+        return None
+    name = 1.0 if a.name == b.name else difflib.SequenceMatcher(None, a.name, b.name).ratio()
+    score = (partial + WEIGHTS['name'] * name) / total_weight
+    if score < min_score:
+        return None
+    reasons = [
+        label for label, x, y in (('email', a.email, b.email), ('phone', a.phone, b.phone), ('name', a.name_key, b.name_key))
+        if x and x == y
+    ]
+    return score, ', '.join(reasons)
+
+
+def _block_pairs(block):
+    if len(block) <= MAX_BLOCK_SIZE:
+        yield from combinations(block, 2)
+        return
+    # Sorted neighbourhood: similar names end up close together
+    block = sorted(block, key=lambda row: row.name)
+    for i, row in enumerate(block):
+        for other in block[i + 1:i + 1 + WINDOW]:
+            yield row, other
+
+
+def find_duplicates(volunteer_ids=None, min_score=MIN_SCORE):
+    """
+    [(first pk, second pk, score, reasons)] of likely duplicate sign-ups, first pk lower.
+    With `volunteer_ids`, only pairs involving those sign-ups (found through the key indexes).
+    """
+    if volunteer_ids is None:
+        rows = _rows(VolunteerSignUp.objects.all())
+    else:
+        targets = _rows(VolunteerSignUp.objects.filter(pk__in=volunteer_ids))
+        condition = Q(pk__in=[row.pk for row in targets])
+        for field, attr in (('email_normalized', 'email'), ('phone_normalized', 'phone'), ('name_key', 'name_key')):
+            values = {getattr(row, attr) for row in targets} - {''}
+            if values:
+                condition |= Q(**{f'{field}__in': values})
+        rows = _rows(VolunteerSignUp.objects.filter(condition))
+        wanted = {row.pk for row in targets}
+
+    blocks = defaultdict(list)
+    for row in rows:
+        for attr in ('email', 'phone', 'name_key'):
+            value = getattr(row, attr)
+            if value:
+                blocks[attr, value].append(row)
+
+    seen, found = set(), []
+    for block in blocks.values():
+        for a, b in _block_pairs(block):
+            if a.pk > b.pk:
+                a, b = b, a
+            if (a.pk, b.pk) in seen or (volunteer_ids is not None and a.pk not in wanted and b.pk not in wanted):
+                continue
+            seen.add((a.pk, b.pk))
+            scored = score_pair(a, b, min_score)
+            if scored:
+                found.append((a.pk, b.pk, round(scored[0], 3), scored[1]))
+    return found
+
+
+def save_candidates(pairs):
+    """Store new pairs from find_duplicates() as open candidates; pairs already stored (even dismissed) are skipped."""
+    existing = set(DuplicateCandidate.objects.values_list('first_id', 'second_id'))
+    new = [
+        DuplicateCandidate(first_id=first, second_id=second, score=score, reasons=reasons)
+        for first, second, score, reasons in pairs
+        if (first, second) not in existing
+    ]
+    DuplicateCandidate.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+    return len(new)
+
+
+@job('find_volunteer_duplicates', max_attempts=3)
+def find_volunteer_duplicates(volunteer_ids=None):
+    """Job: look for duplicates of the given sign-ups (all sign-ups when None)."""
+    save_candidates(find_duplicates(volunteer_ids))
+
+
+# -- merging -----------------------------------------------------------------------
+
+def merge_volunteers(candidate, keep):
+    """
+    Resolve `candidate` by keeping sign-up `keep` (one of its pair) and deleting the other.
+    Blank fields of the kept sign-up are filled from the other, notes are combined, a site
+    assignment is carried over and the other's remaining pairs (dismissed ones included) are
+    moved to the kept sign-up unless it already has that pair. Returns the kept sign-up.
+    """
+    with transaction.atomic():
+        first, second = candidate.first, candidate.second
+        if keep.pk not in (first.pk, second.pk):
+            raise ValueError('keep must be one of the pair')
+        keep, other = (first, second) if keep.pk == first.pk else (second, first)
+        for name in ('phone', 'zip_code', 'availability'):
+            if not getattr(keep, name):
+                setattr(keep, name, getattr(other, name))
+        if other.notes and other.notes not in keep.notes:
+            keep.notes = '\n'.join(filter(None, [keep.notes, other.notes]))
+        if keep.site_id is None and other.site_id is not None:
+            keep.site_id, keep.status = other.site_id, other.status
+        keep.save()
+        pairs = (
+            DuplicateCandidate.objects.filter(Q(first__in=[keep, other]) | Q(second__in=[keep, other]))
+            .exclude(pk=candidate.pk).order_by('pk').values_list('pk', 'first_id', 'second_id')
+        )
+        existing, moved = set(), []
+        for pk, first_id, second_id in pairs:
+            if other.pk in (first_id, second_id):
+                moved.append((pk, *sorted(keep.pk if id_ == other.pk else id_ for id_ in (first_id, second_id))))
+            else:
+                existing.add((first_id, second_id))
+        for pk, first_id, second_id in moved:
+            if (first_id, second_id) not in existing:
+                existing.add((first_id, second_id))
+                DuplicateCandidate.objects.filter(pk=pk).update(first_id=first_id, second_id=second_id)
+        other.delete()  # also deletes the resolved pair and any pair the kept sign-up already had
+        # The filled-in fields may match sign-ups neither of the two was paired with
+        enqueue('find_volunteer_duplicates', volunteer_ids=[keep.pk])
+    return keep
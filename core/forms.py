@@ -5,6 +5,7 @@ Forms for All Minnesota: volunteer sign-up, contact, goal update, and events.
 from django import forms
 from django.contrib.auth import get_user_model
 from .models import VolunteerSignUp, ContactMessage, FundraisingGoal, Event, Task
+from .staff import get_staff_users
 
 User = get_user_model()
 
@@ -15,7 +16,7 @@ class VolunteerForm(forms.ModelForm):
         model = VolunteerSignUp
         fields = [
             'first_name', 'last_name', 'email', 'phone',
-            'region', 'availability', 'notes',
+            'region', 'zip_code', 'availability', 'notes',
         ]
         widgets = {
             'first_name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'First name'}),
@@ -23,6 +24,7 @@ class VolunteerForm(forms.ModelForm):
             'email': forms.EmailInput(attrs={'class': 'form-control', 'placeholder': 'Email'}),
             'phone': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Phone (optional)'}),
             'region': forms.Select(attrs={'class': 'form-select'}),
+            'zip_code': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'ZIP code (optional)', 'inputmode': 'numeric'}),
             'availability': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'When are you available?'}),
             'notes': forms.Textarea(attrs={'class': 'form-control', 'rows': 2, 'placeholder': 'Any notes?'}),
         }
@@ -42,14 +44,13 @@ class ContactForm(forms.ModelForm):
 
 
 class GoalUpdateForm(forms.ModelForm):
-    """ModelForm for FundraisingGoal (only: current_amount, meals_funded, volunteers_count)."""
+    """ModelForm for FundraisingGoal (only: goal_title, target_amount; totals are derived)."""
     class Meta:
         model = FundraisingGoal
-        fields = ['current_amount', 'meals_funded', 'volunteers_count']
+        fields = ['goal_title', 'target_amount']
         widgets = {
-            'current_amount': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
-            'meals_funded': forms.NumberInput(attrs={'class': 'form-control'}),
-            'volunteers_count': forms.NumberInput(attrs={'class': 'form-control'}),
+            'goal_title': forms.TextInput(attrs={'class': 'form-control'}),
+            'target_amount': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
         }
 
 
@@ -86,14 +87,13 @@ class TaskForm(forms.ModelForm):
     """ModelForm for Task (create/edit)."""
     class Meta:
         model = Task
-        fields = ['title', 'description', 'status', 'assigned_to', 'due_date', 'order']
+        fields = ['title', 'description', 'status', 'assigned_to', 'due_date']
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
             'status': forms.Select(attrs={'class': 'form-select'}),
             'assigned_to': forms.Select(attrs={'class': 'form-select'}),
             'due_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-            'order': forms.NumberInput(attrs={'class': 'form-control'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -101,8 +101,10 @@ class TaskForm(forms.ModelForm):
         qs = User.objects.filter(is_staff=True).order_by('first_name', 'username')
         self.fields['assigned_to'].queryset = qs
         self.fields['assigned_to'].required = False
-        self.fields['assigned_to'].label_from_instance = lambda u: u.get_full_name() or u.username
-        self.fields['assigned_to'].empty_label = '— No one —'
+        # Render the menu from the cached staff list; the queryset still validates submissions
+        self.fields['assigned_to'].choices = [('', '— No one —')] + [
+            (u.pk, u.get_full_name() or u.username) for u in get_staff_users()
+        ]
 
 
 class TaskStatusForm(forms.Form):
@@ -0,0 +1,230 @@
+"""
+Offline geocoding and nearest-site lookup.
+Coordinates come from the bundled gazetteer core/data/mn_gazetteer.csv: Minnesota ZIP codes
+(kind "zip"), cities ("city") and 3-digit ZIP prefixes as a coarse fallback ("zip3"); no
+network calls. The file in git only has ~200 cities and the 17 ZIP prefixes, so a ZIP code
+is placed at the middle of its prefix's area (often 50+ km off) until
+`python manage.py load_gazetteer --zcta ... --regeocode` adds every ZIP code from the Census
+gazetteer files; `check --deploy` warns while it hasn't (core.W003).
+Sites and volunteers are geocoded when saved (core/signals.py) and when imported.
+Active sites with coordinates are kept in a per-process k-d tree for k-nearest queries
+without touching the database; like the staff cache (core/staff.py) each process reloads it
+when the version key in the shared cache changes, which any site save or delete bumps.
+"""
+
+import csv
+import functools
+import heapq
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.core import checks
+from django.core.cache import cache
+
+from .models import DistributionSite, VolunteerSignUp
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'mn_gazetteer.csv'
+SITE_INDEX_VERSION_KEY = 'core:site_index:version'
+EARTH_RADIUS_KM = 6371.0
+KM_PER_MILE = 1.609344
+
+# Fields each model is geocoded from
+GEOCODE_FIELDS = {
+    DistributionSite: ('address', 'city_state'),
+    VolunteerSignUp: ('zip_code',),
+}
+
+_ZIP = re.compile(r'\b(5[5-6]\d{3})(?:-\d{4})?\b')
+_STATE_SUFFIX = re.compile(r'\s+(mn|minn|minnesota)$')
+
+
+def normalize_place(text):
+    """'St. Paul, MN' -> 'saint paul': lowercase, no punctuation or state, 'st' spelled out."""
+    text = re.sub(r'[^a-z0-9 ]+', ' ', text.lower())
+    text = ' '.join(text.split())
+    text = _STATE_SUFFIX.sub('', text)
+    return re.sub(r'^(st|ste)\b', 'saint', text)
+
+
+@functools.lru_cache(maxsize=None)
+def gazetteer():
+    """{'zip': {...}, 'zip3': {...}, 'city': {...}}, each key -> (lat, lon); read once per process."""
+    places = {'zip': {}, 'zip3': {}, 'city': {}}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            places[row['kind']][row['key']] = (float(row['lat']), float(row['lon']))
+    return places
+
+
+def geocode_match(*parts):
+    """
+    ((lat, lon), kind) for free text such as an address, 'City, MN' or a ZIP code, or
+    (None, None). Tries a full ZIP code, then a city name in any comma/line-separated piece,
+    then the ZIP prefix; `kind` says which matched ('zip', 'city' or the coarse 'zip3').
+    """
+    text = ' '.join(str(p) for p in parts if p)
+    if not text.strip():
+        return None, None
+    places = gazetteer()
+    zip_match = _ZIP.search(text)
+    if zip_match and zip_match.group(1) in places['zip']:
+        return places['zip'][zip_match.group(1)], 'zip'
+    for piece in reversed(re.split(r'[,\n]', text)):
+        # 'Minneapolis MN 55401' -> 'minneapolis'
+        name = normalize_place(_ZIP.sub('', piece))
+        if name in places['city']:
+            return places['city'][name], 'city'
+    if zip_match and zip_match.group(1)[:3] in places['zip3']:
+        return places['zip3'][zip_match.group(1)[:3]], 'zip3'
+    return None, None
+
+
+def geocode(*parts):
+    """(lat, lon) for free text (see geocode_match), or None."""
+    return geocode_match(*parts)[0]
+
+
+@checks.register(deploy=True)
+def check_gazetteer(app_configs=None, **kwargs):
+    """Warn when ZIP codes can only be placed by their 3-digit prefix."""
+    if gazetteer()['zip']:
+        return []
+    return [checks.Warning(
+        'The gazetteer has no ZIP codes, so volunteers and ZIP searches are placed at the middle '
+        'of their 3-digit ZIP area, often 50 km or more from where they are.',
+        hint='Download the Census ZCTA gazetteer file and run `python manage.py load_gazetteer '
+             '--zcta 2023_Gaz_zcta_national.txt --regeocode`.',
+        id='core.W003',
+    )]
+
+
+def geocode_source(instance, data=None):
+    """The text `instance` is geocoded from, or None if those fields are deferred (see totals.contribution)."""
+    data = instance.__dict__ if data is None else data
+    values = [data.get(name) for name in GEOCODE_FIELDS[type(instance)]]
+    if any(value is None for value in values):
+        return None
+    return '\n'.join(values)
+
+
+def geocode_instance(instance):
+    """Set latitude/longitude from the address fields (None when the place isn't known)."""
+    point = geocode(geocode_source(instance) or '')
+    instance.latitude, instance.longitude = point or (None, None)
+    return point
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _unit_vector(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+class KDTree:
+    """
+    3-d tree over points on the unit sphere: straight-line distance between unit vectors
+    orders points exactly like great-circle distance, so there's no projection error.
+    """
+
+    def __init__(self, items):
+        """items: [(lat, lon, value)]"""
+        self.size = len(items)
+        self.root = self._build([(_unit_vector(lat, lon), value) for lat, lon, value in items], 0)
+
+    def _build(self, points, axis):
+        if not points:
+            return None
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        point, value = points[mid]
+        next_axis = (axis + 1) % 3
+        return (point, value, axis, self._build(points[:mid], next_axis), self._build(points[mid + 1:], next_axis))
+
+    def nearest(self, lat, lon, k=1, accept=None):
+        """[(value, km)] of the k nearest points whose value passes `accept`, nearest first."""
+        target = _unit_vector(lat, lon)
+        best = []  # max-heap of (-squared chord, tiebreak, value)
+        stack = [(self.root, 0.0)]  # (node, squared distance to the plane bounding it)
+        counter = 0
+        while stack:
+            node, bound = stack.pop()
+            # Skip subtrees that can't hold anything nearer than the k-th best so far
+            if node is None or (len(best) == k and bound >= -best[0][0]):
+                continue
+            point, value, axis, left, right = node
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+            if accept is None or accept(value):
+                d2 = sum((t - p) ** 2 for t, p in zip(target, point))
+                counter += 1
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, counter, value))
+                elif d2 < -best[0][0]:
+                    heapq.heapreplace(best, (-d2, counter, value))
+        result = sorted(best, key=lambda entry: -entry[0])
+        # chord length c on the unit sphere -> arc angle 2 * asin(c / 2)
+        return [(value, 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(-d2) / 2))) for d2, _, value in result]
+
+
+@dataclass(frozen=True)
+class SitePoint:
+    pk: int
+    name: str
+    city_state: str
+    region: str
+    latitude: float
+    longitude: float
+
+
+_lock = threading.Lock()
+_loaded = {'version': None, 'tree': None}
+
+
+def _current_version():
+    version = cache.get(SITE_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(SITE_INDEX_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(SITE_INDEX_VERSION_KEY)
+    return version
+
+
+def invalidate_site_index():
+    cache.set(SITE_INDEX_VERSION_KEY, time.time_ns(), None)
+
+
+def site_index():
+    """KDTree of SitePoints for active sites with coordinates, rebuilt when the sites change."""
+    version = _current_version()
+    with _lock:
+        if _loaded['version'] != version or version is None:
+            sites = (
+                DistributionSite.objects.filter(is_active=True, latitude__isnull=False, longitude__isnull=False)
+                .values_list('pk', 'name', 'city_state', 'region', 'latitude', 'longitude')
+            )
+            _loaded['tree'] = KDTree([(row[4], row[5], SitePoint(*row)) for row in sites])
+            _loaded['version'] = version
+        return _loaded['tree']
+
+
+def nearest_sites(lat, lon, k=5, region=None, accept=None):
+    """
+    [(SitePoint, km)] of the k nearest active sites. With `region`, only sites in that region
+    or open to any region; `accept(site_point)` filters further.
+    """
+    def allowed(site):
+        return (region is None or site.region in (region, '')) and (accept is None or accept(site))
+
+    return site_index().nearest(lat, lon, k, allowed if region is not None or accept else None)
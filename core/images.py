@@ -0,0 +1,135 @@
+"""
+Responsive derivatives of Event.image: several widths in WebP and JPEG plus a tiny blurred
+placeholder, recorded in Event.image_variants and rendered with srcset/sizes by the
+{% event_image %} tag (core/templatetags/core_images.py).
+Generated after the event is saved by the job queue (core/jobs.py), off the request path;
+`python manage.py generate_event_images` backfills existing events.
+"""
+
+import base64
+import io
+import logging
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageFilter, ImageOps
+
+from .cache import invalidate_page_cache
+from .jobs import enqueue, job
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (320, 640, 1024)
+VARIANT_DIR = 'events/variants'
+JPEG_QUALITY = 80
+WEBP_QUALITY = 78
+PLACEHOLDER_WIDTH = 16
+# JPEG has no transparency; flatten onto the card background colour.
+JPEG_BACKGROUND = (240, 240, 240)
+
+
+def _encode(image, fmt, **options):
+    buf = io.BytesIO()
+    image.save(buf, fmt, **options)
+    return buf.getvalue()
+
+
+def _flatten(image):
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, JPEG_BACKGROUND)
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def placeholder_data_uri(image):
+    """A ~16px wide blurred JPEG as a data: URI (a few hundred bytes), shown while loading."""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    small = _flatten(image).resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BILINEAR)
+    small = small.filter(ImageFilter.GaussianBlur(1))
+    data = _encode(small, 'JPEG', quality=40, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(data).decode()
+
+
+def delete_variants(variants):
+    for fmt in ('webp', 'jpeg'):
+        for _, name in variants.get(fmt, []):
+            try:
+                default_storage.delete(name)
+            except OSError:
+                logger.warning('Could not delete image variant %s', name)
+
+
+def build_variants(image_field):
+    """Write the derivatives of `image_field` to storage; returns the image_variants dict."""
+    with image_field.open('rb') as f:
+        source = Image.open(f)
+        source = ImageOps.exif_transpose(source)
+        source.load()
+    stem = PurePosixPath(image_field.name).stem
+    # Never upscale: an image narrower than the largest variant is also kept at its own width
+    widths = [w for w in VARIANT_WIDTHS if w < source.width]
+    if source.width <= VARIANT_WIDTHS[-1]:
+        widths.append(source.width)
+
+    variants = {
+        'source': image_field.name,
+        'width': source.width,
+        'height': source.height,
+        'webp': [],
+        'jpeg': [],
+        'placeholder': placeholder_data_uri(source),
+    }
+    has_alpha = source.mode in ('RGBA', 'LA', 'P')
+    for width in widths:
+        height = max(1, round(source.height * width / source.width))
+        resized = source.resize((width, height), Image.Resampling.LANCZOS) if width != source.width else source
+        webp = resized.convert('RGBA' if has_alpha else 'RGB')
+        outputs = (
+            ('webp', _encode(webp, 'WEBP', quality=WEBP_QUALITY, method=6)),
+            ('jpeg', _encode(_flatten(resized), 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)),
+        )
+        for fmt, data in outputs:
+            ext = 'jpg' if fmt == 'jpeg' else fmt
+            name = default_storage.save(f'{VARIANT_DIR}/{stem}-{width}w.{ext}', ContentFile(data))
+            variants[fmt].append([width, name])
+    return variants
+
+
+@job('generate_event_variants', max_attempts=3)
+def generate_event_variants(event_id, force=False):
+    """
+    (Re)build derivatives for one event. Skips events whose variants already match the
+    current image unless `force`. Returns True if anything was written.
+    """
+    event = Event.objects.filter(pk=event_id).only('image', 'image_variants').first()
+    if event is None:
+        return False
+    old = event.image_variants or {}
+    if not event.image:
+        if old:
+            Event.objects.filter(pk=event_id).update(image_variants={}, updated_at=timezone.now())
+            delete_variants(old)
+            invalidate_page_cache()
+        return bool(old)
+    if old.get('source') == event.image.name and not force:
+        return False
+
+    variants = build_variants(event.image)
+    # Only store them if the image wasn't replaced meanwhile; .update() sends no signals.
+    updated = Event.objects.filter(pk=event_id, image=event.image.name).update(image_variants=variants, updated_at=timezone.now())
+    if not updated:
+        delete_variants(variants)
+        return False
+    delete_variants(old)
+    invalidate_page_cache()
+    return True
+
+
+def schedule_event_variants(event_id):
+    """Generate derivatives in the background once the current transaction commits."""
+    enqueue('generate_event_variants', event_id=event_id)
@@ -0,0 +1,394 @@
+"""
+Bulk import of volunteers, donations, distribution sites and partners from CSV/XLSX.
+Used by `python manage.py import_records` and the admin "Import" page.
+Rows are parsed as a stream, validated with the app's ModelForms and written in batches:
+sites and partners upsert on name (bulk_create with update_conflicts), volunteers match
+existing sign-ups on the normalized email (core/dedup.py), donations are always new rows.
+Only columns present in the file are written. Bulk writes send no signals, so totals,
+rollups, cached pages and analytics are updated here, and imported volunteers are queued
+for a duplicate check.
+XLSX is read with openpyxl (in requirements.txt), imported only when an .xlsx file is read.
+"""
+
+import csv
+import io
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django import forms
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.forms import modelform_factory
+from django.shortcuts import render
+from django.urls import path
+
+from .analytics import invalidate_analytics
+from .cache import invalidate_page_cache
+from .dedup import BLOCKING_KEYS, set_blocking_keys
+from .forms import VolunteerForm
+from .geo import GEOCODE_FIELDS, geocode_instance, invalidate_site_index
+from .jobs import enqueue
+from .models import VolunteerSignUp, Donation, DistributionSite, PartnerOrganization
+from .rollups import apply_rollup_delta, contribution_date
+from .totals import apply_delta, contribution
+
+IMPORT_BATCH_SIZE = 1000
+
+# Errors kept for the report; a sheet with a wrong column can fail every row.
+MAX_REPORTED_ERRORS = 1000
+
+FALSE_VALUES = {'', '0', 'n', 'no', 'false', 'f', 'off'}
+
+
+class ImportFileError(Exception):
+    """The file can't be imported at all (unreadable, wrong type, missing required columns)."""
+
+
+class ImportRowForm(forms.ModelForm):
+    """
+    Base form for import rows. Unique constraints are left to the upsert: checking them
+    here would cost a query per row and reject the rows meant to update existing records.
+    """
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        for constraint in self._meta.model._meta.total_unique_constraints:
+            exclude.update(constraint.fields)
+        return exclude
+
+    def validate_unique(self):
+        pass
+
+
+@dataclass
+class ImportSpec:
+    model: type
+    fields: list
+    key: str = ''  # natural key column; empty = insert only
+    form: type = ImportRowForm
+    upsert: bool = False  # key has a unique constraint, so bulk_create(update_conflicts=True)
+    match_field: str = ''  # normalized form of key that existing rows are matched on
+
+
+IMPORT_SPECS = {
+    'volunteers': ImportSpec(
+        VolunteerSignUp,
+        ['first_name', 'last_name', 'email', 'phone', 'region', 'zip_code', 'availability', 'notes'],
+        key='email',
+        form=VolunteerForm,
+        match_field='email_normalized',
+    ),
+    'donations': ImportSpec(
+        Donation,
+        ['amount', 'received_at', 'donor_name', 'source', 'note'],
+    ),
+    'sites': ImportSpec(
+        DistributionSite,
+        ['name', 'address', 'city_state', 'region', 'capacity_meals', 'capacity_volunteers',
+         'contact_phone', 'contact_email', 'is_active', 'notes'],
+        key='name',
+        upsert=True,
+    ),
+    'partners': ImportSpec(
+        PartnerOrganization,
+        ['name', 'org_type', 'address', 'phone', 'email', 'website', 'notes', 'is_active'],
+        key='name',
+        upsert=True,
+    ),
+}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: list = field(default_factory=list)  # (line number, message)
+    error_count: int = 0
+    warnings: list = field(default_factory=list)
+    dry_run: bool = False
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+# -- reading -------------------------------------------------------------------
+
+def normalize_header(name):
+    return str(name or '').strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def _csv_rows(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        text = fileobj
+    else:
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        raise ImportFileError('The file is empty.')
+    yield [normalize_header(h) for h in header]
+    yield from reader
+
+
+def _xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('Reading .xlsx files needs openpyxl (pip install -r requirements.txt); or save the sheet as CSV.')
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFileError('The sheet is empty.')
+        yield [normalize_header(h) for h in header]
+        for row in rows:
+            yield ['' if v is None else v for v in row]
+    finally:
+        workbook.close()
+
+
+def read_rows(fileobj, filename):
+    """Yield the normalized header, then each row as a list of cell values."""
+    if filename.lower().endswith('.xlsx'):
+        return _xlsx_rows(fileobj)
+    if filename.lower().endswith(('.csv', '.txt')):
+        return _csv_rows(fileobj)
+    raise ImportFileError('Upload a .csv or .xlsx file.')
+
+
+# -- writing ---------------------------------------------------------------------
+
+def _row_data(header, row, boolean_fields, defaults):
+    data = {}
+    for name, value in zip(header, row):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        value = str(value).strip()
+        if name in boolean_fields:
+            value = '' if value.lower() in FALSE_VALUES else 'on'
+        elif not value and name in defaults:
+            value = defaults[name]
+        data[name] = value
+    return data
+
+
+def _write_batch(spec, columns, batch, result, user):
+    """Save one batch of valid (line, instance) pairs; returns the new rows that count toward the totals."""
+    model = spec.model
+    instances = [instance for _, instance in batch]
+    update_fields = [f for f in columns if f != spec.key]
+    if model in GEOCODE_FIELDS and set(GEOCODE_FIELDS[model]) <= set(columns):
+        for obj in instances:
+            geocode_instance(obj)
+        update_fields += ['latitude', 'longitude']
+    if model is VolunteerSignUp:
+        update_fields += [key for key, (_func, sources) in BLOCKING_KEYS.items() if set(sources) <= set(columns)]
+    if update_fields:
+        update_fields += [f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+
+    if spec.upsert:
+        keys = [getattr(obj, spec.key) for obj in instances]
+        existing = set(model.objects.filter(**{f'{spec.key}__in': keys}).values_list(spec.key, flat=True))
+        model.objects.bulk_create(
+            instances,
+            update_conflicts=bool(update_fields),
+            ignore_conflicts=not update_fields,
+            unique_fields=[spec.key],
+            update_fields=update_fields or None,
+        )
+        result.updated += len(existing)
+        result.created += len(instances) - len(existing)
+        return None
+
+    if spec.key:
+        # Volunteers: e-mail isn't unique (people may sign up twice), so match the newest
+        # sign-up per address and update it; the rest are new rows.
+        match = spec.match_field or spec.key
+        lookup = {getattr(obj, match): obj for obj in instances}
+        current = dict(
+            model.objects.filter(**{f'{match}__in': list(lookup)})
+            .order_by('submitted_at')
+            .values_list(match, 'pk')
+        )
+        to_update, to_create = [], []
+        for key, obj in lookup.items():
+            if key in current:
+                obj.pk = current[key]
+                to_update.append(obj)
+            else:
+                to_create.append(obj)
+        if to_update and update_fields:
+            model.objects.bulk_update(to_update, update_fields)
+        model.objects.bulk_create(to_create)
+        result.updated += len(to_update)
+        result.created += len(to_create)
+        # Updates don't touch status, so only new sign-ups change the count.
+        return to_create
+
+    if model is Donation:
+        for obj in instances:
+            obj.recorded_by = user
+    model.objects.bulk_create(instances)
+    result.created += len(instances)
+    return instances if model is Donation else None
+
+
+def import_records(kind, fileobj, filename, *, dry_run=False, user=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import `fileobj` as `kind` (a key of IMPORT_SPECS). Invalid rows are skipped and
+    reported with their line number; everything else is saved in one transaction, which
+    dry_run rolls back. Raises ImportFileError if the file can't be read at all.
+    """
+    spec = IMPORT_SPECS[kind]
+    rows = read_rows(fileobj, filename)
+    header = next(rows)
+    columns = [name for name in spec.fields if name in header]
+    unknown = [name for name in header if name and name not in spec.fields]
+
+    missing = [name for name in spec.fields if name not in columns and _is_required(spec, name)]
+    if missing:
+        raise ImportFileError('Missing required column(s): ' + ', '.join(missing))
+
+    form_class = modelform_factory(spec.model, form=spec.form, fields=columns)
+    boolean_fields = {
+        name for name, f in form_class.base_fields.items() if isinstance(f, forms.BooleanField)
+    }
+    # Blank cells in required columns that have a model default (e.g. source) take the default
+    defaults = {}
+    for name in columns:
+        model_field = spec.model._meta.get_field(name)
+        if not model_field.blank and model_field.has_default():
+            defaults[name] = model_field.get_default()
+    result = ImportResult(dry_run=dry_run)
+    if unknown:
+        result.warnings.append('Ignored column(s): ' + ', '.join(unknown))
+
+    # Totals and rollup deltas of the new rows, applied once at the end (bulk writes send no signals)
+    totals = [Decimal('0'), 0, 0]
+    by_day = defaultdict(lambda: [Decimal('0'), 0, 0])
+
+    def count(created):
+        for obj in created or ():
+            values = contribution(obj)
+            day = by_day[contribution_date(obj)]
+            for i, value in enumerate(values):
+                totals[i] += value
+                day[i] += value
+
+    with transaction.atomic():
+        batch, seen_keys = [], {}
+        for line, row in enumerate(rows, start=2):
+            if not any(str(v).strip() for v in row):
+                continue
+            result.rows += 1
+            form = form_class(data=_row_data(header, row, boolean_fields, defaults))
+            if not form.is_valid():
+                message = '; '.join(
+                    f'{name}: {" ".join(errors)}' for name, errors in form.errors.items()
+                )
+                result.add_error(line, message)
+                continue
+            instance = form.save(commit=False)
+            if spec.model is VolunteerSignUp:
+                set_blocking_keys(instance)
+            if spec.key:
+                # A key repeated within one batch: the later row wins
+                key = str(getattr(instance, spec.match_field or spec.key)).lower()
+                if key in seen_keys:
+                    batch[seen_keys[key]] = (line, instance)
+                    continue
+                seen_keys[key] = len(batch)
+            batch.append((line, instance))
+            if len(batch) >= batch_size:
+                count(_write_batch(spec, columns, batch, result, user))
+                batch, seen_keys = [], {}
+        if batch:
+            count(_write_batch(spec, columns, batch, result, user))
+
+        if dry_run:
+            transaction.set_rollback(True)
+        elif result.created or result.updated:
+            apply_delta(*totals)
+            for day, values in by_day.items():
+                apply_rollup_delta(day, *values)
+            transaction.on_commit(invalidate_page_cache)
+            transaction.on_commit(invalidate_analytics)
+            if spec.model is DistributionSite:
+                transaction.on_commit(invalidate_site_index)
+            if spec.model is VolunteerSignUp:
+                enqueue('find_volunteer_duplicates')
+    return result
+
+
+def _is_required(spec, name):
+    if name == spec.key:
+        return True
+    model_field = spec.model._meta.get_field(name)
+    return not model_field.blank and not model_field.has_default()
+
+
+# -- admin ---------------------------------------------------------------------------
+
+class ImportUploadForm(forms.Form):
+    file = forms.FileField(help_text='CSV (UTF-8) or XLSX; the first row holds the column names.')
+    dry_run = forms.BooleanField(required=False, initial=True, help_text='Check the file without saving anything.')
+
+
+class ImportAdminMixin:
+    """
+    ModelAdmin mixin: an "Import" page (import/) linked above the changelist.
+    Set import_kind to a key of IMPORT_SPECS.
+    """
+    import_kind = ''
+    change_list_template = 'admin/core/tools_change_list.html'
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name=f'{opts.app_label}_{opts.model_name}_import',
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            raise PermissionDenied
+        spec = IMPORT_SPECS[self.import_kind]
+        result = None
+        form = ImportUploadForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = import_records(
+                    self.import_kind, upload, upload.name,
+                    dry_run=form.cleaned_data['dry_run'], user=request.user,
+                )
+            except ImportFileError as e:
+                form.add_error('file', str(e))
+            else:
+                verb = 'Would import' if result.dry_run else 'Imported'
+                level = messages.WARNING if result.error_count else messages.SUCCESS
+                self.message_user(
+                    request,
+                    f'{verb} {result.rows - result.error_count} of {result.rows} rows: '
+                    f'{result.created} new, {result.updated} updated, {result.error_count} with errors.',
+                    level,
+                )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'Import {self.model._meta.verbose_name_plural}',
+            'form': form,
+            'result': result,
+            'columns': spec.fields,
+            'key': spec.key,
+        }
+        return render(request, 'admin/core/import_form.html', context)
@@ -0,0 +1,137 @@
+"""
+Small database-backed job queue for work that shouldn't hold up a request
+(image variants, staff notifications, rank rebalancing, ...).
+Register a handler with @job('name'), queue it with enqueue('name', **payload) from a view
+or signal, and run `python manage.py run_worker` to process the queue.
+Jobs are rows in core_job: a job queued inside a transaction only becomes visible to the
+worker once it commits. PostgreSQL workers claim rows with SELECT ... FOR UPDATE SKIP
+LOCKED; on SQLite each row is claimed with a compare-and-set UPDATE instead.
+Failures are retried with exponential backoff up to the job's max_attempts.
+With JOBS_EAGER (default: off) jobs run in-process right after commit instead, for a
+quick local setup without a worker.
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOBS = {}
+
+RETRY_BASE_DELAY = 10  # seconds; doubles with every attempt
+RETRY_MAX_DELAY = 3600
+# A running job whose worker hasn't finished it in this long is assumed lost and requeued.
+STALE_AFTER = timedelta(minutes=15)
+KEEP_DONE_FOR = timedelta(days=7)
+
+
+class JobHandler:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, **payload):
+        return self.func(**payload)
+
+
+def job(name, max_attempts=5):
+    """Register `func` as the handler for jobs called `name`; payload items become kwargs."""
+    def register(func):
+        if name in JOBS and JOBS[name].func is not func:
+            raise ValueError(f'Job {name!r} is already registered')
+        JOBS[name] = JobHandler(func, name, max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, delay=None, **payload):
+    """
+    Queue job `name` with a JSON-serializable payload; returns the Job row.
+    `delay` (timedelta) postpones it.
+    """
+    handler = JOBS[name]
+    run_after = timezone.now() + delay if delay else timezone.now()
+    queued = Job.objects.create(name=name, payload=payload, run_after=run_after, max_attempts=handler.max_attempts)
+    if getattr(settings, 'JOBS_EAGER', False) and not delay:
+        transaction.on_commit(lambda: run_job(claim_job(queued.pk, 'eager')))
+    return queued
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.9, 1.1))
+
+
+def _claim_update(worker_id):
+    return dict(status='running', locked_at=timezone.now(), locked_by=worker_id, attempts=F('attempts') + 1)
+
+
+def claim_job(pk, worker_id):
+    """Claim one specific queued job (compare-and-set); returns it or None."""
+    if not Job.objects.filter(pk=pk, status='queued').update(**_claim_update(worker_id)):
+        return None
+    return Job.objects.get(pk=pk)
+
+
+def claim_jobs(worker_id, limit):
+    """Mark up to `limit` due jobs as running for this worker and return them."""
+    due = Job.objects.filter(status='queued', run_after__lte=timezone.now()).order_by('run_after', 'pk')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**_claim_update(worker_id))
+    else:
+        # No row locks (SQLite): a row is ours only if our UPDATE still saw it queued.
+        ids = [
+            pk for pk in due.values_list('pk', flat=True)[:limit]
+            if Job.objects.filter(pk=pk, status='queued').update(**_claim_update(worker_id))
+        ]
+    return list(Job.objects.filter(pk__in=ids).order_by('run_after', 'pk'))
+
+
+def run_job(claimed):
+    """Run a claimed job and record the outcome; returns True on success."""
+    if claimed is None:
+        return False
+    handler = JOBS.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job {claimed.name!r}')
+        handler(**claimed.payload)
+    except Exception:
+        error = traceback.format_exc()
+        finished = claimed.attempts >= claimed.max_attempts or handler is None
+        logger.warning('Job %s #%s failed (attempt %s of %s)', claimed.name, claimed.pk, claimed.attempts, claimed.max_attempts)
+        Job.objects.filter(pk=claimed.pk).update(
+            status='failed' if finished else 'queued',
+            run_after=timezone.now() + retry_delay(claimed.attempts),
+            finished_at=timezone.now() if finished else None,
+            locked_at=None,
+            locked_by='',
+            last_error=error[-10000:],
+        )
+        return False
+    Job.objects.filter(pk=claimed.pk).update(status='done', finished_at=timezone.now(), locked_at=None, last_error='')
+    return True
+
+
+def requeue_stale():
+    """Put back jobs whose worker died mid-run; the lost run counts as an attempt."""
+    stale = Job.objects.filter(status='running', locked_at__lt=timezone.now() - STALE_AFTER)
+    reset = dict(locked_at=None, locked_by='', last_error='Worker stopped before the job finished.')
+    stale.filter(attempts__gte=F('max_attempts')).update(status='failed', finished_at=timezone.now(), **reset)
+    return stale.update(status='queued', **reset)
+
+
+def purge_finished():
+    return Job.objects.filter(status='done', finished_at__lt=timezone.now() - KEEP_DONE_FOR).delete()[0]
@@ -0,0 +1,185 @@
+"""
+Kanban board service shared by AdminDashboardView and KanbanBoardView.
+Fetches all tasks in one ordered query, groups them into status columns in Python and
+renders the assignee <option> markup once per request instead of once per card.
+"""
+
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from .jobs import enqueue, job
+from .models import Task
+from .ranks import MAX_RANK_LENGTH, rank_between, spaced_ranks
+from .staff import get_staff_user, get_staff_users
+
+TASK_ORDERING = ('rank', 'created_at')
+
+
+def display_name(user):
+    return user.get_full_name() or user.username
+
+
+class AssigneeOptions:
+    """<option> markup for the reassign select, built once and reused for every card."""
+
+    def __init__(self, staff_users):
+        self.choices = [(u.pk, display_name(u)) for u in staff_users]
+        self._by_selected = {}
+
+    def for_user_id(self, selected_id):
+        markup = self._by_selected.get(selected_id)
+        if markup is None:
+            empty = format_html('<option value="">— No one —</option>')
+            options = format_html_join(
+                '', '<option value="{}"{}>{}</option>',
+                ((pk, mark_safe(' selected') if pk == selected_id else '', name) for pk, name in self.choices),
+            )
+            markup = self._by_selected[selected_id] = empty + options
+        return markup
+
+
+def parse_assigned_to(raw_id, staff_users):
+    """Staff user matching the ?assigned_to= filter, or None (looked up in memory)."""
+    raw_id = (raw_id or '').strip()
+    if not raw_id:
+        return None
+    try:
+        uid = int(raw_id)
+    except ValueError:
+        return None
+    return next((u for u in staff_users if u.pk == uid), None)
+
+
+def build_board(assigned_to=''):
+    """
+    Context for the kanban templates: one list per status column plus filter state.
+    One task query, independent of the number of tasks; staff users come from core/staff.py.
+    """
+    staff_users = get_staff_users()
+    filter_user = parse_assigned_to(assigned_to, staff_users)
+    # (status, rank) ordering walks the core_task_status_rank_idx index
+    tasks = Task.objects.select_related('assigned_to').order_by('status', *TASK_ORDERING)
+    if filter_user:
+        tasks = tasks.filter(assigned_to_id=filter_user.pk)
+
+    columns = {status: [] for status, _ in Task.STATUS_CHOICES}
+    options = AssigneeOptions(staff_users)
+    for task in tasks:
+        task.assignee_options = options.for_user_id(task.assigned_to_id)
+        columns.setdefault(task.status, []).append(task)
+
+    return {
+        **columns,
+        'staff_users': staff_users,
+        'filter_user': filter_user,
+        'filter_assigned_to_id': filter_user.pk if filter_user else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Moving cards (JSON endpoint)
+# ---------------------------------------------------------------------------
+
+class MoveConflict(Exception):
+    """The card changed since the client loaded it (updated_at mismatch)."""
+
+
+def card_state(task):
+    """JSON-serialisable state of one card, returned by the move endpoint."""
+    # From the staff cache; only a former staff member still assigned costs a query
+    user = task.assigned_to_id and (get_staff_user(task.assigned_to_id) or task.assigned_to)
+    return {
+        'id': task.pk,
+        'status': task.status,
+        'status_display': task.get_status_display(),
+        'assigned_to': task.assigned_to_id,
+        'assigned_to_name': display_name(user) if user else '',
+        'rank': task.rank,
+        'updated_at': task.updated_at.isoformat(),
+    }
+
+
+def bottom_rank(status, exclude_pk=None):
+    """Rank that sorts after every other task in the column (one index lookup)."""
+    last = (
+        Task.objects.filter(status=status).exclude(pk=exclude_pk)
+        .order_by('-rank').values_list('rank', flat=True).first()
+    )
+    return rank_between(last or '', '')
+
+
+@job('rebalance_task_ranks', max_attempts=3)
+def rebalance_ranks(status, force=False):
+    """
+    Respace a column's ranks evenly. Only needed occasionally: when ranks grow past
+    MAX_RANK_LENGTH or neighbours share a rank. Returns the number of rows rewritten.
+    """
+    column = list(Task.objects.filter(status=status).order_by(*TASK_ORDERING).only('pk', 'rank'))
+    ranks = [t.rank for t in column]
+    needs = (
+        force
+        or any(not r or len(r) > MAX_RANK_LENGTH for r in ranks)
+        or any(a >= b for a, b in zip(ranks, ranks[1:]))
+    )
+    if not needs:
+        return 0
+    changed = []
+    for task, rank in zip(column, spaced_ranks(len(column))):
+        if task.rank != rank:
+            task.rank = rank
+            changed.append(task)
+    Task.objects.bulk_update(changed, ['rank'], batch_size=500)
+    return len(changed)
+
+
+def place_between(task, above, below):
+    """
+    Set task.rank so it sorts between `above` and `below` (either may be None).
+    Only the moved task is written, unless the neighbours' ranks are unusable (equal or
+    blank), in which case the column is rebalanced first.
+    """
+    before = above.rank if above else ''
+    after = below.rank if below else ''
+    if (above and not before) or (below and not after) or (before and after and before >= after):
+        rebalance_ranks(task.status, force=True)
+        if above:
+            above.refresh_from_db(fields=['rank'])
+            before = above.rank
+        if below:
+            below.refresh_from_db(fields=['rank'])
+            after = below.rank
+    task.rank = rank_between(before, after)
+
+
+def move_task(task, *, status=None, assigned_to=..., above_id=None, below_id=None, expected_updated_at=None):
+    """
+    Apply a status change, reassignment and/or reorder to a locked task row.
+    Raises MoveConflict if expected_updated_at no longer matches.
+    """
+    if expected_updated_at and expected_updated_at != task.updated_at.isoformat():
+        raise MoveConflict
+    update_fields = ['updated_at']
+    status_changed = status is not None and status != task.status
+    if status_changed:
+        task.status = status
+        update_fields.append('status')
+    if assigned_to is not ...:
+        task.assigned_to_id = assigned_to
+        update_fields.append('assigned_to')
+    if above_id or below_id:
+        ids = [pk for pk in (above_id, below_id) if pk]
+        neighbours = Task.objects.filter(status=task.status).exclude(pk=task.pk).in_bulk(ids)
+        place_between(task, neighbours.get(above_id), neighbours.get(below_id))
+        update_fields.append('rank')
+    elif status_changed:
+        task.rank = bottom_rank(task.status, exclude_pk=task.pk)
+        update_fields.append('rank')
+    task.save(update_fields=update_fields)
+    if len(task.rank) > 2 * MAX_RANK_LENGTH:
+        # The worker hasn't caught up; don't let ranks approach the column's max_length
+        rebalance_ranks(task.status)
+        task.refresh_from_db(fields=['rank'])
+    elif len(task.rank) > MAX_RANK_LENGTH:
+        # Ranks still sort correctly, just longer; respace the column after the response
+        enqueue('rebalance_task_ranks', status=task.status)
+    return task
@@ -0,0 +1,44 @@
+"""
+Management command: assign pending volunteers to distribution sites by region and capacity.
+Run: python manage.py assign_volunteers [--region tc|gmn] [--dry-run]
+Prints the planned volunteers per site; without --dry-run they are saved with status
+'assigned'. See core/assignment.py for how volunteers are matched to sites.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from core.assignment import assign_volunteers
+from core.models import VolunteerSignUp
+
+
+class Command(BaseCommand):
+    help = 'Assign pending volunteers to active sites, respecting region and volunteer capacity.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--region', choices=[code for code, _label in VolunteerSignUp.REGION_CHOICES],
+            help='Only assign volunteers from this region',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Show the plan without saving it')
+
+    def handle(self, *args, **options):
+        queryset = VolunteerSignUp.objects.all()
+        if options['region']:
+            queryset = queryset.filter(region=options['region'])
+        started = time.perf_counter()
+        plan, updated = assign_volunteers(queryset, dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        for load in plan.sites:
+            region = load.site.get_region_display() or 'any region'
+            self.stdout.write(
+                f'{load.site.name} ({region}): {load.current} + {len(load.volunteer_ids)} '
+                f'of {load.site.capacity_volunteers}{"" if load.room else " (full)"}'
+            )
+        for region, count in plan.unplaced.items():
+            self.stdout.write(self.style.WARNING(f'{region}: {count} volunteer(s) left pending, no room at a matching site'))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run: {plan.assigned} volunteer(s) would be assigned ({elapsed:.2f}s).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Assigned {updated} volunteer(s) ({elapsed:.2f}s).'))
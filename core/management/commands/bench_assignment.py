@@ -0,0 +1,75 @@
+"""
+Management command: time volunteer-to-site assignment for a large batch of sign-ups.
+Run: python manage.py bench_assignment [--volunteers 10000] [--sites 60] [--repeat 5]
+Adds the sites and pending sign-ups in a transaction that is rolled back afterwards (see
+core/benchmarks.py), located at random gazetteer places the way geocoding on save would
+(a tenth without a location), then times plan_assignments() and one apply_plan(). Existing
+sites and pending sign-ups are set aside for the run so only the bench rows are matched.
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from core.assignment import apply_plan, plan_assignments
+from core.benchmarks import measure, rolled_back, summary
+from core.geo import gazetteer, invalidate_site_index
+from core.models import DistributionSite, VolunteerSignUp
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Time planning and applying a volunteer-to-site assignment (rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--volunteers', type=int, default=10_000, help='Pending sign-ups (default: 10000)')
+        parser.add_argument('--sites', type=int, default=60, help='Active sites (default: 60)')
+        parser.add_argument('--repeat', type=int, default=5, help='Planning runs (default: 5)')
+
+    def handle(self, *args, **options):
+        rng = random.Random(1)
+        places = gazetteer()
+        cities = sorted(places['city'].items())
+        zip3s = sorted(places['zip3'].items())
+        with rolled_back():
+            DistributionSite.objects.update(is_active=False)
+            sites = []
+            for i in range(max(1, options['sites'])):
+                city, (lat, lon) = rng.choice(cities)
+                sites.append(DistributionSite(
+                    name=f'Bench site {i}', address='', city_state=f'{city.title()}, MN',
+                    region=rng.choice(['tc', 'gmn', '']), latitude=lat, longitude=lon,
+                    capacity_volunteers=rng.randint(50, 250),
+                ))
+            DistributionSite.objects.bulk_create(sites)
+            invalidate_site_index()  # bulk_create skips the signal that does this
+
+            VolunteerSignUp.objects.filter(status='pending', site__isnull=True).update(status='inactive')
+            batch = []
+            for i in range(options['volunteers']):
+                volunteer = VolunteerSignUp(
+                    first_name='Bench', last_name=f'Volunteer {i}', email=f'bench{i}@example.com',
+                    region=rng.choice(['tc', 'gmn']),
+                )
+                if rng.random() < 0.9:
+                    prefix, (volunteer.latitude, volunteer.longitude) = rng.choice(zip3s)
+                    volunteer.zip_code = f'{prefix}{rng.randrange(100):02d}'
+                batch.append(volunteer)
+                if len(batch) == BATCH_SIZE:
+                    VolunteerSignUp.objects.bulk_create(batch)
+                    batch = []
+            VolunteerSignUp.objects.bulk_create(batch)
+
+            capacity = sum(site.capacity_volunteers for site in sites)
+            self.stdout.write(f'{options["volunteers"]} pending sign-ups, {len(sites)} sites, room for {capacity}')
+            timings, queries = measure(plan_assignments, max(1, options['repeat']))
+            plan = plan_assignments()
+            self.stdout.write(self.style.SUCCESS(
+                f'plan: {plan.assigned} placed, {sum(plan.unplaced.values())} left pending; '
+                f'{queries} queries, {summary(timings)}'
+            ))
+            start = time.perf_counter()
+            updated = apply_plan(plan)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(self.style.SUCCESS(f'apply: {updated} rows updated in {elapsed:.2f} ms'))
@@ -0,0 +1,45 @@
+"""
+Management command: measure how many Coming Soon pages one process serves per second.
+Run: python manage.py bench_coming_soon [--requests 3000]
+Requests / through the full middleware stack (core/middleware.py) as a first-time visitor
+(no cookie, gzip), a revalidating one (If-None-Match, 304) and one with a stale session
+cookie, which still costs a session lookup. With DEBUG on the page is re-rendered for
+every request, so run it with DEBUG=False for numbers comparable to production.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarks import bench_client
+from core.middleware import ComingSoonMiddleware
+
+MIDDLEWARE_PATH = f'{ComingSoonMiddleware.__module__}.{ComingSoonMiddleware.__name__}'
+
+
+class Command(BaseCommand):
+    help = 'Requests per second for the Coming Soon page served to anonymous visitors.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=3000, help='Requests per case (default: 3000)')
+
+    def handle(self, *args, **options):
+        if MIDDLEWARE_PATH not in settings.MIDDLEWARE:
+            raise CommandError(f'{MIDDLEWARE_PATH} is not in MIDDLEWARE.')
+        requests = max(1, options['requests'])
+        client = bench_client()
+        first = client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        cases = [
+            ('no cookie', {'HTTP_ACCEPT_ENCODING': 'gzip'}),
+            ('If-None-Match', {'HTTP_ACCEPT_ENCODING': 'gzip', 'HTTP_IF_NONE_MATCH': first['ETag']}),
+            ('stale session cookie', {'HTTP_ACCEPT_ENCODING': 'gzip', 'HTTP_COOKIE': f'{settings.SESSION_COOKIE_NAME}=stale'}),
+        ]
+        self.stdout.write(f'DEBUG={settings.DEBUG}, {requests} requests per case')
+        for label, headers in cases:
+            start = time.perf_counter()
+            for _ in range(requests):
+                response = client.get('/', **headers)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f'{label}: {requests / elapsed:,.0f} req/s, status {response.status_code}, {len(response.content)} bytes'
+            ))
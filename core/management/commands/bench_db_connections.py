@@ -0,0 +1,58 @@
+"""
+Management command: measure per-request database latency under the current connection settings.
+Run: python manage.py bench_db_connections [--requests 500] [--queries 3]
+Each simulated request fires request_started/request_finished like a real one, so Django
+opens, reuses, health-checks or returns pooled connections exactly as it would under gunicorn.
+Compare runs with DB_CONN_MAX_AGE=0, the default persistent connections and DB_POOL=True.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = 'Time simulated requests that run a few trivial queries, including connection setup.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests (default: 500)')
+        parser.add_argument('--queries', type=int, default=3, help='SELECT 1 queries per request (default: 3)')
+
+    def handle(self, *args, **options):
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(count_connection)
+        timings = []
+        try:
+            for _ in range(options['requests']):
+                request_started.send(sender=self.__class__)
+                start = time.perf_counter()
+                with connection.cursor() as cursor:
+                    for _ in range(options['queries']):
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                timings.append((time.perf_counter() - start) * 1000)
+                request_finished.send(sender=self.__class__)
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+
+        settings_dict = connection.settings_dict
+        timings.sort()
+        self.stdout.write(
+            f"{connection.vendor}: CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}, "
+            f"health checks={settings_dict['CONN_HEALTH_CHECKS']}, "
+            f"pool={'pool' in settings_dict.get('OPTIONS', {})}"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(timings)} requests: mean {statistics.mean(timings):.2f} ms, "
+            f"p50 {timings[len(timings) // 2]:.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms; "
+            f"{len(opened)} connection(s) opened or taken from the pool"
+        ))
@@ -0,0 +1,56 @@
+"""
+Management command: time the kanban board and the dashboard with a large task list.
+Run: python manage.py bench_kanban [--tasks 1000] [--staff 8] [--repeat 20]
+Adds the tasks and staff users in a transaction that is rolled back afterwards (see
+core/benchmarks.py), then requests /dashboard/tasks/ and /dashboard/ as one of the staff
+users and prints the query count and latency of each.
+"""
+
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from core.benchmarks import bench_client, measure, rolled_back, summary
+from core.models import Task
+from core.ranks import spaced_ranks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Time the kanban board and dashboard with many tasks (rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks on the board (default: 1000)')
+        parser.add_argument('--staff', type=int, default=8, help='Staff users to assign them to (default: 8)')
+        parser.add_argument('--repeat', type=int, default=20, help='Requests per page (default: 20)')
+
+    def handle(self, *args, **options):
+        rng = random.Random(1)
+        with rolled_back():
+            password = make_password(None)
+            staff = User.objects.bulk_create(
+                User(username=f'bench-staff-{i}', first_name=f'Staff {i}', is_staff=True, password=password)
+                for i in range(max(1, options['staff']))
+            )
+            statuses = [key for key, _label in Task.STATUS_CHOICES]
+            columns = {status: 0 for status in statuses}
+            for _ in range(options['tasks']):
+                columns[rng.choice(statuses)] += 1
+            Task.objects.bulk_create(
+                Task(
+                    title=f'Bench task {status} {i}', status=status, rank=rank,
+                    assigned_to=rng.choice(staff) if rng.random() < 0.7 else None, created_by=staff[0],
+                )
+                for status, size in columns.items()
+                for i, rank in enumerate(spaced_ranks(size))
+            )
+            client = bench_client()
+            client.force_login(staff[0])
+            self.stdout.write(f'{options["tasks"]} tasks, {len(staff)} staff users')
+            for name in ('kanban', 'dashboard'):
+                url = reverse(f'core:{name}')
+                timings, queries = measure(lambda: client.get(url), max(1, options['repeat']))
+                self.stdout.write(self.style.SUCCESS(f'{url}: {queries} queries, {summary(timings)}'))
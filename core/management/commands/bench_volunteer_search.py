@@ -0,0 +1,74 @@
+"""
+Management command: time the dashboard volunteer search on a large table.
+Run: python manage.py bench_volunteer_search [--volunteers 100000] [--repeat 20]
+Adds the sign-ups in a transaction that is rolled back afterwards (see core/benchmarks.py),
+then times search_volunteer_ids() for a few typical queries against the icontains scan it
+replaced, and the /dashboard/volunteers/?q= page.
+"""
+
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.urls import reverse
+from core import search
+from core.benchmarks import bench_client, measure, rolled_back, summary
+from core.dedup import set_blocking_keys
+from core.management.commands.seed_fake_data import AVAILABILITY, EMAIL_DOMAINS, FIRST_NAMES, LAST_NAMES
+from core.models import VolunteerSignUp
+
+User = get_user_model()
+
+# Full name, last name only, a name prefix, an e-mail domain and a word from availability
+QUERIES = ['ana cruz', 'xiong', 'thomp', 'umn.edu', 'weekends']
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Time ranked volunteer search against the icontains fallback (rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--volunteers', type=int, default=100_000, help='Sign-ups to search (default: 100000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query (default: 20)')
+
+    def handle(self, *args, **options):
+        rng = random.Random(1)
+        repeat = max(1, options['repeat'])
+        with rolled_back():
+            batch = []
+            for _ in range(options['volunteers']):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                volunteer = VolunteerSignUp(
+                    first_name=first, last_name=last, region=rng.choice(['tc', 'gmn']),
+                    email=f'{first}.{last}{rng.randrange(10000)}@{rng.choice(EMAIL_DOMAINS)}'.lower(),
+                    availability=rng.choice(AVAILABILITY),
+                )
+                set_blocking_keys(volunteer)
+                batch.append(volunteer)
+                if len(batch) == BATCH_SIZE:
+                    VolunteerSignUp.objects.bulk_create(batch)
+                    batch = []
+            VolunteerSignUp.objects.bulk_create(batch)
+
+            if connection.vendor == 'postgresql':
+                backend = 'PostgreSQL tsvector + pg_trgm'
+            elif connection.vendor == 'sqlite' and search.sqlite_fts_available():
+                backend = 'SQLite FTS5'
+            else:
+                backend = 'icontains fallback'
+            self.stdout.write(f'{VolunteerSignUp.objects.count()} sign-ups, {connection.vendor}, search: {backend}')
+            for query in QUERIES:
+                ids = search.search_volunteer_ids(query)
+                ranked, _queries = measure(lambda: search.search_volunteer_ids(query), repeat)
+                terms = search.query_terms(query)
+                scan, _queries = measure(lambda: search._search_fallback(terms, search.MAX_RESULTS), repeat)
+                self.stdout.write(self.style.SUCCESS(
+                    f'{query!r}: {len(ids)} matches; ranked {summary(ranked)}; icontains {summary(scan)}'
+                ))
+
+            client = bench_client()
+            client.force_login(User.objects.create(username='bench-staff', is_staff=True))
+            url = reverse('core:volunteer_list')
+            timings, queries = measure(lambda: client.get(url, {'q': QUERIES[0]}), repeat)
+            self.stdout.write(self.style.SUCCESS(f'{url}?q={QUERIES[0]}: {queries} queries, {summary(timings)}'))
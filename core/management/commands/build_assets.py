@@ -0,0 +1,43 @@
+"""
+Management command: build the self-hosted static assets and collect them (see core/assets.py).
+Run: python manage.py build_assets [--skip-download]
+Downloads and trims Bootstrap, SortableJS and Font Awesome into core/static/core/dist/, renders
+the logo/favicon sizes, runs collectstatic (fingerprinted names when STATIC_MANIFEST is on) and
+writes .gz/.br copies for nginx. Templates use the built files unless SELF_HOSTED_ASSETS=False.
+"""
+
+from urllib.error import URLError
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from core.assets import DIST_DIR, brotli, build_logo_variants, compress_static, vendor_assets
+
+
+class Command(BaseCommand):
+    help = 'Vendor front-end libraries, build logo/favicon sizes, collect and pre-compress static files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-download', action='store_true', help='Reuse the vendored files already in core/static/core/dist/')
+
+    def handle(self, *args, **options):
+        if not options['skip_download']:
+            template_dirs = [d for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+            roots = [settings.BASE_DIR / 'core' / 'templates', *settings.STATICFILES_DIRS, *template_dirs]
+            try:
+                written = vendor_assets(roots)
+            except (URLError, OSError) as e:
+                raise CommandError(f'Could not download vendored assets: {e}')
+            self.stdout.write(f'Vendored {len(written)} file(s) into {DIST_DIR}.')
+        elif not DIST_DIR.exists():
+            raise CommandError(f'{DIST_DIR} does not exist; run without --skip-download first.')
+
+        written = build_logo_variants(settings.BASE_DIR / 'core' / 'static' / 'core' / 'images' / 'logo.png')
+        self.stdout.write(f'Built {len(written)} logo/favicon file(s).')
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        count, before, after = compress_static()
+        note = '' if brotli else ' (brotli not installed: .gz only)'
+        self.stdout.write(self.style.SUCCESS(
+            f'Compressed {count} file(s): {before // 1024} KB -> {after // 1024} KB gzipped{note}.'
+        ))
@@ -0,0 +1,53 @@
+"""
+Management command: find volunteer sign-ups that look like the same person.
+Run: python manage.py find_duplicate_volunteers [--min-score 0.75] [--rekey] [--dry-run]
+Compares sign-ups that share a blocking key (core/dedup.py) and stores new likely pairs as
+open candidates for review on the dashboard (Volunteers → Review duplicates); pairs already
+stored, including dismissed ones, are left alone. --rekey first recomputes every sign-up's
+blocking keys, e.g. after the normalization rules change.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.dedup import BLOCKING_KEYS, MIN_SCORE, find_duplicates, save_candidates, set_blocking_keys
+from core.models import VolunteerSignUp
+
+
+class Command(BaseCommand):
+    help = 'Find likely duplicate volunteer sign-ups and queue them for review.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-score', type=float, default=MIN_SCORE, help=f'Similarity threshold (default: {MIN_SCORE})')
+        parser.add_argument('--rekey', action='store_true', help='Recompute the blocking keys of every sign-up first')
+        parser.add_argument('--dry-run', action='store_true', help='Report the pairs without saving them')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['rekey']:
+            self.rekey()
+        pairs = find_duplicates(min_score=options['min_score'])
+        elapsed = time.perf_counter() - started
+
+        if options['dry_run']:
+            for first, second, score, reasons in pairs[:50]:
+                self.stdout.write(f'#{first} / #{second}: {score:.2f} ({reasons or "similar"})')
+            self.stdout.write(self.style.WARNING(f'Dry run: {len(pairs)} likely pair(s) ({elapsed:.2f}s).'))
+            return
+        created = save_candidates(pairs)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(pairs)} likely pair(s), {created} new ({time.perf_counter() - started:.2f}s).'
+        ))
+
+    def rekey(self):
+        fields = [name for _func, sources in BLOCKING_KEYS.values() for name in sources]
+        batch = []
+        with transaction.atomic():
+            for volunteer in VolunteerSignUp.objects.only(*fields).iterator(chunk_size=1000):
+                set_blocking_keys(volunteer)
+                batch.append(volunteer)
+                if len(batch) == 1000:
+                    VolunteerSignUp.objects.bulk_update(batch, list(BLOCKING_KEYS))
+                    batch = []
+            VolunteerSignUp.objects.bulk_update(batch, list(BLOCKING_KEYS))
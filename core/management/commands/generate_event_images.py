@@ -0,0 +1,29 @@
+"""
+Management command: build responsive image variants (WebP/JPEG widths + blur placeholder)
+for events whose variants are missing or out of date.
+Run: python manage.py generate_event_images [--force]
+New uploads get theirs automatically after save; use this for existing events or after
+changing the widths/quality in core/images.py (with --force).
+"""
+
+from django.core.management.base import BaseCommand
+from core.images import generate_event_variants
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG variants and placeholders for event images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variants even if they are up to date')
+
+    def handle(self, *args, **options):
+        generated = failed = 0
+        for event_id in Event.objects.exclude(image='').values_list('pk', flat=True):
+            try:
+                if generate_event_variants(event_id, force=options['force']):
+                    generated += 1
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'Event {event_id}: {e}'))
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {generated} event(s); {failed} failed.'))
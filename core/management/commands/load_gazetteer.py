@@ -0,0 +1,86 @@
+"""
+Management command: rebuild the bundled gazetteer (core/data/mn_gazetteer.csv) from the
+Census Bureau gazetteer files, downloaded beforehand (this command makes no network calls).
+Run: python manage.py load_gazetteer [--zcta 2023_Gaz_zcta_national.txt] [--places 2023_Gaz_place_27.txt] [--regeocode]
+--zcta replaces the ZIP code rows with every Minnesota ZCTA, --places replaces the city rows
+with every Minnesota place; other rows are kept. --regeocode then recomputes the coordinates
+of all sites and volunteers from the new data. Restart the app so processes reload the file.
+"""
+
+import csv
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core import geo
+from core.models import DistributionSite, VolunteerSignUp
+
+# Census place names end in their legal type: "Saint Paul city", "Mahtomedi city", "Cohasset CDP"
+_PLACE_SUFFIX = re.compile(r'\s+(city|town|township|CDP|village)$')
+
+
+def read_census(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        reader.fieldnames = [name.strip() for name in reader.fieldnames]
+        yield from reader
+
+
+class Command(BaseCommand):
+    help = 'Rebuild core/data/mn_gazetteer.csv from Census ZCTA/place gazetteer files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zcta', help='Census ZCTA gazetteer file (tab-separated)')
+        parser.add_argument('--places', help='Census place gazetteer file for Minnesota (tab-separated)')
+        parser.add_argument('--regeocode', action='store_true', help='Recompute coordinates of sites and volunteers')
+
+    def handle(self, *args, **options):
+        if not (options['zcta'] or options['places'] or options['regeocode']):
+            raise CommandError('Give --zcta and/or --places (or --regeocode).')
+        rows = {}
+        for kind, places in geo.gazetteer().items():
+            for key, (lat, lon) in places.items():
+                rows[kind, key] = (key, lat, lon)
+        with open(geo.GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+            names = {(row['kind'], row['key']): row['name'] for row in csv.DictReader(f)}
+
+        try:
+            if options['zcta']:
+                rows = {k: v for k, v in rows.items() if k[0] != 'zip'}
+                for row in read_census(options['zcta']):
+                    code = row['GEOID']
+                    if '55001' <= code <= '56799':
+                        rows['zip', code] = (code, float(row['INTPTLAT']), float(row['INTPTLONG']))
+                        names['zip', code] = code
+            if options['places']:
+                rows = {k: v for k, v in rows.items() if k[0] != 'city'}
+                for row in read_census(options['places']):
+                    if row.get('USPS', 'MN') != 'MN':
+                        continue
+                    name = _PLACE_SUFFIX.sub('', row['NAME'].strip())
+                    key = geo.normalize_place(name)
+                    rows['city', key] = (key, float(row['INTPTLAT']), float(row['INTPTLONG']))
+                    names['city', key] = name
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f'Could not read the gazetteer file: {e}')
+
+        if options['zcta'] or options['places']:
+            with open(geo.GAZETTEER_PATH, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(['kind', 'key', 'name', 'lat', 'lon'])
+                for (kind, key), (_key, lat, lon) in sorted(rows.items()):
+                    writer.writerow([kind, key, names.get((kind, key), key), f'{lat:.6f}', f'{lon:.6f}'])
+            geo.gazetteer.cache_clear()
+            counts = {kind: sum(1 for k in rows if k[0] == kind) for kind in ('zip', 'zip3', 'city')}
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote {counts['zip']} ZIP codes, {counts['city']} cities, {counts['zip3']} ZIP prefixes."
+            ))
+
+        if options['regeocode']:
+            for model in (DistributionSite, VolunteerSignUp):
+                objs = list(model.objects.only('pk', *geo.GEOCODE_FIELDS[model]))
+                located = sum(1 for obj in objs if geo.geocode_instance(obj))
+                with transaction.atomic():
+                    model.objects.bulk_update(objs, ['latitude', 'longitude'], batch_size=1000)
+                self.stdout.write(f'{model._meta.verbose_name_plural}: {located} of {len(objs)} located')
+            geo.invalidate_site_index()
@@ -0,0 +1,28 @@
+"""
+Management command: respace kanban task ranks so every column has short, evenly spaced ranks.
+Run: python manage.py rebalance_task_ranks [--force]
+Moving a card writes only that card's rank; ranks slowly get longer when many cards are
+dropped at the same spot. Columns are only rewritten when a rank is longer than
+core.ranks.MAX_RANK_LENGTH or ranks collide, unless --force is given. Safe to run from cron.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.kanban import rebalance_ranks
+from core.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Rebalance kanban task ranks (only columns that need it, unless --force).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Respace every column even if not needed')
+
+    def handle(self, *args, **options):
+        for status, label in Task.STATUS_CHOICES:
+            with transaction.atomic():
+                changed = rebalance_ranks(status, force=options['force'])
+            if changed:
+                self.stdout.write(self.style.SUCCESS(f'{label}: rewrote {changed} rank(s)'))
+            else:
+                self.stdout.write(f'{label}: ok')
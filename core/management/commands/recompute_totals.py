@@ -0,0 +1,91 @@
+"""
+Management command: rebuild the active goal's running totals and the daily/weekly impact
+rollups from Donation, MealKitDistribution and VolunteerSignUp rows.
+Run: python manage.py recompute_totals [--chunk-size 5000] [--checkpoint totals.json] [--dry-run]
+Scans each table in primary-key chunks; with --checkpoint, progress is saved after every
+chunk so an interrupted run resumes where it stopped (--dry-run reads a checkpoint but never
+writes or removes it). The rollups are rebuilt afterwards in one grouped pass
+(core/rollups.py). Run it during a quiet period: edits to already-scanned rows made while
+it runs are picked up by the next run.
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+from core.models import FundraisingGoal, Donation, MealKitDistribution, VolunteerSignUp
+from core.rollups import rebuild_rollups
+from core.totals import set_totals
+
+# (key, queryset, aggregate) — each aggregate yields one part of the totals
+SOURCES = [
+    ('amount', lambda: Donation.objects.all(), Sum('amount')),
+    ('meals', lambda: MealKitDistribution.objects.all(), Sum('meal_kits_count')),
+    ('volunteers', lambda: VolunteerSignUp.objects.exclude(status='inactive'), Count('pk')),
+]
+
+
+class Command(BaseCommand):
+    help = 'Rebuild fundraising totals (amount raised, meals, volunteers) and impact rollups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per chunk (default: 5000)')
+        parser.add_argument('--checkpoint', type=str, default='', help='JSON file to save/resume progress')
+        parser.add_argument('--dry-run', action='store_true', help='Show computed totals without saving')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        checkpoint_path = Path(options['checkpoint']) if options['checkpoint'] else None
+        state = self.load_checkpoint(checkpoint_path)
+
+        for key, queryset, aggregate in SOURCES:
+            progress = state.setdefault(key, {'cursor': 0, 'total': '0', 'done': False})
+            while not progress['done']:
+                qs = queryset().order_by('pk')
+                bounds = list(qs.filter(pk__gt=progress['cursor']).values_list('pk', flat=True)[chunk_size - 1:chunk_size])
+                chunk = qs.filter(pk__gt=progress['cursor'])
+                if bounds:
+                    chunk = chunk.filter(pk__lte=bounds[0])
+                value = chunk.aggregate(value=aggregate)['value'] or 0
+                progress['total'] = str(Decimal(progress['total']) + Decimal(value))
+                if bounds:
+                    progress['cursor'] = bounds[0]
+                else:
+                    progress['done'] = True
+                if not options['dry_run']:
+                    self.save_checkpoint(checkpoint_path, state)
+            self.stdout.write(f"{key}: {progress['total']}")
+
+        amount = Decimal(state['amount']['total'])
+        meals = int(Decimal(state['meals']['total']))
+        volunteers = int(Decimal(state['volunteers']['total']))
+        if options['dry_run']:
+            goal = FundraisingGoal.objects.filter(is_active=True).first()
+            if goal:
+                self.stdout.write(
+                    f'Stored: {goal.current_amount} / {goal.meals_funded} meals / {goal.volunteers_count} volunteers'
+                )
+            self.stdout.write(self.style.WARNING('Dry run: totals not saved.'))
+        else:
+            set_totals(amount, meals, volunteers)
+            self.stdout.write(self.style.SUCCESS(
+                f'Totals saved: ${amount} — {meals} meals — {volunteers} volunteers.'
+            ))
+            rows = rebuild_rollups()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily/weekly rollup row(s).'))
+            if checkpoint_path and checkpoint_path.exists():
+                checkpoint_path.unlink()
+
+    def load_checkpoint(self, path):
+        if path and path.exists():
+            self.stdout.write(f'Resuming from checkpoint {path}')
+            return json.loads(path.read_text())
+        return {}
+
+    def save_checkpoint(self, path, state):
+        if path:
+            tmp = path.with_suffix(path.suffix + '.tmp')
+            tmp.write_text(json.dumps(state))
+            tmp.replace(path)
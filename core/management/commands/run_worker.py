@@ -0,0 +1,83 @@
+"""
+Management command: process background jobs (core/jobs.py).
+Run: python manage.py run_worker [--concurrency 2] [--poll-interval 1] [--once]
+Claims due jobs, runs them on a pool of threads, retries failures with backoff and
+requeues jobs left running by a worker that died. Several workers can run at once.
+Stops cleanly on SIGTERM/SIGINT after the jobs in progress finish. See deploy/worker.service.
+"""
+
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from core.jobs import claim_jobs, purge_finished, requeue_stale, run_job
+
+# How often to look for jobs abandoned by dead workers and purge old finished ones
+HOUSEKEEPING_INTERVAL = 60
+
+
+def _run(job):
+    close_old_connections()
+    try:
+        return run_job(job)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Run the background job worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Jobs run in parallel (default: 2; use 1 on SQLite)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty (default: 1)')
+        parser.add_argument('--once', action='store_true', help='Run all due jobs, then exit')
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        stopping = threading.Event()
+
+        def stop(signum, frame):
+            self.stdout.write('Stopping after running jobs finish...')
+            stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f'Worker {worker_id} started with {concurrency} thread(s).')
+        running = set()
+        done = failed = 0
+        next_housekeeping = 0.0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job') as pool:
+            while not stopping.is_set():
+                if time.monotonic() >= next_housekeeping:
+                    requeued = requeue_stale()
+                    if requeued:
+                        self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale job(s).'))
+                    purge_finished()
+                    next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+
+                for future in [f for f in running if f.done()]:
+                    running.discard(future)
+                    if future.exception() is None and future.result():
+                        done += 1
+                    else:
+                        failed += 1
+
+                free = concurrency - len(running)
+                jobs = claim_jobs(worker_id, free) if free else []
+                for job in jobs:
+                    running.add(pool.submit(_run, job))
+                close_old_connections()
+
+                if not jobs:
+                    if options['once'] and not running:
+                        break
+                    stopping.wait(options['poll_interval'] if not running else 0.05)
+        connections.close_all()
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped: {done} job(s) done, {failed} failed.'))
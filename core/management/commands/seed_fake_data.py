@@ -0,0 +1,474 @@
+"""
+Management command: fill the database with fake data for scale testing and benchmarks.
+Run: python manage.py seed_fake_data [--seed 1] [--scale 0.1] [--batch-size 5000] [--donations 2000000 ...]
+Every model in core/models.py gets rows with valid foreign keys: by default 100k volunteer
+sign-ups, 1M donations, 50k meal kit distributions, 5k tasks and proportionate amounts of
+the rest (COUNTS). --scale multiplies all defaults; a per-model option such as --volunteers
+sets that count exactly. The same --seed and --as-of on an empty database give the same rows.
+Rows are generated batch by batch and written with bulk_create, which sends no signals, so
+everything the signals keep up to date is rebuilt afterwards: geocodes and blocking keys are
+set while generating, then totals and rollups (recompute_totals), duplicate candidates
+(core/dedup.py) and the page, analytics, site index and staff caches.
+Only runs with DEBUG on unless --force is given.
+"""
+
+import contextlib
+import itertools
+import random
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core import geo
+from core.analytics import invalidate_analytics
+from core.cache import invalidate_page_cache
+from core.dedup import find_duplicates, save_candidates, set_blocking_keys
+from core.jobs import JOBS
+from core.models import (
+    ContactMessage, DistributionSite, Donation, Event, FoodOrder, FundraisingGoal, ImpactUpdate, Job,
+    MealKitDistribution, PartnerContact, PartnerOrganization, Task, VolunteerSignUp,
+)
+from core.ranks import spaced_ranks
+from core.staff import invalidate_staff_users
+
+User = get_user_model()
+
+# Default rows per model, before --scale
+COUNTS = {
+    'staff': 25,
+    'events': 500,
+    'sites': 500,
+    'partners': 300,  # plus 1-3 contacts each
+    'volunteers': 100_000,
+    'messages': 20_000,
+    'impact_updates': 200,
+    'donations': 1_000_000,
+    'distributions': 50_000,
+    'food_orders': 10_000,
+    'tasks': 5_000,
+    'jobs': 10_000,
+}
+HISTORY_DAYS = 3 * 365  # dated rows are spread over this many days before --as-of
+DUPLICATE_RATE = 0.02  # share of volunteers who sign up again with a variation
+TWIN_CITIES_RADIUS_KM = 50
+STAFF_USERNAME = 'seed-staff-{}'
+# Donation amounts (dollars) and their relative weights: about $68 on average
+DONATION_AMOUNTS = [5, 10, 20, 25, 50, 100, 250, 500, 1000]
+DONATION_WEIGHTS = [10, 15, 20, 20, 15, 10, 6, 3, 1]
+# FundraisingGoal.current_amount holds at most 99,999,999.99: with more donations than fit
+# at the amounts above, every amount is scaled down so the expected total is this, which
+# leaves 10% for chance (far more than a million random donations ever stray)
+MAX_SEEDED_TOTAL = 90_000_000
+GOAL_TARGET = Decimal('75000000')
+
+FIRST_NAMES = [
+    'Abdi', 'Alex', 'Amina', 'Ana', 'Ben', 'Carlos', 'Chris', 'Dana', 'David', 'Elena', 'Emily', 'Erik',
+    'Fatima', 'Grace', 'Hannah', 'Ingrid', 'Jamal', 'Jen', 'John', 'Jose', 'Kao', 'Kari', 'Kuha', 'Lars',
+    'Leah', 'Linda', 'Maria', 'Mark', 'Mai', 'Nadia', 'Nick', 'Olga', 'Pa', 'Paul', 'Rosa', 'Sam', 'Sara',
+    'Sean', 'Tou', 'Vang', 'Winona', 'Yia',
+]
+LAST_NAMES = [
+    'Anderson', 'Bakken', 'Brown', 'Cruz', 'Dahl', 'Erickson', 'Garcia', 'Hansen', 'Her', 'Hassan',
+    'Johnson', 'Jones', 'Kim', 'Larson', 'Lee', 'Lopez', 'Lor', 'Martin', 'Miller', 'Mohamed', 'Moua',
+    'Nelson', 'Nguyen', 'Olson', 'Peterson', 'Ramirez', 'Schmidt', 'Smith', 'Swanson', 'Thao', 'Thompson',
+    'Vang', 'Warsame', 'Williams', 'Xiong', 'Yang',
+]
+NICKNAMES = {'Alex': 'Alexander', 'Ben': 'Benjamin', 'Chris': 'Christopher', 'Jen': 'Jennifer', 'Nick': 'Nicholas', 'Sam': 'Samantha'}
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'comcast.net', 'umn.edu']
+STREETS = ['Main St', 'Lake St', 'Central Ave', 'University Ave', '1st Ave N', 'Broadway', 'Park Ave', 'Oak St', 'County Rd 10']
+SITE_KINDS = ['Community Center', 'Food Shelf', 'Church', 'School', 'Library', 'Tribal Center', 'Senior Center']
+PARTNER_WORDS = ['North Star', 'Prairie', 'Lakes', 'River', 'Harvest', 'Northwoods', 'Second', 'Open Door', 'Neighbor']
+PARTNER_KINDS = ['Food Bank', 'Foods', 'Foundation', 'Alliance', 'Coalition', 'Co-op', 'Network']
+SUPPLIERS = ['Sysco Minnesota', 'US Foods', 'Second Harvest Heartland', 'Cub Foods', 'Costco Business', 'Local farm co-op']
+ROLES = ['Director', 'Coordinator', 'Volunteer lead', 'Board member', '']
+TASK_VERBS = ['Call', 'Schedule', 'Confirm', 'Order', 'Draft', 'Review', 'Update', 'Follow up with']
+TASK_OBJECTS = ['site host', 'supplier', 'volunteer leads', 'grant report', 'delivery route', 'recipe cards', 'partner MOU']
+SUBJECTS = ['Volunteering', 'Donation question', 'Partnership', 'Meal kit pickup', 'Media request', 'Other']
+AVAILABILITY = ['', 'Weekends', 'Weekday evenings', 'Saturdays', 'Flexible', 'Once a month']
+ZIP3_WEIGHTS = {  # most sign-ups come from the metro
+    '550': 8, '551': 12, '553': 15, '554': 20, '555': 5, '556': 2, '557': 2, '558': 3, '559': 5,
+    '560': 4, '561': 1, '562': 2, '563': 4, '564': 2, '565': 2, '566': 2, '567': 1,
+}
+
+
+@contextlib.contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the generated created/recorded/submitted times (auto_now(_add) off)."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def unique_name(name, taken):
+    """`name`, numbered if already in `taken` (which it is then added to)."""
+    base, n = name, 2
+    while name in taken:
+        name, n = f'{base} {n}', n + 1
+    taken.add(name)
+    return name
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with deterministic fake data (100k volunteers, 1M donations, ...) for scale tests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every default count (default: 1)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create (default: 5000)')
+        parser.add_argument(
+            '--as-of', type=date.fromisoformat, default=None,
+            help='Date the generated history ends (YYYY-MM-DD, default: today); events run a year past it',
+        )
+        parser.add_argument('--force', action='store_true', help='Run even with DEBUG off')
+        for key, count in COUNTS.items():
+            parser.add_argument(f'--{key.replace("_", "-")}', type=int, default=None, help=f'Rows (default: {count} x scale)')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG is off: refusing to add fake data. Pass --force to run anyway.')
+        self.seed = options['seed']
+        self.batch_size = max(1, options['batch_size'])
+        self.as_of = options['as_of'] or date.today()
+        self.end = datetime.combine(self.as_of, datetime.min.time(), tzinfo=dt_timezone.utc) + timedelta(hours=18)
+        counts = {}
+        for key, count in COUNTS.items():
+            value = options[key]
+            counts[key] = max(0, value if value is not None else round(count * options['scale']))
+        counts['staff'] = max(1, counts['staff'])  # impact updates need an author
+        self.total_rows, started = 0, time.perf_counter()
+
+        if not FundraisingGoal.objects.filter(is_active=True).exists():
+            FundraisingGoal.objects.create(goal_title='Seeded fundraising goal', target_amount=GOAL_TARGET)
+        staff = self.seed_staff(counts['staff'])
+        self.insert('events', Event, self.events(counts['events']))
+        self.insert('sites', DistributionSite, self.sites(counts['sites']))
+        sites = list(DistributionSite.objects.values_list('pk', 'region'))
+        partners = self.insert('partners', PartnerOrganization, self.partners(counts['partners']), keep_pks=True)
+        self.insert('partner contacts', PartnerContact, self.contacts(partners))
+        self.insert('volunteers', VolunteerSignUp, self.volunteers(counts['volunteers'], sites))
+        self.insert('contact messages', ContactMessage, self.messages(counts['messages']))
+        self.insert('impact updates', ImpactUpdate, self.impact_updates(counts['impact_updates'], staff))
+        self.insert('donations', Donation, self.donations(counts['donations'], staff))
+        site_pks = [pk for pk, _region in sites]
+        self.insert('distributions', MealKitDistribution, self.distributions(counts['distributions'], site_pks, staff))
+        self.insert('food orders', FoodOrder, self.food_orders(counts['food_orders'], site_pks, staff))
+        self.insert('tasks', Task, self.tasks(counts['tasks'], staff))
+        self.insert('jobs', Job, self.jobs(counts['jobs']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {self.total_rows} rows in {time.perf_counter() - started:.1f}s.'
+        ))
+
+        self.stdout.write('Rebuilding totals and rollups...')
+        call_command('recompute_totals', chunk_size=50_000, stdout=self.stdout)
+        step = time.perf_counter()
+        created = save_candidates(find_duplicates())
+        self.stdout.write(f'duplicate candidates: {created} new ({time.perf_counter() - step:.1f}s)')
+        invalidate_page_cache()
+        invalidate_analytics()
+        geo.invalidate_site_index()
+        invalidate_staff_users()
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - started:.1f}s.'))
+
+    # -- helpers -------------------------------------------------------------------
+
+    def rng(self, label):
+        """A generator per model, so changing one count doesn't change the other models' rows."""
+        return random.Random(f'{self.seed}:{label}')
+
+    def moment(self, rng, days=HISTORY_DAYS):
+        """A random time within `days` before --as-of."""
+        return self.end - timedelta(seconds=rng.randrange(days * 86400))
+
+    def insert(self, label, model, rows, keep_pks=False):
+        """bulk_create `rows` (a generator) in batches and report the rate; returns the new pks if asked."""
+        started, count, pks, batch = time.perf_counter(), 0, [], []
+        with explicit_timestamps(model), transaction.atomic():
+            for row in rows:
+                batch.append(row)
+                if len(batch) == self.batch_size:
+                    count += self.flush(model, batch, pks if keep_pks else None)
+                    batch = []
+            count += self.flush(model, batch, pks if keep_pks else None)
+        elapsed = time.perf_counter() - started
+        self.total_rows += count
+        self.stdout.write(f'{label}: {count} rows in {elapsed:.1f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)')
+        return pks
+
+    def flush(self, model, batch, pks):
+        if not batch:
+            return 0
+        model.objects.bulk_create(batch, batch_size=self.batch_size)
+        if pks is not None:
+            pks += [obj.pk for obj in batch]
+        return len(batch)
+
+    # -- generators ----------------------------------------------------------------
+
+    def seed_staff(self, count):
+        """Staff user pks: the seeded staff users (created if missing) plus any existing staff."""
+        usernames = [STAFF_USERNAME.format(i) for i in range(1, count + 1)]
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        rng, password = self.rng('staff'), make_password(None)
+        new = []
+        for username in usernames:
+            if username not in existing:
+                new.append(User(
+                    username=username, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                    email=f'{username}@example.org', is_staff=True, password=password, date_joined=self.moment(rng),
+                ))
+        self.insert('staff users', User, iter(new))
+        return list(User.objects.filter(is_staff=True, is_active=True).order_by('pk').values_list('pk', flat=True))
+
+    def events(self, count):
+        rng = self.rng('events')
+        cities = sorted(geo.gazetteer()['city'])
+        for i in range(count):
+            city = rng.choice(cities).title()
+            day = self.end + timedelta(days=365) - timedelta(days=rng.randrange(HISTORY_DAYS + 365))
+            yield Event(
+                title=f'{rng.choice(["Benefit Concert", "Meal Kit Packing Day", "Community Dinner", "Fundraiser"])} #{i + 1}',
+                date=day.replace(hour=rng.choice([11, 17, 18, 19])),
+                venue_name=f'{city} {rng.choice(SITE_KINDS)}',
+                venue_address=f'{rng.randrange(100, 9999)} {rng.choice(STREETS)}',
+                city_state=f'{city}, MN',
+                description='Join us to support meal kit distribution across Minnesota.',
+                ticket_url=f'https://tickets.example.org/e/{i + 1}' if rng.random() < 0.5 else '',
+                is_published=rng.random() < 0.9,
+                updated_at=self.moment(rng),
+            )
+
+    def sites(self, count):
+        rng = self.rng('sites')
+        places = geo.gazetteer()['city']
+        cities = sorted(places)
+        minneapolis = places['minneapolis']
+        taken = set(DistributionSite.objects.values_list('name', flat=True))
+        for _ in range(count):
+            city = rng.choice(cities)
+            lat, lon = places[city]
+            near_metro = geo.distance_km(lat, lon, *minneapolis) <= TWIN_CITIES_RADIUS_KM
+            created = self.moment(rng)
+            yield DistributionSite(
+                name=unique_name(f'{city.title()} {rng.choice(SITE_KINDS)}', taken),
+                address=f'{rng.randrange(100, 9999)} {rng.choice(STREETS)}',
+                city_state=f'{city.title()}, MN',
+                region='' if rng.random() < 0.1 else ('tc' if near_metro else 'gmn'),
+                latitude=lat,
+                longitude=lon,
+                capacity_meals=rng.choice([0, 100, 200, 500, 1000]),
+                capacity_volunteers=rng.choice([0, 10, 20, 40, 80, 200]),
+                contact_phone=f'{rng.choice(["612", "651", "218", "507", "320"])}-555-{rng.randrange(10000):04d}',
+                contact_email=f'site{rng.randrange(10 ** 6)}@example.org',
+                is_active=rng.random() < 0.9,
+                created_at=created,
+                updated_at=created,
+            )
+
+    def partners(self, count):
+        rng = self.rng('partners')
+        taken = set(PartnerOrganization.objects.values_list('name', flat=True))
+        kinds = [key for key, _label in PartnerOrganization.ORG_TYPE_CHOICES]
+        for _ in range(count):
+            created = self.moment(rng)
+            yield PartnerOrganization(
+                name=unique_name(f'{rng.choice(PARTNER_WORDS)} {rng.choice(PARTNER_KINDS)}', taken),
+                org_type=rng.choice(kinds),
+                address=f'{rng.randrange(100, 9999)} {rng.choice(STREETS)}',
+                phone=f'612-555-{rng.randrange(10000):04d}',
+                email=f'info{rng.randrange(10 ** 6)}@example.org',
+                website=f'https://partner{rng.randrange(10 ** 6)}.example.org',
+                is_active=rng.random() < 0.9,
+                created_at=created,
+                updated_at=created,
+            )
+
+    def contacts(self, partner_pks):
+        rng = self.rng('partner contacts')
+        for partner_pk in partner_pks:
+            for i in range(rng.randint(1, 3)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield PartnerContact(
+                    partner_id=partner_pk,
+                    name=f'{first} {last}',
+                    role=rng.choice(ROLES),
+                    email=f'{first}.{last}@example.org'.lower(),
+                    phone=f'651-555-{rng.randrange(10000):04d}',
+                    is_primary=i == 0,
+                    created_at=self.moment(rng),
+                )
+
+    def volunteers(self, count, sites):
+        """Sign-ups; DUPLICATE_RATE of them repeat a recent sign-up with a different e-mail case, phone format or name."""
+        rng = self.rng('volunteers')
+        by_region = {region: [pk for pk, r in sites if r in (region, '')] for region in ('tc', 'gmn')}
+        zip3s, zip3_weights = list(ZIP3_WEIGHTS), list(itertools.accumulate(ZIP3_WEIGHTS.values()))
+        minneapolis = geo.gazetteer()['city']['minneapolis']
+        points, recent = {}, []
+        for _ in range(count):
+            if recent and rng.random() < DUPLICATE_RATE:
+                first, last, email, phone, zip_code = rng.choice(recent)
+                variation = rng.randrange(3)
+                if variation == 0:
+                    email = email.upper() if rng.random() < 0.5 else email.replace('@', '+food@')
+                elif variation == 1:
+                    digits = ''.join(c for c in phone if c.isdigit()) or '6125550100'
+                    phone = f'({digits[:3]}) {digits[3:6]}-{digits[6:]}'
+                else:
+                    first = NICKNAMES.get(first, first.lower())
+            else:
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                email = f'{first}.{last}{rng.randrange(10000)}@{rng.choice(EMAIL_DOMAINS)}'.lower()
+                phone = f'{rng.choice(["612", "651", "763", "952", "218", "507"])}-555-{rng.randrange(10000):04d}' if rng.random() < 0.7 else ''
+                zip_code = f'{rng.choices(zip3s, cum_weights=zip3_weights)[0]}{rng.randrange(100):02d}'
+                recent.append((first, last, email, phone, zip_code))
+                if len(recent) > 1000:
+                    del recent[:500]
+            if zip_code not in points:
+                points[zip_code] = geo.geocode(zip_code) or (None, None)
+            lat, lon = points[zip_code]
+            region = 'tc' if lat is not None and geo.distance_km(lat, lon, *minneapolis) <= TWIN_CITIES_RADIUS_KM else 'gmn'
+            status = rng.choices(['pending', 'assigned', 'inactive'], [50, 40, 10])[0]
+            site = rng.choice(by_region[region]) if status != 'pending' and by_region[region] else None
+            volunteer = VolunteerSignUp(
+                first_name=first,
+                last_name=last,
+                email=email,
+                phone=phone,
+                region=region,
+                zip_code=zip_code,
+                latitude=lat,
+                longitude=lon,
+                availability=rng.choice(AVAILABILITY),
+                notes='Can drive' if rng.random() < 0.1 else '',
+                submitted_at=self.moment(rng, 2 * 365),
+                site_id=site,
+                status='pending' if status == 'assigned' and site is None else status,
+            )
+            set_blocking_keys(volunteer)
+            yield volunteer
+
+    def messages(self, count):
+        rng = self.rng('messages')
+        for _ in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield ContactMessage(
+                name=f'{first} {last}',
+                email=f'{first}.{last}@{rng.choice(EMAIL_DOMAINS)}'.lower(),
+                subject=rng.choice(SUBJECTS),
+                message='Hi, I would like to know more about how I can help.',
+                submitted_at=self.moment(rng),
+            )
+
+    def impact_updates(self, count, staff):
+        rng = self.rng('impact updates')
+        for i in range(count):
+            share = (i + 1) / count
+            yield ImpactUpdate(
+                amount_raised=Decimal(round(share * 2_000_000 * rng.uniform(0.9, 1.1))),
+                meals_funded=round(share * 400_000),
+                volunteers=round(share * 20_000),
+                note='Monthly update' if rng.random() < 0.3 else '',
+                updated_at=self.end - timedelta(days=HISTORY_DAYS * (1 - share)),
+                updated_by_id=rng.choice(staff),
+            )
+
+    def donations(self, count, staff):
+        rng = self.rng('donations')
+        sources = [key for key, _label in Donation.SOURCE_CHOICES]
+        weights = list(itertools.accumulate(DONATION_WEIGHTS))
+        # Expected dollars per donation, plus one for the odd cents
+        mean = sum(a * w for a, w in zip(DONATION_AMOUNTS, DONATION_WEIGHTS)) / sum(DONATION_WEIGHTS) + 1
+        factor = min(1, MAX_SEEDED_TOTAL / (count * mean)) if count else 1
+        for _ in range(count):
+            recorded = self.moment(rng)
+            cents = rng.choices(DONATION_AMOUNTS, cum_weights=weights)[0] * 100 + (rng.randrange(100) if rng.random() < 0.2 else 0)
+            yield Donation(
+                amount=Decimal(max(1, int(cents * factor))) / 100,
+                received_at=(recorded - timedelta(days=rng.randrange(7))).date(),
+                donor_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}' if rng.random() < 0.8 else '',
+                source=rng.choice(sources),
+                recorded_at=recorded,
+                recorded_by_id=rng.choice(staff) if rng.random() < 0.9 else None,
+            )
+
+    def distributions(self, count, site_pks, staff):
+        if not site_pks:
+            return
+        rng = self.rng('distributions')
+        formats = [key for key, _label in MealKitDistribution.FORMAT_CHOICES]
+        for _ in range(count):
+            recorded = self.moment(rng)
+            yield MealKitDistribution(
+                distribution_date=(recorded - timedelta(days=rng.randrange(3))).date(),
+                site_id=rng.choice(site_pks),
+                meal_kits_count=rng.randint(20, 300),
+                format=rng.choice(formats),
+                recorded_at=recorded,
+                recorded_by_id=rng.choice(staff) if rng.random() < 0.9 else None,
+            )
+
+    def food_orders(self, count, site_pks, staff):
+        rng = self.rng('food orders')
+        statuses = [key for key, _label in FoodOrder.STATUS_CHOICES]
+        for _ in range(count):
+            created = self.moment(rng)
+            yield FoodOrder(
+                order_date=created.date(),
+                supplier=rng.choice(SUPPLIERS),
+                description=f'{rng.randint(5, 200)} cases of meal kit ingredients',
+                total_cost=Decimal(rng.randrange(5000, 2_000_000)) / 100 if rng.random() < 0.9 else None,
+                status=rng.choice(statuses),
+                site_id=rng.choice(site_pks) if site_pks and rng.random() < 0.8 else None,
+                created_at=created,
+                ordered_by_id=rng.choice(staff) if rng.random() < 0.9 else None,
+            )
+
+    def tasks(self, count, staff):
+        """Tasks spread over the kanban columns, evenly ranked within each column."""
+        rng = self.rng('tasks')
+        statuses = [key for key, _label in Task.STATUS_CHOICES]
+        columns = {status: 0 for status in statuses}
+        for _ in range(count):
+            columns[rng.choice(statuses)] += 1
+        for status, size in columns.items():
+            for rank in spaced_ranks(size):
+                created = self.moment(rng, 365)
+                yield Task(
+                    title=f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}',
+                    status=status,
+                    assigned_to_id=rng.choice(staff) if rng.random() < 0.7 else None,
+                    due_date=(created + timedelta(days=rng.randrange(60))).date() if rng.random() < 0.5 else None,
+                    rank=rank,
+                    created_at=created,
+                    updated_at=created,
+                    created_by_id=rng.choice(staff),
+                )
+
+    def jobs(self, count):
+        """Finished job history only: queued rows would be run by the worker."""
+        rng = self.rng('jobs')
+        names = sorted(JOBS)
+        for _ in range(count):
+            created = self.moment(rng, 90)
+            failed = rng.random() < 0.05
+            yield Job(
+                name=rng.choice(names),
+                status='failed' if failed else 'done',
+                attempts=5 if failed else 1,
+                run_after=created,
+                last_error='RuntimeError: seeded failure' if failed else '',
+                created_at=created,
+                finished_at=created + timedelta(seconds=rng.randrange(1, 120)),
+            )
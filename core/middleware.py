@@ -1,9 +1,53 @@
 """
 Middleware: show "Coming Soon" landing page unless user is logged in as staff.
 Staff can see the full site and access /admin/ to log in.
+Visitors without a session cookie can't be staff, so they get the page without any
+session or user lookup. The page is rendered once per process and served as plain or
+gzipped bytes with an ETag (304 on revalidation) and a short public Cache-Control.
 """
 
-from django.shortcuts import render
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+
+COMING_SOON_TEMPLATE = 'core/coming_soon.html'
+
+_rendered = None
+
+
+def coming_soon_page():
+    """(body, gzipped body, etag) for the Coming Soon page; re-rendered every time when DEBUG."""
+    global _rendered
+    if _rendered is None or settings.DEBUG:
+        body = render_to_string(COMING_SOON_TEMPLATE).encode()
+        etag = hashlib.md5(body, usedforsecurity=False).hexdigest()[:16]
+        _rendered = (body, gzip.compress(body, mtime=0), etag)
+    return _rendered
+
+
+def _accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def coming_soon_response(request):
+    body, compressed, etag = coming_soon_page()
+    use_gzip = _accepts_gzip(request)
+    etag = f'"{etag}-gz"' if use_gzip else f'"{etag}"'
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(compressed if use_gzip else body, content_type='text/html; charset=utf-8')
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    # Vary on Cookie so a browser that has since logged in as staff doesn't reuse it
+    response['Cache-Control'] = f'public, max-age={getattr(settings, "COMING_SOON_MAX_AGE", 60)}'
+    patch_vary_headers(response, ('Accept-Encoding', 'Cookie'))
+    return response
 
 
 class ComingSoonMiddleware:
@@ -19,8 +63,12 @@ class ComingSoonMiddleware:
         if path.startswith('/admin/') or path.startswith('/static/') or path.startswith('/media/'):
             return self.get_response(request)
 
+        # No session cookie: anonymous, skip loading the session and user
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return coming_soon_response(request)
+
         # Allow staff to see full site
         if request.user.is_authenticated and request.user.is_staff:
             return self.get_response(request)
 
-        return render(request, 'core/coming_soon.html')
+        return coming_soon_response(request)
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def spaced_ranks(count):
+    """Copy of core.ranks.spaced_ranks as of this migration, so later edits there don't change it."""
+    base = len(DIGITS)
+    width = 1
+    while base ** width <= count * 2:
+        width += 1
+    step = base ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def ranks_from_order(apps, schema_editor):
+    """Give each column evenly spaced ranks in its existing order (-order, created_at)."""
+    Task = apps.get_model('core', 'Task')
+    statuses = Task.objects.values_list('status', flat=True).distinct()
+    for status in list(statuses):
+        column = list(Task.objects.filter(status=status).order_by('-order', 'created_at'))
+        for task, rank in zip(column, spaced_ranks(len(column))):
+            task.rank = rank
+        Task.objects.bulk_update(column, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_task_assigned_to_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', help_text='Position within column (compared as text; lower = higher on board). See core/ranks.py.', max_length=64),
+        ),
+        migrations.RunPython(ranks_from_order, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='task',
+            name='order',
+        ),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['rank', 'created_at'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'rank'], name='core_task_status_rank_idx'),
+        ),
+    ]
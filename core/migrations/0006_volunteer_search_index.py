@@ -0,0 +1,105 @@
+"""
+Full-text search indexes for VolunteerSignUp (see core/search.py).
+PostgreSQL: weighted tsvector GIN index + pg_trgm GIN index. Creating the pg_trgm extension
+needs a superuser; when the database role can't, the trigram index is skipped with a warning
+and search matches whole words and prefixes only.
+SQLite: FTS5 external-content table with insert/update/delete triggers.
+Other backends: nothing; search falls back to icontains.
+The expressions are copies of those in core/search.py when this migration was written, so
+later edits there don't change what it does.
+"""
+
+import warnings
+
+from django.db import migrations, transaction, DatabaseError
+
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, first_name || ' ' || last_name), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, email), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, availability || ' ' || notes), 'C')"
+)
+PG_TRIGRAM_DOCUMENT = "lower(first_name || ' ' || last_name || ' ' || email)"
+SQLITE_FTS_TABLE = 'core_volunteersignup_fts'
+SQLITE_FTS_COLUMNS = ('first_name', 'last_name', 'email', 'availability', 'notes')
+
+FTS_COLS = ', '.join(SQLITE_FTS_COLUMNS)
+NEW_COLS = ', '.join(f'new.{c}' for c in SQLITE_FTS_COLUMNS)
+OLD_COLS = ', '.join(f'old.{c}' for c in SQLITE_FTS_COLUMNS)
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5({FTS_COLS}, "
+    f"content='core_volunteersignup', content_rowid='id', prefix='2 3')",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {FTS_COLS}) VALUES (new.id, {NEW_COLS}); END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ad AFTER DELETE ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {FTS_COLS}) VALUES ('delete', old.id, {OLD_COLS}); END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {FTS_COLS}) VALUES ('delete', old.id, {OLD_COLS}); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {FTS_COLS}) VALUES (new.id, {NEW_COLS}); END",
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+PG_TSV_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS core_volunteer_search_tsv ON core_volunteersignup USING gin (({PG_SEARCH_VECTOR}))"
+)
+PG_TRIGRAM_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS core_volunteer_search_trgm ON core_volunteersignup "
+    f"USING gin (({PG_TRIGRAM_DOCUMENT}) gin_trgm_ops)"
+)
+PG_REVERSE = [
+    "DROP INDEX IF EXISTS core_volunteer_search_trgm",
+    "DROP INDEX IF EXISTS core_volunteer_search_tsv",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(PG_TSV_INDEX)
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            installed = cursor.fetchone() is not None
+        if not installed:
+            try:
+                # Savepoint: a refused CREATE EXTENSION must not abort the migration's transaction
+                with transaction.atomic(using=schema_editor.connection.alias):
+                    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            except DatabaseError as e:
+                warnings.warn(
+                    f'pg_trgm not installed ({e}); volunteer search will not match partial words. '
+                    f'Have a superuser run CREATE EXTENSION pg_trgm, then: {PG_TRIGRAM_INDEX}',
+                    RuntimeWarning,
+                )
+                return
+        schema_editor.execute(PG_TRIGRAM_INDEX)
+    elif vendor == 'sqlite':
+        try:
+            schema_editor.execute(SQLITE_FORWARD[0])
+        except DatabaseError:
+            return  # SQLite built without FTS5: search uses the icontains fallback
+        for sql in SQLITE_FORWARD[1:]:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': PG_REVERSE, 'sqlite': SQLITE_REVERSE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_task_rank'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
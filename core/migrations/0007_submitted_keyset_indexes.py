@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_volunteer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['submitted_at', 'id'], name='core_contact_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteersignup',
+            index=models.Index(fields=['submitted_at', 'id'], name='core_volunteer_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:46
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_names(apps, schema_editor):
+    """
+    Stop before adding the unique constraints while names repeat. Whether two rows are the
+    same site or partner (merge them) or different ones (rename one) is for staff to decide,
+    so the migration lists them instead of changing any data (see DEPLOY.md).
+    """
+    repeated = []
+    for model_name in ('DistributionSite', 'PartnerOrganization'):
+        model = apps.get_model('core', model_name)
+        for row in model.objects.values('name').annotate(n=Count('pk')).filter(n__gt=1).order_by('name'):
+            repeated.append(f"{model._meta.verbose_name} {row['name']!r} ({row['n']} rows)")
+    if repeated:
+        raise RuntimeError(
+            'Names must be unique before migration 0008; rename or merge these, then migrate again: '
+            + '; '.join(repeated)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_submitted_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='distributionsite',
+            constraint=models.UniqueConstraint(fields=('name',), name='core_distributionsite_name_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='partnerorganization',
+            constraint=models.UniqueConstraint(fields=('name',), name='core_partnerorganization_name_uniq'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:05
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    """Fill the rollups from existing rows (same grouping as core.rollups.rebuild_rollups)."""
+    Donation = apps.get_model('core', 'Donation')
+    MealKitDistribution = apps.get_model('core', 'MealKitDistribution')
+    VolunteerSignUp = apps.get_model('core', 'VolunteerSignUp')
+    ImpactRollup = apps.get_model('core', 'ImpactRollup')
+    buckets = {'day': defaultdict(lambda: [Decimal('0'), 0, 0]), 'week': defaultdict(lambda: [Decimal('0'), 0, 0])}
+    sources = [
+        (0, Donation.objects.values_list('received_at').annotate(v=Sum('amount'))),
+        (1, MealKitDistribution.objects.values_list('distribution_date').annotate(v=Sum('meal_kits_count'))),
+        (2, VolunteerSignUp.objects.exclude(status='inactive').annotate(day=TruncDate('submitted_at'))
+            .values_list('day').annotate(v=Count('pk'))),
+    ]
+    for index, rows in sources:
+        for day, value in rows.order_by():
+            buckets['day'][day][index] += value or 0
+            buckets['week'][day - timedelta(days=day.weekday())][index] += value or 0
+    ImpactRollup.objects.bulk_create([
+        ImpactRollup(period=period, start=start, amount_raised=a, meals_funded=m, volunteers=v)
+        for period, rows in buckets.items()
+        for start, (a, m, v) in rows.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_event_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImpactRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('start', models.DateField()),
+                ('amount_raised', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('meals_funded', models.IntegerField(default=0)),
+                ('volunteers', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Impact Rollup',
+                'verbose_name_plural': 'Impact Rollups',
+                'ordering': ['period', 'start'],
+                'constraints': [models.UniqueConstraint(fields=('period', 'start'), name='core_impactrollup_period_start_uniq')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_impact_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionsite',
+            name='region',
+            field=models.CharField(blank=True, choices=[('tc', 'Twin Cities'), ('gmn', 'Greater MN')], help_text='Volunteers from this region are assigned here (blank = any region)', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='distributionsite',
+            name='capacity_volunteers',
+            field=models.PositiveIntegerField(blank=True, default=0, help_text='Max volunteers at site (0 = not set; no volunteers are assigned automatically)'),
+        ),
+    ]
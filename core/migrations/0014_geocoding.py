@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:19
+
+import csv
+import re
+from pathlib import Path
+
+from django.db import migrations, models
+
+# Copy of core.geo.geocode() as of this migration, so later edits there don't change what it
+# does; it only relies on the gazetteer's columns (kind, key, lat, lon)
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / 'data' / 'mn_gazetteer.csv'
+_ZIP = re.compile(r'\b(5[5-6]\d{3})(?:-\d{4})?\b')
+_STATE_SUFFIX = re.compile(r'\s+(mn|minn|minnesota)$')
+
+
+def normalize_place(text):
+    text = re.sub(r'[^a-z0-9 ]+', ' ', text.lower())
+    text = ' '.join(text.split())
+    text = _STATE_SUFFIX.sub('', text)
+    return re.sub(r'^(st|ste)\b', 'saint', text)
+
+
+def geocode(places, *parts):
+    text = ' '.join(str(p) for p in parts if p)
+    if not text.strip():
+        return None
+    zip_match = _ZIP.search(text)
+    if zip_match and zip_match.group(1) in places['zip']:
+        return places['zip'][zip_match.group(1)]
+    for piece in reversed(re.split(r'[,\n]', text)):
+        name = normalize_place(_ZIP.sub('', piece))
+        if name in places['city']:
+            return places['city'][name]
+    if zip_match:
+        return places['zip3'].get(zip_match.group(1)[:3])
+    return None
+
+
+def geocode_sites(apps, schema_editor):
+    places = {'zip': {}, 'zip3': {}, 'city': {}}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            places.setdefault(row['kind'], {})[row['key']] = (float(row['lat']), float(row['lon']))
+    DistributionSite = apps.get_model('core', 'DistributionSite')
+    for site in DistributionSite.objects.all():
+        point = geocode(places, site.address, site.city_state)
+        if point:
+            site.latitude, site.longitude = point
+            site.save(update_fields=['latitude', 'longitude'])
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding zip_code rebuilt core_volunteersignup on SQLite, dropping its FTS triggers
+    from core.search import restore_sqlite_fts
+
+    restore_sqlite_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_distributionsite_region'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionsite',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='distributionsite',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='zip_code',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.RunPython(geocode_sites, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_blocking_keys(apps, schema_editor):
+    # The key functions only read the values passed in, not the models
+    from core.dedup import BLOCKING_KEYS
+
+    VolunteerSignUp = apps.get_model('core', 'VolunteerSignUp')
+    batch = []
+    for volunteer in VolunteerSignUp.objects.only('first_name', 'last_name', 'email', 'phone').iterator(chunk_size=1000):
+        for key, (func, sources) in BLOCKING_KEYS.items():
+            setattr(volunteer, key, func(*(getattr(volunteer, name) for name in sources)))
+        batch.append(volunteer)
+        if len(batch) == 1000:
+            VolunteerSignUp.objects.bulk_update(batch, list(BLOCKING_KEYS))
+            batch = []
+    VolunteerSignUp.objects.bulk_update(batch, list(BLOCKING_KEYS))
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding the NOT NULL key columns rebuilt core_volunteersignup on SQLite, dropping its FTS triggers
+    from core.search import restore_sqlite_fts
+
+    restore_sqlite_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_geocoding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('reasons', models.CharField(help_text='Matching keys, e.g. "email, name"', max_length=100)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('dismissed', 'Not a duplicate')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Duplicate Candidate',
+                'verbose_name_plural': 'Duplicate Candidates',
+                'ordering': ['-score', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='email_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='volunteersignup',
+            name='phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='volunteersignup',
+            index=models.Index(fields=['email_normalized'], name='core_volunteer_email_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteersignup',
+            index=models.Index(fields=['name_key'], name='core_volunteer_name_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteersignup',
+            index=models.Index(fields=['phone_normalized'], name='core_volunteer_phone_key_idx'),
+        ),
+        migrations.AddField(
+            model_name='duplicatecandidate',
+            name='first',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.volunteersignup'),
+        ),
+        migrations.AddField(
+            model_name='duplicatecandidate',
+            name='second',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.volunteersignup'),
+        ),
+        migrations.AddIndex(
+            model_name='duplicatecandidate',
+            index=models.Index(fields=['status', '-score'], name='core_duplicate_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='duplicatecandidate',
+            constraint=models.UniqueConstraint(fields=('first', 'second'), name='core_duplicate_pair_unique'),
+        ),
+        migrations.RunPython(set_blocking_keys, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
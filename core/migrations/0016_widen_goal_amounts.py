@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:49
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_volunteer_dedup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fundraisinggoal',
+            name='current_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='fundraisinggoal',
+            name='target_amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12),
+        ),
+    ]
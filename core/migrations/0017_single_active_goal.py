@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:13
+
+from django.db import migrations, models
+
+
+def check_active_goals(apps, schema_editor):
+    """
+    Stop while more than one goal is active: which campaign keeps counting donations is for
+    staff to decide, so the migration lists them instead of deactivating any (see DEPLOY.md).
+    """
+    FundraisingGoal = apps.get_model('core', 'FundraisingGoal')
+    active = list(FundraisingGoal.objects.filter(is_active=True).order_by('pk').values_list('pk', 'goal_title'))
+    if len(active) > 1:
+        raise RuntimeError(
+            'Only one fundraising goal may be active before migration 0017; deactivate all but one, '
+            'then migrate again: ' + '; '.join(f'#{pk} {title!r}' for pk, title in active)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_widen_goal_amounts'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_active_goals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='fundraisinggoal',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='core_fundraisinggoal_single_active', violation_error_message='Another fundraising goal is already active; deactivate it first.'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:17
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Q
+
+LIMIT = Decimal('99999999.99')
+
+
+def check_goal_amounts(apps, schema_editor):
+    """Stop, listing them, if any goal holds more than max_digits=10 allows (e.g. seeded data)."""
+    FundraisingGoal = apps.get_model('core', 'FundraisingGoal')
+    too_large = FundraisingGoal.objects.filter(Q(target_amount__gt=LIMIT) | Q(current_amount__gt=LIMIT))
+    if too_large.exists():
+        raise RuntimeError(
+            'Goal amounts must fit in 99,999,999.99 before migration 0018; fix or delete these goals '
+            '(then run recompute_totals), and migrate again: '
+            + '; '.join(f'#{pk} {title!r}' for pk, title in too_large.values_list('pk', 'goal_title'))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_single_active_goal'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_goal_amounts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='fundraisinggoal',
+            name='current_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='fundraisinggoal',
+            name='target_amount',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+    ]
@@ -6,6 +6,29 @@ contact messages, and impact updates.
 from decimal import Decimal
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+class LoadedValuesMixin:
+    """
+    Keeps the field values a row was loaded with (or last saved with) in _loaded_values,
+    keyed by attname, so pre/post_save receivers can see what changed (see core/signals.py).
+    Set in from_db rather than a post_init receiver: list pages and exports load many rows
+    and only the few that are saved ever look at it. Deferred fields are simply absent.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
 
 
 class FundraisingGoal(models.Model):
@@ -21,6 +44,13 @@ class FundraisingGoal(models.Model):
     class Meta:
         verbose_name = 'Fundraising Goal'
         verbose_name_plural = 'Fundraising Goals'
+        constraints = [
+            # Totals (core/totals.py) and the public pages all use the one active goal
+            models.UniqueConstraint(
+                fields=['is_active'], condition=models.Q(is_active=True), name='core_fundraisinggoal_single_active',
+                violation_error_message='Another fundraising goal is already active; deactivate it first.',
+            ),
+        ]
 
     def __str__(self):
         return self.goal_title
@@ -36,7 +66,10 @@ class Event(models.Model):
     description = models.TextField()
     ticket_url = models.URLField(blank=True)  # EXTERNAL link only
     image = models.ImageField(upload_to='events/', blank=True)
+    # Resized WebP/JPEG copies and blur placeholder of `image` (core/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_published = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)  # ETag/Last-Modified of the event pages
 
     class Meta:
         ordering = ['-date']
@@ -47,11 +80,24 @@ class Event(models.Model):
         return self.title
 
 
-class DistributionSite(models.Model):
+class DistributionSite(LoadedValuesMixin, models.Model):
     """Distribution site where meal kits are delivered; has capacity for meals and volunteers."""
+    REGION_CHOICES = [
+        ('tc', 'Twin Cities'),
+        ('gmn', 'Greater MN'),
+    ]
     name = models.CharField(max_length=200)
     address = models.TextField()
     city_state = models.CharField(max_length=100)
+    region = models.CharField(
+        max_length=10,
+        choices=REGION_CHOICES,
+        blank=True,
+        help_text='Volunteers from this region are assigned here (blank = any region)',
+    )
+    # Geocoded from address/city_state when saved (core/geo.py); can be corrected by hand
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     capacity_meals = models.PositiveIntegerField(
         default=0,
         help_text='Max meal kits per distribution (0 = not set)',
@@ -59,7 +105,7 @@ class DistributionSite(models.Model):
     capacity_volunteers = models.PositiveIntegerField(
         default=0,
         blank=True,
-        help_text='Max volunteers at site (0 = not set)',
+        help_text='Max volunteers at site (0 = not set; no volunteers are assigned automatically)',
     )
     contact_phone = models.CharField(max_length=30, blank=True)
     contact_email = models.EmailField(blank=True)
@@ -70,6 +116,10 @@ class DistributionSite(models.Model):
 
     class Meta:
         ordering = ['name']
+        constraints = [
+            # Natural key for imports (core/imports.py upserts on name)
+            models.UniqueConstraint(fields=['name'], name='core_distributionsite_name_uniq'),
+        ]
         verbose_name = 'Distribution Site'
         verbose_name_plural = 'Distribution Sites'
 
@@ -77,12 +127,9 @@ class DistributionSite(models.Model):
         return self.name
 
 
-class VolunteerSignUp(models.Model):
+class VolunteerSignUp(LoadedValuesMixin, models.Model):
     """Public volunteer sign-up form submission; can be assigned to a distribution site."""
-    REGION_CHOICES = [
-        ('tc', 'Twin Cities'),
-        ('gmn', 'Greater MN'),
-    ]
+    REGION_CHOICES = DistributionSite.REGION_CHOICES
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('assigned', 'Assigned'),
@@ -93,9 +140,17 @@ class VolunteerSignUp(models.Model):
     email = models.EmailField()
     phone = models.CharField(max_length=20, blank=True)
     region = models.CharField(max_length=10, choices=REGION_CHOICES)
+    zip_code = models.CharField(max_length=10, blank=True)
+    # Geocoded from zip_code when saved (core/geo.py)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     availability = models.TextField(blank=True)
     notes = models.TextField(blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # Duplicate detection blocking keys, set when saved (core/dedup.py)
+    email_normalized = models.CharField(max_length=254, blank=True, editable=False)
+    name_key = models.CharField(max_length=10, blank=True, editable=False)
+    phone_normalized = models.CharField(max_length=20, blank=True, editable=False)
     # Backend: assign volunteer to a site and track status
     site = models.ForeignKey(
         DistributionSite,
@@ -112,6 +167,13 @@ class VolunteerSignUp(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            # Keyset pagination on the dashboard list (core/pagination.py)
+            models.Index(fields=['submitted_at', 'id'], name='core_volunteer_submitted_idx'),
+            models.Index(fields=['email_normalized'], name='core_volunteer_email_key_idx'),
+            models.Index(fields=['name_key'], name='core_volunteer_name_key_idx'),
+            models.Index(fields=['phone_normalized'], name='core_volunteer_phone_key_idx'),
+        ]
         verbose_name = 'Volunteer Sign-Up'
         verbose_name_plural = 'Volunteer Sign-Ups'
 
@@ -119,6 +181,39 @@ class VolunteerSignUp(models.Model):
         return f'{self.first_name} {self.last_name}'
 
 
+class DuplicateCandidate(models.Model):
+    """
+    Two volunteer sign-ups that look like the same person (core/dedup.py), for review on the
+    dashboard. Merging deletes one of the sign-ups and with it the pair, moving its other
+    pairs to the kept sign-up; dismissed pairs are kept so they aren't suggested again.
+    """
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('dismissed', 'Not a duplicate'),
+    ]
+    # first has the lower pk, so each pair is stored once
+    first = models.ForeignKey(VolunteerSignUp, on_delete=models.CASCADE, related_name='+')
+    second = models.ForeignKey(VolunteerSignUp, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    reasons = models.CharField(max_length=100, help_text='Matching keys, e.g. "email, name"')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-score', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['first', 'second'], name='core_duplicate_pair_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score'], name='core_duplicate_status_idx'),
+        ]
+        verbose_name = 'Duplicate Candidate'
+        verbose_name_plural = 'Duplicate Candidates'
+
+    def __str__(self):
+        return f'{self.first} / {self.second} ({self.score:.2f})'
+
+
 class ContactMessage(models.Model):
     """Public contact form submission."""
     name = models.CharField(max_length=100)
@@ -129,6 +224,9 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['submitted_at', 'id'], name='core_contact_submitted_idx'),
+        ]
         verbose_name = 'Contact Message'
         verbose_name_plural = 'Contact Messages'
 
@@ -158,7 +256,7 @@ class ImpactUpdate(models.Model):
         return f'${self.amount_raised} @ {self.updated_at}'
 
 
-class Donation(models.Model):
+class Donation(LoadedValuesMixin, models.Model):
     """Record of a donation received (no payment processing on site)."""
     SOURCE_CHOICES = [
         ('check', 'Check'),
@@ -233,7 +331,7 @@ class FoodOrder(models.Model):
         return f'{self.supplier} ({self.order_date})'
 
 
-class MealKitDistribution(models.Model):
+class MealKitDistribution(LoadedValuesMixin, models.Model):
     """Record of meal kit distribution: raw or partially prepared with recipe cards."""
     FORMAT_CHOICES = [
         ('raw', 'Raw ingredients'),
@@ -292,6 +390,9 @@ class PartnerOrganization(models.Model):
 
     class Meta:
         ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['name'], name='core_partnerorganization_name_uniq'),
+        ]
         verbose_name = 'Partner Organization'
         verbose_name_plural = 'Partner Organizations'
 
@@ -323,7 +424,7 @@ class PartnerContact(models.Model):
         return f'{self.name} — {self.partner.name}'
 
 
-class Task(models.Model):
+class Task(LoadedValuesMixin, models.Model):
     """Task for team; used on kanban board (Backlog, To Do, In Progress, Done). Assigned to staff users."""
     STATUS_CHOICES = [
         ('backlog', 'Backlog'),
@@ -342,7 +443,12 @@ class Task(models.Model):
         related_name='assigned_tasks',
     )
     due_date = models.DateField(null=True, blank=True)
-    order = models.PositiveIntegerField(default=0, help_text='Order within column (higher = lower on board)')
+    rank = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text='Position within column (compared as text; lower = higher on board). See core/ranks.py.',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(
@@ -354,9 +460,73 @@ class Task(models.Model):
     )
 
     class Meta:
-        ordering = ['-order', 'created_at']
+        ordering = ['rank', 'created_at']
+        indexes = [
+            models.Index(fields=['status', 'rank'], name='core_task_status_rank_idx'),
+        ]
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
 
     def __str__(self):
         return self.title
+
+
+class Job(models.Model):
+    """Background job run by `manage.py run_worker` (see core/jobs.py)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    name = models.CharField(max_length=100, help_text='Registered job name (core.jobs)')
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Claim query: next queued jobs that are due
+            models.Index(fields=['status', 'run_after'], name='core_job_status_run_after_idx'),
+        ]
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+
+class ImpactRollup(models.Model):
+    """
+    Amount raised, meal kits and volunteer sign-ups per day or week (week = starting Monday).
+    Maintained by signals as Donation / MealKitDistribution / VolunteerSignUp rows change
+    (see core/rollups.py); rebuilt by `manage.py recompute_totals`.
+    """
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+    ]
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    start = models.DateField()
+    amount_raised = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    meals_funded = models.IntegerField(default=0)
+    volunteers = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['period', 'start']
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'start'], name='core_impactrollup_period_start_uniq'),
+        ]
+        verbose_name = 'Impact Rollup'
+        verbose_name_plural = 'Impact Rollups'
+
+    def __str__(self):
+        return f'{self.period} {self.start}'
@@ -0,0 +1,60 @@
+"""
+E-mail notifications to staff about new volunteer sign-ups and contact messages.
+Sent by the job queue (core/jobs.py) so the public form responds without waiting on SMTP.
+Enabled with STAFF_NOTIFICATIONS=True; the mail server comes from EMAIL_URL and links use SITE_URL.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.urls import reverse
+
+from .jobs import enqueue, job
+from .models import VolunteerSignUp, ContactMessage
+
+User = get_user_model()
+
+
+def staff_emails():
+    return list(
+        User.objects.filter(is_staff=True, is_active=True).exclude(email='').values_list('email', flat=True)
+    )
+
+
+def queue_staff_notification(kind, obj):
+    """Queue a notification about `obj` ('volunteer' or 'contact') if notifications are on."""
+    if settings.STAFF_NOTIFICATIONS:
+        enqueue('notify_staff', kind=kind, object_id=obj.pk)
+
+
+def _volunteer_message(volunteer):
+    subject = f'New volunteer: {volunteer.first_name} {volunteer.last_name}'
+    body = (
+        f'{volunteer.first_name} {volunteer.last_name} <{volunteer.email}> signed up to volunteer '
+        f'({volunteer.get_region_display()}).\n\n'
+        f'Availability: {volunteer.availability or "-"}\n'
+        f'Notes: {volunteer.notes or "-"}\n\n'
+        f'Dashboard: {settings.SITE_URL}{reverse("core:volunteer_list")}'
+    )
+    return subject, body
+
+
+def _contact_message(contact):
+    subject = f'Contact form: {contact.subject}'
+    body = f'From {contact.name} <{contact.email}>:\n\n{contact.message}\n\nDashboard: {settings.SITE_URL}{reverse("core:contact_list")}'
+    return subject, body
+
+
+@job('notify_staff')
+def notify_staff(kind, object_id):
+    if kind == 'volunteer':
+        obj = VolunteerSignUp.objects.filter(pk=object_id).first()
+        build = _volunteer_message
+    else:
+        obj = ContactMessage.objects.filter(pk=object_id).first()
+        build = _contact_message
+    recipients = staff_emails()
+    if obj is None or not recipients:
+        return
+    subject, body = build(obj)
+    send_mail(subject, body, None, recipients)
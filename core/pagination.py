@@ -0,0 +1,197 @@
+"""
+Keyset (cursor) pagination for dashboard lists ordered by (submitted_at, id), newest first.
+Each page is one indexed range query, so page 500 costs the same as page 1 and there is
+no COUNT(*). Cursors are opaque URL-safe tokens; a bad, stale or crafted token shows page one.
+Ranked search results (core.search.RankedResults) are paged by offset into their
+in-memory id list instead.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+# Capped count used when no cheap estimate exists; shown as "10,000+".
+APPROXIMATE_COUNT_CAP = 10000
+
+
+def encode_cursor(payload):
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (ValueError, binascii.Error):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def cursor_key(cursor):
+    """(value, pk) from a keyset cursor's 'k' ([isoformat, int]), or None if it isn't one."""
+    key = cursor.get('k') if cursor else None
+    if not (isinstance(key, list) and len(key) == 2 and isinstance(key[0], str)):
+        return None
+    if not isinstance(key[1], int) or isinstance(key[1], bool):
+        return None
+    try:
+        return datetime.fromisoformat(key[0]), key[1]
+    except ValueError:
+        return None
+
+
+def cursor_offset(cursor):
+    """The offset in an offset cursor's 'o' (a non-negative int), or 0 if it isn't one."""
+    offset = cursor.get('o') if cursor else None
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        return 0
+    return offset
+
+
+class CursorPage:
+    """One page of results plus the cursors to reach its neighbours."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, paginator=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset newest-first on (field, id), e.g. ('submitted_at', 'id').
+    The model should have a composite index on those two columns.
+    """
+
+    def __init__(self, object_list, per_page, field='submitted_at'):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.field = field
+
+    # -- keyset (querysets) --------------------------------------------------
+
+    def _key(self, obj):
+        return [getattr(obj, self.field).isoformat(), obj.pk]
+
+    def _keyset_page(self, cursor):
+        qs = self.object_list
+        field, per_page = self.field, self.per_page
+        direction = cursor.get('d') if cursor else None
+        key = cursor_key(cursor)
+        if key is None:
+            direction = None
+        else:
+            value, pk = key
+
+        if direction == 'p':
+            # Rows newer than the first row of the page we came from, nearest first
+            rows = list(
+                qs.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+                .order_by(field, 'pk')[:per_page + 1]
+            )
+            has_more = len(rows) > per_page
+            rows = rows[:per_page][::-1]
+            return CursorPage(
+                rows,
+                next_cursor=encode_cursor({'d': 'n', 'k': self._key(rows[-1])}) if rows else None,
+                previous_cursor=encode_cursor({'d': 'p', 'k': self._key(rows[0])}) if has_more else None,
+                paginator=self,
+            )
+
+        if direction == 'n':
+            qs = qs.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+        rows = list(qs.order_by(f'-{field}', '-pk')[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor({'d': 'n', 'k': self._key(rows[-1])}) if has_more else None,
+            previous_cursor=encode_cursor({'d': 'p', 'k': self._key(rows[0])}) if direction == 'n' and rows else None,
+            paginator=self,
+        )
+
+    # -- offset (in-memory ranked results) -------------------------------------
+
+    def _offset_page(self, cursor):
+        offset = cursor_offset(cursor)
+        end = offset + self.per_page
+        rows = self.object_list[offset:end]
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor({'o': end}) if end < len(self.object_list) else None,
+            previous_cursor=encode_cursor({'o': max(0, offset - self.per_page)}) if offset else None,
+            paginator=self,
+        )
+
+    def page(self, token):
+        cursor = decode_cursor(token)
+        if isinstance(self.object_list, QuerySet):
+            return self._keyset_page(cursor)
+        return self._offset_page(cursor)
+
+    # -- totals ------------------------------------------------------------------
+
+    def approximate_count(self):
+        """
+        (count, is_lower_bound). Uses the planner's row estimate on PostgreSQL for an
+        unfiltered table; otherwise counts at most APPROXIMATE_COUNT_CAP rows.
+        """
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return len(qs), getattr(qs, 'truncated', False)
+        if connection.vendor == 'postgresql' and not qs.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [qs.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0], False
+        count = qs.order_by()[:APPROXIMATE_COUNT_CAP + 1].count()
+        return min(count, APPROXIMATE_COUNT_CAP), count > APPROXIMATE_COUNT_CAP
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin: replaces page-number pagination with CursorPaginator.
+    Templates get page_obj (next_cursor/previous_cursor), is_paginated and, when
+    show_approximate_count is set, approximate_count / approximate_count_is_lower_bound.
+    """
+    cursor_field = 'submitted_at'
+    cursor_kwarg = 'cursor'
+    show_approximate_count = True
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(queryset, page_size, field=self.cursor_field)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = context.get('paginator')
+        if self.show_approximate_count and paginator is not None:
+            count, lower_bound = paginator.approximate_count()
+            context['approximate_count'] = count
+            context['approximate_count_is_lower_bound'] = lower_bound
+        return context
@@ -0,0 +1,67 @@
+"""
+Lexicographic ranks for ordering kanban cards (Task.rank).
+Ranks are base-36 strings ('0'-'9', 'a'-'z') compared as plain strings, so a card can be
+placed between any two neighbours by writing only its own rank. Lowercase alphanumerics
+sort the same under SQLite's BINARY and PostgreSQL's locale collations.
+Ranks never end in '0', which guarantees there is always room between two of them.
+"""
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# A rank longer than this means a column has had many inserts at the same spot;
+# rebalance_ranks() spreads the column out again.
+MAX_RANK_LENGTH = 12
+
+
+def rank_between(before='', after=''):
+    """
+    Rank strictly between `before` and `after`.
+    An empty `before` means "top of the column", an empty `after` means "bottom".
+    At either open end the rank moves one digit step instead of halving the remaining
+    space, so repeatedly adding cards to the top or bottom grows ranks slowly.
+    """
+    if before and after and before >= after:
+        raise ValueError(f'rank_between({before!r}, {after!r}): before must sort first')
+    open_top, open_bottom = not before, not after
+    result = []
+    i = 0
+    while True:
+        low = DIGITS.index(before[i]) if i < len(before) else 0
+        high = DIGITS.index(after[i]) if after and i < len(after) else BASE
+        if low == high:
+            result.append(DIGITS[low])
+            i += 1
+            continue
+        if open_top and open_bottom:
+            mid = (low + high) // 2
+        elif open_bottom and low + 1 < high:
+            mid = low + 1
+        elif open_top and high - 1 > low:
+            mid = high - 1
+        else:
+            mid = (low + high) // 2
+        if mid > low:
+            result.append(DIGITS[mid])
+            return ''.join(result)
+        # Adjacent digits: keep `before`'s digit and find room after it, no upper bound left.
+        result.append(DIGITS[low])
+        after = ''
+        i += 1
+
+
+def spaced_ranks(count):
+    """`count` evenly spaced, short ranks in ascending order (for initial data and rebalancing)."""
+    width = 1
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
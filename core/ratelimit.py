@@ -0,0 +1,130 @@
+"""
+Token-bucket rate limiting for public form submissions (VolunteerView, ContactView).
+Each client IP and each submitted e-mail address gets a bucket that refills at a steady
+rate; a POST that finds its bucket empty is answered with 429 before the form is validated
+or anything is written. Buckets live in the default cache, which must be shared by all
+gunicorn workers (the file cache in production, or set CACHE_URL to redis/memcached).
+Cache reads and writes aren't one atomic step, so under a burst of simultaneous requests
+a client can get a few more through than its capacity; that is fine for spam throttling.
+Per-day counters of allowed and rejected submissions are shown on the dashboard.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+from django.utils import timezone
+
+COUNTER_DAYS = 7
+
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """`capacity` requests in a burst, refilled evenly over `period` seconds."""
+    capacity: int
+    period: int
+
+    @classmethod
+    def parse(cls, value):
+        """'5/10m' -> 5 requests per 10 minutes ('s', 'm', 'h', 'd'; a bare unit means 1)."""
+        count, _, per = value.partition('/')
+        number = per[:-1] or '1'
+        return cls(int(count), int(number) * _UNITS[per[-1]])
+
+
+def client_ip(request):
+    """The client address nginx passes in X-Real-IP (see deploy/nginx-allminnesota.conf)."""
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', 'HTTP_X_REAL_IP')
+    return (header and request.META.get(header, '').strip()) or request.META.get('REMOTE_ADDR', '')
+
+
+def take_token(key, rate, now=None):
+    """Take one token from bucket `key`; False if it is empty."""
+    now = now or time.time()
+    bucket = cache.get(key)
+    tokens, updated = bucket if bucket else (rate.capacity, now)
+    tokens = min(rate.capacity, tokens + (now - updated) * rate.capacity / rate.period)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    cache.set(key, (tokens, now), rate.period)
+    return allowed
+
+
+def _counter_key(scope, outcome, day):
+    return f'core:ratelimit:count:{scope}:{outcome}:{day.isoformat()}'
+
+
+def count(scope, outcome):
+    key = _counter_key(scope, outcome, timezone.localdate())
+    cache.add(key, 0, (COUNTER_DAYS + 1) * 86400)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, (COUNTER_DAYS + 1) * 86400)
+
+
+def counters(scopes, outcomes=('allowed', 'ip', 'email'), days=COUNTER_DAYS):
+    """{scope: {outcome: total over the last `days` days}} for the dashboard."""
+    today = timezone.localdate()
+    keys = {
+        _counter_key(scope, outcome, today - timedelta(days=n)): (scope, outcome)
+        for scope in scopes for outcome in outcomes for n in range(days)
+    }
+    totals = {scope: dict.fromkeys(outcomes, 0) for scope in scopes}
+    for key, value in cache.get_many(list(keys)).items():
+        scope, outcome = keys[key]
+        totals[scope][outcome] += value
+    return totals
+
+
+def check_rate_limits(request, scope, rates):
+    """
+    Take a token from each configured bucket for this POST: 'ip' (client address) and
+    'email' (the submitted address, normalized). Returns the name of the first empty
+    bucket, or None if the request may proceed.
+    """
+    identities = {'ip': client_ip(request)}
+    if 'email' in rates:
+        email = request.POST.get('email', '').strip().lower()
+        if email:
+            identities['email'] = hashlib.sha256(email.encode()).hexdigest()[:32]
+    for name, value in rates.items():
+        identity = identities.get(name)
+        if identity and not take_token(f'core:ratelimit:{scope}:{name}:{identity}', Rate.parse(value)):
+            return name
+    return None
+
+
+class RateLimitMixin:
+    """
+    View mixin: throttle POSTs per client IP and per submitted e-mail before the view runs.
+    Set ratelimit_scope (a short name for keys and counters) and ratelimit_rates, e.g.
+    {'ip': '5/10m', 'email': '3/h'}; RATELIMIT_RATES[scope] in settings overrides them.
+    Disabled when RATELIMIT_ENABLED is False.
+    """
+    ratelimit_scope = ''
+    ratelimit_rates = {}
+    ratelimit_template = 'core/ratelimited.html'
+
+    def get_ratelimit_rates(self):
+        return getattr(settings, 'RATELIMIT_RATES', {}).get(self.ratelimit_scope, self.ratelimit_rates)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'POST' and getattr(settings, 'RATELIMIT_ENABLED', True):
+            rates = self.get_ratelimit_rates()
+            limited = check_rate_limits(request, self.ratelimit_scope, rates)
+            count(self.ratelimit_scope, limited or 'allowed')
+            if limited:
+                rate = Rate.parse(rates[limited])
+                response = render(request, self.ratelimit_template, status=429)
+                response['Retry-After'] = str(max(1, rate.period // rate.capacity))
+                return response
+        return super().dispatch(request, *args, **kwargs)
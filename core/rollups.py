@@ -0,0 +1,155 @@
+"""
+Daily and weekly impact rollups (ImpactRollup) and the chart series built from them.
+Each Donation, MealKitDistribution and VolunteerSignUp save/delete adds its change to the
+rollup rows for its date (received_at, distribution_date, submitted_at) with F() updates,
+so the chart never has to scan those tables. rebuild_rollups() recomputes everything.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .cache import get_page_cache_version, invalidate_page_cache
+from .models import Donation, ImpactRollup, MealKitDistribution, VolunteerSignUp
+
+DATE_FIELDS = {
+    Donation: 'received_at',
+    MealKitDistribution: 'distribution_date',
+    VolunteerSignUp: 'submitted_at',
+}
+
+SERIES_TIMEOUT = 3600
+MAX_POINTS = 365
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def contribution_date(instance, data=None):
+    """Day the row counts toward, or None if the date field is deferred or not set yet (see totals.contribution)."""
+    value = (instance.__dict__ if data is None else data).get(DATE_FIELDS[type(instance)])
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+def stored_date(model, pk):
+    value = model.objects.filter(pk=pk).values_list(DATE_FIELDS[model], flat=True).first()
+    return value and contribution_date(model(), {DATE_FIELDS[model]: value})
+
+
+def _add(period, start, amount, meals, volunteers):
+    changes = dict(
+        amount_raised=F('amount_raised') + amount,
+        meals_funded=F('meals_funded') + meals,
+        volunteers=F('volunteers') + volunteers,
+    )
+    if ImpactRollup.objects.filter(period=period, start=start).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ImpactRollup.objects.create(
+                period=period, start=start, amount_raised=amount, meals_funded=meals, volunteers=volunteers,
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        ImpactRollup.objects.filter(period=period, start=start).update(**changes)
+
+
+def apply_rollup_delta(day, amount=Decimal('0'), meals=0, volunteers=0):
+    """Add deltas to the day and week rows containing `day`."""
+    if day is None or not (amount or meals or volunteers):
+        return False
+    _add('day', day, amount, meals, volunteers)
+    _add('week', week_start(day), amount, meals, volunteers)
+    return True
+
+
+def daily_totals():
+    """{day: [amount, meals, volunteers]} computed from the source tables (three grouped queries)."""
+    days = defaultdict(lambda: [Decimal('0'), 0, 0])
+    for day, value in Donation.objects.values_list('received_at').annotate(v=Sum('amount')).order_by():
+        days[day][0] += value or 0
+    for day, value in (
+        MealKitDistribution.objects.values_list('distribution_date').annotate(v=Sum('meal_kits_count')).order_by()
+    ):
+        days[day][1] += value or 0
+    signups = (
+        VolunteerSignUp.objects.exclude(status='inactive')
+        .annotate(day=TruncDate('submitted_at')).values_list('day').annotate(v=Count('pk')).order_by()
+    )
+    for day, value in signups:
+        days[day][2] += value
+    return days
+
+
+def rebuild_rollups():
+    """Replace all rollup rows with totals computed from the source tables; returns rows written."""
+    days = daily_totals()
+    weeks = defaultdict(lambda: [Decimal('0'), 0, 0])
+    for day, values in days.items():
+        week = weeks[week_start(day)]
+        for i, value in enumerate(values):
+            week[i] += value
+    rows = [
+        ImpactRollup(period=period, start=start, amount_raised=a, meals_funded=m, volunteers=v)
+        for period, buckets in (('day', days), ('week', weeks))
+        for start, (a, m, v) in sorted(buckets.items())
+    ]
+    with transaction.atomic():
+        ImpactRollup.objects.all().delete()
+        ImpactRollup.objects.bulk_create(rows, batch_size=1000)
+    invalidate_page_cache()
+    return len(rows)
+
+
+def downsample(rows, points):
+    """
+    Merge consecutive (start, amount, meals, volunteers) rows into at most `points` buckets,
+    summing the values; each bucket is labelled with its first row's start date.
+    """
+    if len(rows) <= points:
+        return rows
+    merged = []
+    size = len(rows) / points
+    for i in range(points):
+        chunk = rows[round(i * size):round((i + 1) * size)]
+        if chunk:
+            merged.append((chunk[0][0], *(sum(r[k] for r in chunk) for k in (1, 2, 3))))
+    return merged
+
+
+def impact_series(period='week', points=52):
+    """
+    Chart data: per-bucket and cumulative amount raised, meals and volunteers, downsampled to
+    `points`. Cached until the page cache version changes (any totals change bumps it).
+    """
+    key = f'core:impact_series:{get_page_cache_version()}:{period}:{points}'
+    series = cache.get(key)
+    if series is None:
+        rows = list(
+            ImpactRollup.objects.filter(period=period).order_by('start')
+            .values_list('start', 'amount_raised', 'meals_funded', 'volunteers')
+        )
+        total = [Decimal('0'), 0, 0]
+        series = []
+        for start, amount, meals, volunteers in downsample(rows, points):
+            total = [total[0] + amount, total[1] + meals, total[2] + volunteers]
+            series.append({
+                'start': start.isoformat(),
+                'amount_raised': str(amount),
+                'meals_funded': meals,
+                'volunteers': volunteers,
+                'total_amount_raised': str(total[0]),
+                'total_meals_funded': total[1],
+                'total_volunteers': total[2],
+            })
+        cache.set(key, series, SERIES_TIMEOUT)
+    return series
@@ -0,0 +1,216 @@
+"""
+Ranked volunteer search for the dashboard (VolunteerListView).
+PostgreSQL: weighted tsvector GIN index plus a pg_trgm index for partial names/emails.
+SQLite: FTS5 external-content table kept in sync by triggers.
+Both are created by migration 0006; any other backend falls back to icontains. Without
+pg_trgm (it needs CREATE EXTENSION rights) PostgreSQL searches whole words and prefixes only.
+SQLite drops a table's triggers when a migration rebuilds it (adding a NOT NULL column,
+for one), so such migrations on core_volunteersignup must call restore_sqlite_fts();
+check_sqlite_fts_triggers() runs after every migrate and fails if one forgot.
+Covers first/last name, email, availability and notes.
+"""
+
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections, transaction, DatabaseError
+from django.db.models import Q
+
+from .models import VolunteerSignUp
+
+# Upper bound on ranked matches; the list is paginated from this set and says when a
+# search matched more (RankedResults.truncated).
+MAX_RESULTS = 500
+
+# PostgreSQL: the query must repeat these expressions exactly for the indexes to be used.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, first_name || ' ' || last_name), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, email), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, availability || ' ' || notes), 'C')"
+)
+PG_TRIGRAM_DOCUMENT = "lower(first_name || ' ' || last_name || ' ' || email)"
+
+SQLITE_FTS_TABLE = 'core_volunteersignup_fts'
+SQLITE_FTS_COLUMNS = ('first_name', 'last_name', 'email', 'availability', 'notes')
+
+_FTS_COLS = ', '.join(SQLITE_FTS_COLUMNS)
+_NEW_COLS = ', '.join(f'new.{c}' for c in SQLITE_FTS_COLUMNS)
+_OLD_COLS = ', '.join(f'old.{c}' for c in SQLITE_FTS_COLUMNS)
+SQLITE_FTS_TRIGGERS = [
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLS}) VALUES (new.id, {_NEW_COLS}); END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ad AFTER DELETE ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_OLD_COLS}); END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE ON core_volunteersignup BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_OLD_COLS}); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLS}) VALUES (new.id, {_NEW_COLS}); END",
+]
+SQLITE_FTS_REBUILD = f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"
+
+_fts_available = None
+_trigram_available = None
+
+
+def query_terms(query):
+    """Word tokens of the search box input, lowercased (punctuation dropped)."""
+    return [t.lower() for t in re.findall(r'\w+', query)][:8]
+
+
+def pg_trigram_available():
+    global _trigram_available
+    if _trigram_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_available = cursor.fetchone() is not None
+    return _trigram_available
+
+
+def _search_postgresql(query, terms, limit):
+    tsquery = ' & '.join(f'{t}:*' for t in terms)
+    needle = query.strip().lower()
+    match = f"({PG_SEARCH_VECTOR}) @@ to_tsquery('simple', %s)"
+    rank = f"ts_rank({PG_SEARCH_VECTOR}, to_tsquery('simple', %s))"
+    params = [tsquery, tsquery]
+    if pg_trigram_available():
+        match += f' OR %s <%% {PG_TRIGRAM_DOCUMENT}'
+        rank += f' + word_similarity(%s, {PG_TRIGRAM_DOCUMENT})'
+        params = [tsquery, needle, tsquery, needle]
+    sql = (
+        f'SELECT id FROM core_volunteersignup WHERE {match} '
+        f'ORDER BY {rank} DESC, submitted_at DESC LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def sqlite_fts_available():
+    global _fts_available
+    if _fts_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_FTS_TABLE])
+            _fts_available = cursor.fetchone() is not None
+    return _fts_available
+
+
+def missing_sqlite_fts_triggers(db=connection):
+    """Names of the FTS5 sync triggers missing on a SQLite database that has the FTS table."""
+    with db.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE name LIKE %s", [f'{SQLITE_FTS_TABLE}%'])
+        found = {(kind, name) for kind, name in cursor.fetchall()}
+    if ('table', SQLITE_FTS_TABLE) not in found:
+        return []
+    return [
+        f'{SQLITE_FTS_TABLE}_{suffix}' for suffix in ('ai', 'ad', 'au')
+        if ('trigger', f'{SQLITE_FTS_TABLE}_{suffix}') not in found
+    ]
+
+
+def restore_sqlite_fts(schema_editor):
+    """Recreate the FTS5 sync triggers (if the FTS table exists) and reindex; for migrations."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_FTS_TABLE])
+        if cursor.fetchone() is None:
+            return
+    for suffix in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_{suffix}')
+    for sql in SQLITE_FTS_TRIGGERS:
+        schema_editor.execute(sql)
+    schema_editor.execute(SQLITE_FTS_REBUILD)
+
+
+def check_sqlite_fts_triggers(sender=None, using='default', **kwargs):
+    """
+    post_migrate receiver: fail loudly if a migration rebuilt core_volunteersignup without
+    calling restore_sqlite_fts(), instead of letting the search index go stale unnoticed.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    missing = missing_sqlite_fts_triggers(db)
+    if missing:
+        raise ImproperlyConfigured(
+            f'Search triggers missing after migrate: {", ".join(missing)}. A migration that rebuilds '
+            f'core_volunteersignup must call core.search.restore_sqlite_fts(schema_editor).'
+        )
+
+
+def _search_sqlite(terms, limit):
+    # Each term matches as a prefix; exact words match twice and so rank higher
+    match = ' AND '.join(f'("{t}" OR "{t}"*)' for t in terms)
+    # bm25 column weights follow SQLITE_FTS_COLUMNS: names count most, then email
+    sql = (
+        f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s '
+        f'ORDER BY bm25({SQLITE_FTS_TABLE}, 10.0, 10.0, 5.0, 1.0, 1.0) LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_fallback(terms, limit):
+    fields = ('first_name', 'last_name', 'email', 'availability', 'notes')
+    condition = Q()
+    for term in terms:
+        term_condition = Q()
+        for field in fields:
+            term_condition |= Q(**{f'{field}__icontains': term})
+        condition &= term_condition
+    return list(
+        VolunteerSignUp.objects.filter(condition).order_by('-submitted_at').values_list('pk', flat=True)[:limit]
+    )
+
+
+def search_volunteer_ids(query, limit=MAX_RESULTS):
+    """Primary keys of matching volunteers, best match first."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    try:
+        # Savepoint so a failed search doesn't poison an enclosing transaction
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                return _search_postgresql(query, terms, limit)
+            if connection.vendor == 'sqlite' and sqlite_fts_available():
+                return _search_sqlite(terms, limit)
+    except DatabaseError:
+        # Index missing (e.g. pg_trgm not installed): still answer, just slower.
+        pass
+    return _search_fallback(terms, limit)
+
+
+class RankedResults:
+    """
+    Matching volunteers in relevance order, for Paginator: the ranked ids are held in
+    memory and only the requested page of rows is loaded. `truncated` is set when the
+    search matched more rows than were kept.
+    """
+
+    def __init__(self, ids, truncated=False):
+        self.ids = ids
+        self.truncated = truncated
+
+    def __len__(self):
+        return len(self.ids)
+
+    def count(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            page_ids = self.ids[index]
+            rows = VolunteerSignUp.objects.select_related('site').in_bulk(page_ids)
+            return [rows[pk] for pk in page_ids if pk in rows]
+        index = range(len(self.ids))[index]  # negative indexes and IndexError as for a list
+        return self[index:index + 1][0]
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+def search_volunteers(query, limit=MAX_RESULTS):
+    """Matching volunteers ordered by relevance (see RankedResults), at most `limit`."""
+    ids = search_volunteer_ids(query, limit + 1)
+    return RankedResults(ids[:limit], truncated=len(ids) > limit)
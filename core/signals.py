@@ -0,0 +1,178 @@
+"""
+Signal receivers for All Minnesota.
+Public page cache: any change to goals, events or impact updates invalidates cached pages.
+Running totals: donations, meal kit distributions and volunteer sign-ups apply their
+delta to the active goal on save/delete (see core/totals.py), and to the daily/weekly
+rollup rows for their date (core/rollups.py).
+Tasks: new tasks without a rank, and tasks moved to another column without a new rank
+(task form, admin, no-JS board), go to the bottom of their kanban column.
+Events: a new or changed image gets its resized variants generated after commit.
+Users: any change reloads the process-level staff cache (core/staff.py) everywhere.
+Analytics: donations, food orders, distributions and sites invalidate the cached panels.
+Geocoding: sites and volunteers get coordinates when their address/ZIP changes (core/geo.py);
+site changes reload the nearest-site index.
+Duplicates: volunteer sign-ups get their blocking keys on save, and new ones are checked for
+duplicates in the background (core/dedup.py).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import dedup, geo, rollups, totals
+from .analytics import invalidate_analytics
+from .cache import invalidate_page_cache
+from .images import delete_variants, schedule_event_variants
+from .jobs import enqueue
+from .kanban import bottom_rank
+from .models import (
+    FundraisingGoal, Event, ImpactUpdate, Donation, MealKitDistribution, VolunteerSignUp, Task, FoodOrder,
+    DistributionSite,
+)
+from .staff import invalidate_staff_users
+
+
+@receiver([post_save, post_delete], sender=FundraisingGoal)
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=ImpactUpdate)
+def invalidate_public_pages(sender, **kwargs):
+    # After commit: before it, another process could re-cache the page without the change
+    transaction.on_commit(invalidate_page_cache)
+
+
+@receiver([post_save, post_delete], sender=Donation)
+@receiver([post_save, post_delete], sender=FoodOrder)
+@receiver([post_save, post_delete], sender=MealKitDistribution)
+@receiver([post_save, post_delete], sender=DistributionSite)
+def invalidate_analytics_panels(sender, **kwargs):
+    transaction.on_commit(invalidate_analytics)
+
+
+@receiver(pre_save, sender=DistributionSite)
+@receiver(pre_save, sender=VolunteerSignUp)
+def geocode_address(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    source = geo.geocode_source(instance)
+    if source is None:
+        return
+    loaded = getattr(instance, '_loaded_values', None)
+    # Only when the address changed, so coordinates corrected by hand are kept
+    changed = loaded is not None and source != geo.geocode_source(instance, loaded)
+    if changed or instance.latitude is None:
+        geo.geocode_instance(instance)
+
+
+@receiver(pre_save, sender=VolunteerSignUp)
+def set_volunteer_blocking_keys(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dedup.set_blocking_keys(instance)
+
+
+@receiver(post_save, sender=VolunteerSignUp)
+def check_volunteer_duplicates(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        enqueue('find_volunteer_duplicates', volunteer_ids=[instance.pk])
+
+
+@receiver([post_save, post_delete], sender=DistributionSite)
+def invalidate_site_index(sender, **kwargs):
+    geo.invalidate_site_index()
+    transaction.on_commit(geo.invalidate_site_index)
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    variants = instance.image_variants or {}
+    if (instance.image.name or '') != variants.get('source', ''):
+        schedule_event_variants(instance.pk)
+
+
+@receiver(post_delete, sender=Event)
+def delete_event_image_variants(sender, instance, **kwargs):
+    if instance.image_variants:
+        transaction.on_commit(lambda: delete_variants(instance.image_variants))
+
+
+@receiver(pre_save, sender=Task)
+def assign_task_rank(sender, instance, raw=False, **kwargs):
+    """A task without a rank, or moved to another column without a new rank, goes to the bottom."""
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    status, rank = loaded.get('status'), loaded.get('rank')
+    moved = not instance._state.adding and status is not None and instance.status != status
+    if not instance.rank or (moved and instance.rank == rank):
+        instance.rank = bottom_rank(instance.status, exclude_pk=instance.pk)
+
+
+# ---------------------------------------------------------------------------
+# Running totals
+# ---------------------------------------------------------------------------
+
+TOTALS_SENDERS = (Donation, MealKitDistribution, VolunteerSignUp)
+
+
+def loaded_contribution(instance):
+    """(totals contribution, rollup date) of the row as loaded or last saved; (None, None) if unknown."""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return None, None
+    return totals.contribution(instance, loaded), rollups.contribution_date(instance, loaded)
+
+
+def resolve_previous_contribution(sender, instance, raw=False, **kwargs):
+    """Snapshot what the row contributed before this save/delete, so only the difference is applied."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    old, old_date = loaded_contribution(instance)
+    # Not loaded from the DB, or loaded with deferred fields: read the stored values once
+    instance._totals_contribution = old if old is not None else totals.stored_contribution(sender, instance.pk)
+    instance._rollup_date = old_date or rollups.stored_date(sender, instance.pk)
+
+
+def apply_saved_contribution(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new = totals.contribution(instance)
+    if new is None:
+        new = totals.stored_contribution(sender, instance.pk)
+    old = totals.ZERO if created else (getattr(instance, '_totals_contribution', None) or totals.ZERO)
+    changed = totals.apply_delta(*(n - o for n, o in zip(new, old)))
+    new_date = rollups.contribution_date(instance) or rollups.stored_date(sender, instance.pk)
+    old_date = None if created else getattr(instance, '_rollup_date', None)
+    if old_date == new_date:
+        changed = rollups.apply_rollup_delta(new_date, *(n - o for n, o in zip(new, old))) or changed
+    else:
+        changed = rollups.apply_rollup_delta(old_date, *(-o for o in old)) or changed
+        changed = rollups.apply_rollup_delta(new_date, *new) or changed
+    if changed:
+        transaction.on_commit(invalidate_page_cache)
+
+
+def apply_deleted_contribution(sender, instance, **kwargs):
+    old = getattr(instance, '_totals_contribution', None) or totals.contribution(instance) or totals.ZERO
+    changed = totals.apply_delta(*(-o for o in old))
+    day = getattr(instance, '_rollup_date', None) or rollups.contribution_date(instance)
+    if rollups.apply_rollup_delta(day, *(-o for o in old)) or changed:
+        transaction.on_commit(invalidate_page_cache)
+
+
+for _model in TOTALS_SENDERS:
+    pre_save.connect(resolve_previous_contribution, sender=_model, dispatch_uid=f'totals_pre_{_model.__name__}')
+    post_save.connect(apply_saved_contribution, sender=_model, dispatch_uid=f'totals_save_{_model.__name__}')
+    pre_delete.connect(resolve_previous_contribution, sender=_model, dispatch_uid=f'totals_pre_delete_{_model.__name__}')
+    post_delete.connect(apply_deleted_contribution, sender=_model, dispatch_uid=f'totals_delete_{_model.__name__}')
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_staff_cache(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which the cached list doesn't need to be exact on
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_staff_users()
+    # Again after commit, in case another process reloaded the list before it could see the change
+    transaction.on_commit(invalidate_staff_users)
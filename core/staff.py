@@ -0,0 +1,76 @@
+"""
+Process-level cache of staff users.
+Every dashboard page needs the staff list (kanban filter and assignee menus, TaskForm) and
+the logged-in staff user itself; both are read from memory here instead of the database.
+Each process keeps its own copy and reloads it when the version key in the shared cache
+changes; saving or deleting any User bumps that version (see core/signals.py).
+QuerySet.update() sends no signal, so StaffCacheBackend still reads is_active and the
+password hash (which ends sessions when it changes) from the database on every request.
+"""
+
+import copy
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+STAFF_VERSION_KEY = 'core:staff_users:version'
+
+User = get_user_model()
+
+_lock = threading.Lock()
+_loaded = {'version': None, 'users': ()}
+
+
+def _current_version():
+    version = cache.get(STAFF_VERSION_KEY)
+    if version is None:
+        cache.add(STAFF_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(STAFF_VERSION_KEY)
+    return version
+
+
+def invalidate_staff_users():
+    cache.set(STAFF_VERSION_KEY, time.time_ns(), None)
+
+
+def get_staff_users():
+    """Staff users ordered by first name, username. The list is new; the users are shared, don't modify them."""
+    version = _current_version()
+    with _lock:
+        if _loaded['version'] != version or version is None:
+            _loaded['users'] = tuple(User.objects.filter(is_staff=True).order_by('first_name', 'username'))
+            _loaded['version'] = version
+        return list(_loaded['users'])
+
+
+def get_staff_user(pk):
+    """The staff user with this pk from the cached list, or None."""
+    return next((u for u in get_staff_users() if u.pk == pk), None)
+
+
+class StaffCacheBackend(ModelBackend):
+    """
+    ModelBackend that loads logged-in staff from the staff cache, replacing the full user
+    query AuthenticationMiddleware makes on every request with a two-column one (is_active,
+    password); when those differ from the cached user, the cache is reloaded. Returns a copy
+    so per-request state (permission caches, ...) never leaks between requests; other users
+    come from the DB.
+    """
+
+    def get_user(self, user_id):
+        try:
+            pk = User._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+        user = get_staff_user(pk)
+        if user is None:
+            return super().get_user(user_id)
+        current = User._default_manager.filter(pk=pk).values_list('is_active', 'password').first()
+        if current != (user.is_active, user.password):
+            invalidate_staff_users()
+            return super().get_user(user_id)
+        return copy.copy(user) if self.user_can_authenticate(user) else None
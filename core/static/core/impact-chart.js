@@ -0,0 +1,95 @@
+/**
+ * Impact chart: cumulative amount raised, meals or volunteers over time as an inline SVG line.
+ * The series (from the element's data-series-url, see ImpactSeriesView) is only fetched once
+ * the chart scrolls into view. Buttons with data-metric switch the plotted metric.
+ */
+(function () {
+  var LABELS = {
+    total_amount_raised: 'Amount raised',
+    total_meals_funded: 'Meals funded',
+    total_volunteers: 'Volunteers'
+  };
+  var WIDTH = 600;
+  var HEIGHT = 220;
+  var PAD = 36;
+  var SVG_NS = 'http://www.w3.org/2000/svg';
+
+  function el(name, attrs) {
+    var node = document.createElementNS(SVG_NS, name);
+    Object.keys(attrs).forEach(function (key) { node.setAttribute(key, attrs[key]); });
+    return node;
+  }
+
+  function format(metric, value) {
+    var text = Math.round(value).toLocaleString();
+    return metric === 'total_amount_raised' ? '$' + text : text;
+  }
+
+  function draw(container, series, metric) {
+    var svg = container.querySelector('svg');
+    while (svg.firstChild) svg.removeChild(svg.firstChild);
+    var values = series.map(function (p) { return Number(p[metric]); });
+    var max = Math.max.apply(null, values.concat([1]));
+    var step = series.length > 1 ? (WIDTH - 2 * PAD) / (series.length - 1) : 0;
+    var points = values.map(function (v, i) {
+      var x = PAD + i * step;
+      var y = HEIGHT - PAD - (v / max) * (HEIGHT - 2 * PAD);
+      return x.toFixed(1) + ',' + y.toFixed(1);
+    });
+    svg.appendChild(el('line', { x1: PAD, y1: HEIGHT - PAD, x2: WIDTH - PAD, y2: HEIGHT - PAD, stroke: '#ccc' }));
+    svg.appendChild(el('polyline', {
+      points: points.join(' '), fill: 'none', stroke: 'var(--primary-green, #1B5E3B)', 'stroke-width': 3
+    }));
+    var top = el('text', { x: PAD, y: PAD - 10, 'font-size': 13, fill: '#555' });
+    top.textContent = LABELS[metric] + ': ' + format(metric, values[values.length - 1]);
+    svg.appendChild(top);
+    [[0, 'start'], [series.length - 1, 'end']].forEach(function (pair) {
+      var label = el('text', {
+        x: PAD + pair[0] * step, y: HEIGHT - PAD + 20, 'font-size': 12, fill: '#777', 'text-anchor': pair[1]
+      });
+      label.textContent = series[pair[0]].start;
+      svg.appendChild(label);
+    });
+    svg.setAttribute('aria-label', top.textContent);
+  }
+
+  function load(container) {
+    fetch(container.dataset.seriesUrl, { headers: { Accept: 'application/json' } })
+      .then(function (response) { return response.ok ? response.json() : Promise.reject(response.status); })
+      .then(function (data) {
+        var status = container.querySelector('.impact-chart-status');
+        if (!data.series.length) {
+          status.textContent = 'No data yet.';
+          return;
+        }
+        status.remove();
+        var metric = 'total_amount_raised';
+        draw(container, data.series, metric);
+        container.querySelectorAll('[data-metric]').forEach(function (button) {
+          button.disabled = false;
+          button.addEventListener('click', function () {
+            container.querySelectorAll('[data-metric]').forEach(function (b) { b.classList.remove('active'); });
+            button.classList.add('active');
+            draw(container, data.series, button.dataset.metric);
+          });
+        });
+      })
+      .catch(function () {
+        container.querySelector('.impact-chart-status').textContent = 'Chart unavailable.';
+      });
+  }
+
+  document.querySelectorAll('.impact-chart').forEach(function (container) {
+    if (!('IntersectionObserver' in window)) {
+      load(container);
+      return;
+    }
+    var observer = new IntersectionObserver(function (entries) {
+      if (entries.some(function (entry) { return entry.isIntersecting; })) {
+        observer.disconnect();
+        load(container);
+      }
+    }, { rootMargin: '200px' });
+    observer.observe(container);
+  });
+})();
@@ -1,5 +1,8 @@
 /**
- * Kanban drag-and-drop: move task cards between columns.
+ * Kanban drag-and-drop: move, reorder and reassign task cards without a page reload.
+ * Changes are applied to the DOM immediately and sent to the card's JSON move endpoint
+ * (data-move-url); if the server rejects them (e.g. 409 when someone else changed the
+ * task first) the card is put back where it was.
  * Call window.initKanbanDnd() after Sortable.js has loaded (e.g. from Sortable script onload).
  */
 (function () {
@@ -8,40 +11,133 @@
     return input ? input.value : '';
   }
 
-  function postMove(taskId, newStatus) {
-    var form = document.createElement('form');
-    form.method = 'POST';
-    form.action = window.location.pathname + window.location.search;
-    form.style.display = 'none';
+  function refreshColumn(column) {
+    if (!column) return;
+    var count = column.querySelectorAll('.task-card').length;
+    var card = column.closest('.card');
+    var badge = card ? card.querySelector('.card-header .badge') : null;
+    if (badge) badge.textContent = count;
+    var empty = column.querySelector('.kanban-empty');
+    if (empty) empty.style.display = count ? 'none' : '';
+  }
+
+  function applyState(card, task) {
+    card.dataset.updatedAt = task.updated_at;
+    var name = card.querySelector('.task-assignee');
+    if (name) name.textContent = task.assigned_to_name || '— No one —';
+    var statusSelect = card.querySelector('.task-status-form select[name="status"]');
+    if (statusSelect) statusSelect.value = task.status;
+    var assignSelect = card.querySelector('.task-assign-form select[name="assigned_to"]');
+    if (assignSelect) assignSelect.value = task.assigned_to === null ? '' : String(task.assigned_to);
+  }
+
+  /**
+   * POST changes for one card. `rollback` undoes the optimistic DOM change on failure.
+   */
+  function sendMove(card, fields, rollback) {
+    var body = new URLSearchParams();
+    body.append('updated_at', card.dataset.updatedAt || '');
+    Object.keys(fields).forEach(function (key) {
+      if (fields[key] !== undefined && fields[key] !== null) body.append(key, fields[key]);
+    });
+    card.classList.add('opacity-50');
+    return fetch(card.dataset.moveUrl, {
+      method: 'POST',
+      headers: { 'X-CSRFToken': getCsrfToken(), 'X-Requested-With': 'XMLHttpRequest' },
+      body: body,
+      credentials: 'same-origin'
+    })
+      .then(function (resp) {
+        return resp.json().catch(function () { return {}; }).then(function (data) {
+          if (!resp.ok) throw data;
+          applyState(card, data.task);
+        });
+      })
+      .catch(function (data) {
+        rollback();
+        if (data && data.task) applyState(card, data.task);
+        window.alert((data && data.error) || 'Could not save the change. Please try again.');
+      })
+      .then(function () {
+        card.classList.remove('opacity-50');
+      });
+  }
 
-    var csrf = document.createElement('input');
-    csrf.type = 'hidden';
-    csrf.name = 'csrfmiddlewaretoken';
-    csrf.value = getCsrfToken();
-    form.appendChild(csrf);
+  function neighbourId(card, direction) {
+    var el = card[direction];
+    while (el && !(el.classList && el.classList.contains('task-card'))) el = el[direction];
+    return el ? el.dataset.taskId : '';
+  }
 
-    var taskInput = document.createElement('input');
-    taskInput.type = 'hidden';
-    taskInput.name = 'task_id';
-    taskInput.value = taskId;
-    form.appendChild(taskInput);
+  function onDragStart(evt) {
+    evt.item._kanbanOrigin = { parent: evt.from, next: evt.item.nextSibling };
+  }
 
-    var statusInput = document.createElement('input');
-    statusInput.type = 'hidden';
-    statusInput.name = 'status';
-    statusInput.value = newStatus;
-    form.appendChild(statusInput);
+  function onDragEnd(evt) {
+    var card = evt.item;
+    var origin = card._kanbanOrigin;
+    if (!origin || (evt.from === evt.to && evt.oldIndex === evt.newIndex)) return;
+    var fields = {
+      above_id: neighbourId(card, 'previousElementSibling'),
+      below_id: neighbourId(card, 'nextElementSibling')
+    };
+    if (evt.from !== evt.to) fields.status = evt.to.dataset.status;
+    refreshColumn(evt.from);
+    refreshColumn(evt.to);
+    sendMove(card, fields, function () {
+      origin.parent.insertBefore(card, origin.next);
+      refreshColumn(evt.from);
+      refreshColumn(evt.to);
+    });
+  }
 
-    document.body.appendChild(form);
-    form.submit();
+  function bindCardForms(board) {
+    board.addEventListener('submit', function (evt) {
+      var form = evt.target;
+      var card = form.closest('.task-card');
+      if (!card || !card.dataset.moveUrl) return;
+      if (form.classList.contains('task-status-form')) {
+        evt.preventDefault();
+        var status = form.querySelector('select[name="status"]').value;
+        var from = card.parentNode;
+        var next = card.nextSibling;
+        var to = board.querySelector('.kanban-column[data-status="' + status + '"]');
+        if (to && to !== from) {
+          to.appendChild(card);
+          refreshColumn(from);
+          refreshColumn(to);
+        }
+        sendMove(card, { status: status }, function () {
+          from.insertBefore(card, next);
+          refreshColumn(from);
+          refreshColumn(to);
+        });
+      } else if (form.classList.contains('task-assign-form')) {
+        evt.preventDefault();
+        var select = form.querySelector('select[name="assigned_to"]');
+        var name = card.querySelector('.task-assignee');
+        var previous = name ? name.textContent : '';
+        if (name) name.textContent = select.options[select.selectedIndex].text;
+        sendMove(card, { assigned_to: select.value }, function () {
+          if (name) name.textContent = previous;
+        });
+      }
+    });
   }
 
   function initKanbanDnd() {
+    var board = document.querySelector('.kanban-board');
+    if (board && !board._kanbanFormsBound) {
+      bindCardForms(board);
+      board._kanbanFormsBound = true;
+    }
     if (typeof Sortable === 'undefined') return;
     var columns = document.querySelectorAll('.kanban-column');
     if (!columns.length) return;
 
     columns.forEach(function (el) {
+      refreshColumn(el);
+      if (Sortable.get && Sortable.get(el)) return;
       new Sortable(el, {
         group: 'kanban-tasks',
         draggable: '.task-card',
@@ -49,13 +145,8 @@
         ghostClass: 'sortable-ghost',
         filter: '.btn, a, input, select, textarea',
         preventOnFilter: true,
-        onEnd: function (evt) {
-          var fromStatus = evt.from.dataset.status;
-          var toStatus = evt.to.dataset.status;
-          if (fromStatus === toStatus) return;
-          var taskId = evt.item.dataset.taskId;
-          if (taskId) postMove(taskId, toStatus);
-        }
+        onStart: onDragStart,
+        onEnd: onDragEnd
       });
     });
   }
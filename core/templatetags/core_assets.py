@@ -0,0 +1,56 @@
+"""
+Template tags for front-end assets (see core/assets.py).
+{% vendor_url 'bootstrap.min.css' %} is the vendored, fingerprinted copy when SELF_HOSTED_ASSETS
+is on and build_assets has written it, and the pinned CDN URL otherwise; {% logo_url 48 %}
+likewise picks the resized logo for that display height, and {% favicon_links %} renders the
+icon <link> tags.
+"""
+
+import os
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from core.assets import DIST_DIR, DIST_PREFIX, LOGO_HEIGHTS, VENDOR_FILES
+
+register = template.Library()
+
+LOGO = 'core/images/logo.png'
+
+
+def _self_hosted(name):
+    """True if the built file `name` in dist/ should be used (it is missing before build_assets)."""
+    return getattr(settings, 'SELF_HOSTED_ASSETS', False) and os.path.isfile(os.path.join(DIST_DIR, name))
+
+
+@register.simple_tag
+def vendor_url(name):
+    if _self_hosted(name):
+        return static(DIST_PREFIX + name)
+    return VENDOR_FILES[name]
+
+
+@register.simple_tag
+def logo_url(height):
+    """Smallest built logo that is at least 2x `height` pixels tall."""
+    fits = [h for h in sorted(LOGO_HEIGHTS) if h >= int(height)]
+    name = LOGO_HEIGHTS[fits[0] if fits else max(LOGO_HEIGHTS)]
+    if not _self_hosted(name):
+        return static(LOGO)
+    return static(DIST_PREFIX + name)
+
+
+@register.simple_tag
+def favicon_links():
+    if not _self_hosted('favicon.ico'):
+        return format_html('<link rel="icon" href="{}" type="image/png">', static(LOGO))
+    return format_html(
+        '<link rel="icon" href="{}" sizes="any">\n'
+        '    <link rel="icon" href="{}" type="image/png" sizes="32x32">\n'
+        '    <link rel="apple-touch-icon" href="{}">',
+        static(DIST_PREFIX + 'favicon.ico'),
+        static(DIST_PREFIX + 'favicon-32.png'),
+        static(DIST_PREFIX + 'apple-touch-icon.png'),
+    )
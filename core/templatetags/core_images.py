@@ -0,0 +1,41 @@
+"""
+Template tags for responsive event images.
+{% event_image event sizes="..." class="..." style="..." %} renders a <picture> with WebP and
+JPEG srcsets from Event.image_variants (see core/images.py) and the blurred placeholder as
+background; events whose variants aren't generated yet get a plain <img> of the original.
+"""
+
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def _srcset(entries):
+    return ', '.join(f'{default_storage.url(name)} {width}w' for width, name in entries)
+
+
+@register.simple_tag
+def event_image(event, sizes='100vw', loading='lazy', **attrs):
+    """`attrs` (class, style, ...) are copied onto the <img>; alt defaults to the event title."""
+    alt = attrs.pop('alt', event.title)
+    css_class = attrs.pop('class', '')
+    style = attrs.pop('style', '')
+    variants = event.image_variants or {}
+    if not variants.get('jpeg') or variants.get('source') != event.image.name:
+        return format_html(
+            '<img src="{}" class="{}" alt="{}" style="{}" loading="{}" decoding="async">',
+            event.image.url, css_class, alt, style, loading,
+        )
+    jpeg = variants['jpeg']
+    style = f"{style} background-image: url('{variants['placeholder']}'); background-size: cover;".strip()
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" class="{}" alt="{}" style="{}" loading="{}" decoding="async">'
+        '</picture>',
+        _srcset(variants['webp']), sizes,
+        default_storage.url(jpeg[-1][1]), _srcset(jpeg), sizes,
+        variants['width'], variants['height'], css_class, alt, style, loading,
+    )
@@ -1,3 +1,1484 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from django.views.generic import TemplateView
+from PIL import Image
+
+from . import jobs, totals, urls as core_urls
+from .analytics import PANELS, get_panel, get_panels, query_budget
+from .assets import VENDOR_FILES, check_built_assets
+from .assignment import apply_plan, plan_assignments
+from .cache import ConditionalGetMixin, get_page_cache_version, invalidate_page_cache
+from .dedup import find_duplicates, merge_volunteers, save_candidates
+from .models import (
+    FundraisingGoal, Event, DistributionSite, VolunteerSignUp, DuplicateCandidate, ContactMessage, ImpactUpdate,
+    Donation, FoodOrder, MealKitDistribution, PartnerOrganization, PartnerContact, Task, Job, ImpactRollup,
+)
+from .images import generate_event_variants
+from .geo import KDTree, check_gazetteer, distance_km, geocode, geocode_match, nearest_sites
+from .imports import ImportFileError, import_records
+from .kanban import TASK_ORDERING, move_task
+from .pagination import CursorPaginator, encode_cursor
+from .ranks import rank_between, spaced_ranks
+from .rollups import rebuild_rollups
+from .search import RankedResults, check_sqlite_fts_triggers, missing_sqlite_fts_triggers, search_volunteer_ids, search_volunteers
+from .templatetags.core_assets import favicon_links, logo_url, vendor_url
+from .templatetags.core_images import event_image
+
+
+class AdminQueryCountTests(TestCase):
+    """Admin pages run the same number of queries however many rows they show (no N+1)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.rows = 0
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_rows(self, n):
+        """n more rows of every model in the admin, with every foreign key set."""
+        user = self.user
+        today = date(2026, 1, 15)
+        for i in range(self.rows, self.rows + n):
+            site = DistributionSite.objects.create(name=f'Site {i}', city_state='Duluth, MN', capacity_volunteers=10)
+            first, second = (
+                VolunteerSignUp.objects.create(
+                    first_name='Pat', last_name=f'Lee{i}', email=f'pat{i}{suffix}@example.com', region='tc', site=site,
+                )
+                for suffix in ('', 'x')
+            )
+            DuplicateCandidate.objects.create(first=first, second=second, score=0.9, reasons='name')
+            partner = PartnerOrganization.objects.create(name=f'Partner {i}')
+            PartnerContact.objects.create(partner=partner, name=f'Contact {i}')
+            FundraisingGoal.objects.create(goal_title=f'Goal {i}', target_amount=Decimal('1000'), is_active=False)
+            Event.objects.create(
+                title=f'Event {i}', date=timezone.now(), venue_name='Hall', venue_address='1 Main St',
+                city_state='Duluth, MN', description='',
+            )
+            ContactMessage.objects.create(name='Sam', email='sam@example.com', subject=f'Hello {i}', message='Hi')
+            ImpactUpdate.objects.create(amount_raised=Decimal('10'), meals_funded=1, volunteers=1, updated_by=user)
+            Donation.objects.create(amount=Decimal('25'), received_at=today - timedelta(days=i), recorded_by=user)
+            FoodOrder.objects.create(
+                order_date=today, supplier=f'Supplier {i}', description='Rice', site=site, ordered_by=user,
+            )
+            MealKitDistribution.objects.create(
+                distribution_date=today, site=site, meal_kits_count=5, recorded_by=user,
+            )
+            Task.objects.create(title=f'Task {i}', assigned_to=user, created_by=user)
+            Job.objects.create(name='refresh_analytics')
+        self.rows += n
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return queries
+
+    def changelist_url(self, model):
+        return reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+
+    def test_changelist_queries_are_constant(self):
+        models = [model for model in admin.site._registry if model._meta.app_label == 'core']
+        self.create_rows(2)
+        self.count_queries(self.changelist_url(Job))  # warm per-process caches (staff users, ...)
+        before = {model: len(self.count_queries(self.changelist_url(model))) for model in models}
+        self.create_rows(8)
+        for model in models:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(len(self.count_queries(self.changelist_url(model))), before[model])
+
+    def test_partner_change_page_queries_are_constant(self):
+        partner = PartnerOrganization.objects.create(name='Food Shelf')
+        PartnerContact.objects.create(partner=partner, name='Ana')
+        url = reverse('admin:core_partnerorganization_change', args=[partner.pk])
+        self.count_queries(url)
+        before = len(self.count_queries(url))
+        for i in range(5):
+            PartnerContact.objects.create(partner=partner, name=f'Contact {i}')
+        self.assertEqual(len(self.count_queries(url)), before)
+
+    def test_annotated_counts(self):
+        self.create_rows(1)
+        site = DistributionSite.objects.get()
+        VolunteerSignUp.objects.filter(last_name='Lee0', email__startswith='pat0x').update(status='inactive')
+        response = self.client.get(self.changelist_url(DistributionSite))
+        self.assertContains(response, '<td class="field-volunteer_count">1</td>', html=True)
+        self.assertEqual(site.volunteers.count(), 2)
+        response = self.client.get(self.changelist_url(PartnerOrganization))
+        self.assertContains(response, '<td class="field-contact_count">1</td>', html=True)
+
+    def test_filtered_large_changelist_skips_full_count(self):
+        self.create_rows(2)
+        queries = self.count_queries(self.changelist_url(VolunteerSignUp) + '?status__exact=pending')
+        counts = [q['sql'] for q in queries if 'COUNT(' in q['sql'] and 'core_volunteersignup' in q['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('WHERE', counts[0])
+
+    def test_volunteer_actions_keep_exports(self):
+        response = self.client.get(self.changelist_url(VolunteerSignUp))
+        actions = [name for name, _label in response.context['action_form'].fields['action'].choices]
+        for name in ('export_selected_csv', 'export_selected_jsonl', 'assign_to_sites'):
+            self.assertIn(name, actions)
+
+
+# Every route in core/urls.py: (url name, query string, expected status and max queries as
+# anonymous, expected status and max queries as staff). Dashboard routes redirect anonymous
+# visitors to the login page (the JSON task_move answers 403). The POST-only routes are sent
+# the POST in POST_DATA: a drag-and-drop move, and a duplicate merge that redirects back to
+# the list. Staff budgets include loading the session, the staff user cache and the
+# is_active/password check of the logged-in user. Pages are measured cold (caches cleared),
+# so the budgets include filling the page cache, analytics panels and site index.
+URL_BUDGETS = [
+    ('home', '', 200, 5, 200, 7),
+    ('about', '', 200, 0, 200, 3),
+    ('events_list', '', 200, 3, 200, 5),
+    ('event_detail', '', 200, 2, 200, 5),
+    ('how_it_works', '', 200, 0, 200, 3),
+    ('impact', '', 200, 4, 200, 7),
+    ('impact_series', '', 200, 1, 200, 1),
+    ('impact_series', '?period=day&points=365', 200, 1, 200, 1),
+    ('sites_near', '?q=55104', 200, 1, 200, 4),
+    ('volunteer', '', 200, 0, 200, 3),
+    ('contact', '', 200, 0, 200, 3),
+    ('dashboard', '', 302, 0, 200, 9),
+    ('analytics', '', 302, 0, 200, 8),
+    ('goal_update', '', 302, 0, 200, 4),
+    ('event_create', '', 302, 0, 200, 3),
+    ('event_edit', '', 302, 0, 200, 4),
+    ('event_delete', '', 302, 0, 200, 4),
+    ('volunteer_list', '', 302, 0, 200, 6),
+    ('volunteer_list', '?q=lee', 302, 0, 200, 9),
+    ('duplicate_list', '', 302, 0, 200, 5),
+    ('duplicate_resolve', '', 302, 0, 302, 14),
+    ('contact_list', '', 302, 0, 200, 5),
+    ('kanban', '', 302, 0, 200, 4),
+    ('task_create', '', 302, 0, 200, 3),
+    ('task_edit', '', 302, 0, 200, 4),
+    ('task_delete', '', 302, 0, 200, 4),
+    ('task_move', '', 403, 0, 200, 8),
+]
+POST_DATA = {
+    'duplicate_resolve': {'action': 'keep_first'},
+    'task_move': {'status': 'done'},
+}
+# Wall-clock budget per request; generous, to catch accidental O(n) work rather than noise
+MAX_MS = 500
+SLOW_ROUTES_MAX_MS = {'analytics': 2000}
+PUBLIC_MIDDLEWARE = [m for m in settings.MIDDLEWARE if m != 'core.middleware.ComingSoonMiddleware']
+
+
+@override_settings(MIDDLEWARE=PUBLIC_MIDDLEWARE)
+class URLBudgetTests(TestCase):
+    """
+    Every core URL, as an anonymous visitor (with the site launched, i.e. without the
+    Coming Soon page) and as staff, stays within its query and time budget on realistic data.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(1)
+        User = get_user_model()
+        cls.staff = User.objects.create_superuser('staff', 'staff@example.com', 'password')
+        helpers = [User.objects.create_user(f'helper{i}', is_staff=True) for i in range(5)]
+        today = timezone.localdate()
+        FundraisingGoal.objects.create(goal_title='Spring drive', target_amount=Decimal('50000'))
+        events = Event.objects.bulk_create(
+            Event(
+                title=f'Event {i}', date=timezone.now() + timedelta(days=i - 30), venue_name='Hall',
+                venue_address='1 Main St', city_state='Duluth, MN', description='Community dinner',
+                is_published=i % 3 != 0,
+            )
+            for i in range(60)
+        )
+        cities = ['Duluth, MN', 'Saint Paul, MN', 'Minneapolis, MN', 'Rochester, MN', 'Bemidji, MN']
+        sites = [
+            DistributionSite.objects.create(
+                name=f'Site {i}', address=f'{i} Main St', city_state=cities[i % len(cities)],
+                region=['tc', 'gmn', ''][i % 3], capacity_volunteers=20,
+            )
+            for i in range(40)
+        ]
+        volunteers = VolunteerSignUp.objects.bulk_create(
+            VolunteerSignUp(
+                first_name=f'Pat{i % 50}', last_name=f'Lee{i}', email=f'pat{i}@example.com', region=['tc', 'gmn'][i % 2],
+                zip_code='55104', latitude=44.95, longitude=-93.09, availability='Weekends', notes='',
+                site=sites[i % 40] if i % 4 == 0 else None, status='assigned' if i % 4 == 0 else 'pending',
+            )
+            for i in range(1000)
+        )
+        DuplicateCandidate.objects.bulk_create(
+            DuplicateCandidate(first=volunteers[i], second=volunteers[i + 1], score=0.8, reasons='name')
+            for i in range(0, 60, 2)
+        )
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name=f'Sam {i}', email=f'sam{i}@example.com', subject='Question', message='Hello')
+            for i in range(300)
+        )
+        ImpactUpdate.objects.bulk_create(
+            ImpactUpdate(amount_raised=Decimal(100 * i), meals_funded=10 * i, volunteers=i, updated_by=cls.staff)
+            for i in range(10)
+        )
+        Donation.objects.bulk_create(
+            Donation(
+                amount=Decimal(rng.randint(5, 500)), received_at=today - timedelta(days=rng.randint(0, 700)),
+                source=rng.choice(['check', 'online', 'cash']), recorded_by=cls.staff,
+            )
+            for _ in range(2000)
+        )
+        MealKitDistribution.objects.bulk_create(
+            MealKitDistribution(
+                distribution_date=today - timedelta(days=rng.randint(0, 700)), site=rng.choice(sites),
+                meal_kits_count=rng.randint(10, 200), recorded_by=cls.staff,
+            )
+            for _ in range(500)
+        )
+        FoodOrder.objects.bulk_create(
+            FoodOrder(
+                order_date=today - timedelta(days=rng.randint(0, 700)), supplier=f'Supplier {rng.randint(1, 12)}',
+                description='Rice and beans', total_cost=Decimal(rng.randint(100, 5000)), site=rng.choice(sites),
+                status=rng.choice(['ordered', 'received', 'cancelled']), ordered_by=cls.staff,
+            )
+            for _ in range(300)
+        )
+        for i in range(30):
+            partner = PartnerOrganization.objects.create(name=f'Partner {i}')
+            PartnerContact.objects.bulk_create(PartnerContact(partner=partner, name=f'Contact {j}') for j in range(2))
+        rank = ''
+        tasks = []
+        for i in range(120):
+            rank = rank_between(rank, '')
+            tasks.append(Task(
+                title=f'Task {i}', status=['backlog', 'to_do', 'in_progress', 'done'][i % 4], rank=rank,
+                assigned_to=helpers[i % 5] if i % 3 else None, created_by=cls.staff,
+            ))
+        Task.objects.bulk_create(tasks)
+        rebuild_rollups()
+        cls.kwargs = {
+            'event_detail': {'pk': events[-1].pk}, 'event_edit': {'pk': events[-1].pk},
+            'event_delete': {'pk': events[-1].pk}, 'task_edit': {'pk': tasks[0].pk},
+            'task_delete': {'pk': tasks[0].pk}, 'task_move': {'pk': tasks[0].pk},
+            'duplicate_resolve': {'pk': DuplicateCandidate.objects.first().pk},
+        }
+
+    def url(self, name, query):
+        return reverse(f'core:{name}', kwargs=self.kwargs.get(name)) + query
+
+    def check_budget(self, name, query, status, max_queries, who):
+        url = self.url(name, query)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if name in POST_DATA:
+                response = self.client.post(url, POST_DATA[name])
+            else:
+                response = self.client.get(url)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        self.assertEqual(response.status_code, status, f'{url} as {who}')
+        max_ms = SLOW_ROUTES_MAX_MS.get(name, MAX_MS)
+        if len(queries) > max_queries or elapsed_ms > max_ms:
+            listing = '\n'.join(
+                f'  {i}. ({q["time"]}s) {q["sql"]}' for i, q in enumerate(queries.captured_queries, start=1)
+            )
+            self.fail(
+                f'{url} as {who}: {len(queries)} queries (budget {max_queries}), '
+                f'{elapsed_ms:.0f} ms (budget {max_ms} ms)\n{listing}'
+            )
+
+    def test_every_route_has_a_budget(self):
+        routes = {pattern.name for pattern in core_urls.urlpatterns}
+        self.assertEqual(routes - {name for name, *_ in URL_BUDGETS}, set())
+
+    def test_anonymous_budgets(self):
+        for name, query, status, max_queries, *_staff in URL_BUDGETS:
+            with self.subTest(url=name, query=query):
+                self.check_budget(name, query, status, max_queries, 'anonymous')
+
+    def test_staff_budgets(self):
+        self.client.force_login(self.staff)
+        self.client.get(self.url('dashboard', ''))  # load the session and staff cache once
+        for name, query, _status, _max, status, max_queries in URL_BUDGETS:
+            with self.subTest(url=name, query=query):
+                self.check_budget(name, query, status, max_queries, 'staff')
+
+    @override_settings(MIDDLEWARE=settings.MIDDLEWARE)
+    def test_coming_soon_page_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url('home', ''))
+        self.assertContains(response, 'Coming Soon')
+
+
+class CursorPaginationTests(TestCase):
+    """Cursor tokens page through keyset and offset results; bad or crafted tokens show page one."""
+
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        cls.messages = ContactMessage.objects.bulk_create(
+            ContactMessage(name=f'Sam {i}', email='sam@example.com', subject='Hi', message='Hello')
+            for i in range(25)
+        )
+        for i, message in enumerate(cls.messages):
+            # Pairs share a timestamp, so ties are broken by id
+            ContactMessage.objects.filter(pk=message.pk).update(submitted_at=start - timedelta(minutes=i // 2))
+        cls.newest_first = list(ContactMessage.objects.order_by('-submitted_at', '-pk').values_list('pk', flat=True))
+
+    def paginator(self):
+        return CursorPaginator(ContactMessage.objects.all(), 10)
+
+    def pks(self, page):
+        return [obj.pk for obj in page]
+
+    def test_keyset_round_trip(self):
+        first = self.paginator().page(None)
+        self.assertEqual(self.pks(first), self.newest_first[:10])
+        self.assertFalse(first.has_previous())
+        second = self.paginator().page(first.next_cursor)
+        self.assertEqual(self.pks(second), self.newest_first[10:20])
+        third = self.paginator().page(second.next_cursor)
+        self.assertEqual(self.pks(third), self.newest_first[20:])
+        self.assertFalse(third.has_next())
+        self.assertEqual(self.pks(self.paginator().page(third.previous_cursor)), self.newest_first[10:20])
+        self.assertEqual(self.pks(self.paginator().page(second.previous_cursor)), self.newest_first[:10])
+
+    def test_offset_round_trip(self):
+        paginator = CursorPaginator(list(range(25)), 10)
+        first = paginator.page(None)
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+        self.assertEqual((list(first), list(second), list(third)), (list(range(10)), list(range(10, 20)), list(range(20, 25))))
+        self.assertFalse(third.has_next())
+        self.assertEqual(list(paginator.page(third.previous_cursor)), list(range(10, 20)))
+
+    def test_malformed_tokens_show_first_page(self):
+        iso = timezone.now().isoformat()
+        tokens = ['garbage', '!!!', encode_cursor([1, 2])] + [
+            encode_cursor(payload) for payload in (
+                {'d': 'n', 'k': {}}, {'d': 'n', 'k': []}, {'d': 'n', 'k': [iso]}, {'d': 'p', 'k': [iso, 'x']},
+                {'d': 'n', 'k': [iso, True]}, {'d': 'n', 'k': ['yesterday', 1]}, {'d': 'n', 'k': [1, 2]},
+            )
+        ]
+        for token in tokens:
+            with self.subTest(token=token):
+                self.assertEqual(self.pks(self.paginator().page(token)), self.newest_first[:10])
+        offsets = CursorPaginator(list(range(25)), 10)
+        for payload in ({'o': 1e999}, {'o': -5}, {'o': '3'}, {'o': True}, {'o': [1]}, {'o': 2.5}):
+            with self.subTest(payload=payload):
+                self.assertEqual(list(offsets.page(encode_cursor(payload))), list(range(10)))
+
+    def test_crafted_cursor_on_list_page(self):
+        self.client.force_login(get_user_model().objects.create_user('staff', is_staff=True))
+        url = reverse('core:contact_list')
+        for payload in ({'d': 'n', 'k': {}}, {'o': 1e999}):
+            with self.subTest(payload=payload):
+                response = self.client.get(url, {'cursor': encode_cursor(payload)})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([m.pk for m in response.context['contacts']], self.newest_first[:20])
+
+
+class VolunteerSearchIndexTests(TestCase):
+    """The search index follows sign-ups after every migration (SQLite rebuilds drop its triggers)."""
+
+    def test_search_finds_created_updated_and_deleted_sign_ups(self):
+        volunteer = VolunteerSignUp.objects.create(
+            first_name='Winona', last_name='Oxendine', email='winona@example.com', region='gmn',
+        )
+        self.assertEqual(search_volunteer_ids('oxendine'), [volunteer.pk])
+        volunteer.last_name = 'Quillback'
+        volunteer.save()
+        self.assertEqual(search_volunteer_ids('oxendine'), [])
+        self.assertEqual(search_volunteer_ids('quillback'), [volunteer.pk])
+        volunteer.delete()
+        self.assertEqual(search_volunteer_ids('quillback'), [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 triggers')
+    def test_migrations_leave_triggers_in_place(self):
+        self.assertEqual(missing_sqlite_fts_triggers(), [])
+        check_sqlite_fts_triggers()
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 triggers')
+    def test_check_fails_when_a_trigger_is_missing(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER core_volunteersignup_fts_ai')  # rolled back with the test
+        with self.assertRaisesMessage(ImproperlyConfigured, 'core_volunteersignup_fts_ai'):
+            check_sqlite_fts_triggers()
+
+    def test_ranked_results_index_like_a_list(self):
+        volunteers = [
+            VolunteerSignUp.objects.create(first_name='Pat', last_name=f'Lee{i}', email=f'p{i}@example.com', region='tc')
+            for i in range(3)
+        ]
+        results = RankedResults([v.pk for v in volunteers])
+        self.assertEqual(results[0], volunteers[0])
+        self.assertEqual(results[-1], volunteers[2])
+        self.assertEqual(results[-3], volunteers[0])
+        self.assertEqual(results[1:], volunteers[1:])
+        for index in (3, -4):
+            with self.assertRaises(IndexError):
+                results[index]
+
+    def test_truncated_search_is_flagged_on_the_list_page(self):
+        for i in range(4):
+            VolunteerSignUp.objects.create(first_name='Winona', last_name=f'Lee{i}', email=f'w{i}@example.com', region='tc')
+        self.assertFalse(search_volunteers('winona', limit=4).truncated)
+        results = search_volunteers('winona', limit=3)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(results.truncated)
+
+        self.client.force_login(get_user_model().objects.create(username='staff', is_staff=True))
+        url = reverse('core:volunteer_list')
+        with mock.patch('core.views.search_volunteers', lambda q: search_volunteers(q, limit=3)):
+            self.assertContains(self.client.get(url, {'q': 'winona'}), 'Showing the 3 best matches')
+        self.assertNotContains(self.client.get(url, {'q': 'winona'}), 'best matches')
+
+
+class TaskRankTests(TestCase):
+    """Kanban order: lexicographic ranks, single-row reorders, moved cards land at the bottom."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user('staff', is_staff=True)
+        cls.todo = [Task.objects.create(title=f'To do {i}', status='to_do') for i in range(4)]
+        cls.done = [Task.objects.create(title=f'Done {i}', status='done') for i in range(3)]
+
+    def column(self, status):
+        return list(Task.objects.filter(status=status).order_by(*TASK_ORDERING).values_list('title', flat=True))
+
+    def test_rank_between(self):
+        pairs = [('', ''), ('', 'i'), ('i', ''), ('a', 'b'), ('a', 'a1'), ('az', 'b'), ('a0001', 'a0002'), ('zzz', '')]
+        for before, after in pairs:
+            with self.subTest(before=before, after=after):
+                rank = rank_between(before, after)
+                self.assertFalse(rank.endswith('0'))
+                self.assertLess(before, rank)
+                if after:
+                    self.assertLess(rank, after)
+        with self.assertRaises(ValueError):
+            rank_between('b', 'a')
+
+    def test_repeated_inserts_stay_ordered(self):
+        ranks = ['a', 'b']
+        for _ in range(50):  # always between the first two: the worst case for length
+            ranks.insert(1, rank_between(ranks[0], ranks[1]))
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_spaced_ranks(self):
+        for count in (0, 1, 2, 35, 36, 1000):
+            with self.subTest(count=count):
+                ranks = spaced_ranks(count)
+                self.assertEqual(len(ranks), count)
+                self.assertEqual(ranks, sorted(set(ranks)))
+                self.assertTrue(all(rank and not rank.endswith('0') for rank in ranks))
+        self.assertLessEqual(max(map(len, spaced_ranks(1000))), 3)
+
+    def test_new_tasks_go_to_the_bottom(self):
+        self.assertEqual(self.column('to_do'), [f'To do {i}' for i in range(4)])
+
+    def test_reorder_writes_one_row(self):
+        task = Task.objects.get(pk=self.todo[3].pk)
+        with CaptureQueriesContext(connection) as queries:
+            move_task(task, above_id=self.todo[0].pk, below_id=self.todo[1].pk)
+        writes = [q['sql'] for q in queries if q['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))]
+        self.assertEqual(len(writes), 1)
+        self.assertIn(f'WHERE "core_task"."id" = {task.pk}', writes[0])
+        self.assertEqual(self.column('to_do'), ['To do 0', 'To do 3', 'To do 1', 'To do 2'])
+
+    def test_status_change_without_rank_goes_to_the_bottom(self):
+        # The first card of one column may carry a rank that sorts first in another
+        task = Task.objects.get(pk=self.todo[0].pk)
+        task.status = 'done'
+        task.save()
+        self.assertEqual(self.column('done'), ['Done 0', 'Done 1', 'Done 2', 'To do 0'])
+
+    def test_task_form_and_board_moves_go_to_the_bottom(self):
+        self.client.force_login(self.staff)
+        task = self.todo[0]
+        response = self.client.post(reverse('core:task_edit', args=[task.pk]), {'title': task.title, 'status': 'done'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.column('done')[-1], 'To do 0')
+        self.client.post(reverse('core:kanban'), {'task_id': self.todo[1].pk, 'status': 'done'})
+        self.assertEqual(self.column('done')[-2:], ['To do 0', 'To do 1'])
+
+    def test_explicit_rank_is_kept_on_status_change(self):
+        task = Task.objects.get(pk=self.todo[2].pk)
+        task.status, task.rank = 'done', rank_between('', Task.objects.get(pk=self.done[0].pk).rank)
+        task.save()
+        self.assertEqual(self.column('done')[0], 'To do 2')
+
+
+class PageCacheTests(TestCase):
+    """Public page caching and conditional GETs."""
+
+    def test_page_cache_is_invalidated_after_commit(self):
+        for create in (
+            lambda: Event.objects.create(
+                title='Dinner', date=timezone.now(), venue_name='Hall', venue_address='1 Main St',
+                city_state='Duluth, MN', description='',
+            ),
+            lambda: FundraisingGoal.objects.create(goal_title='Drive', target_amount=Decimal('1000')),
+            lambda: Donation.objects.create(amount=Decimal('25'), received_at=date(2026, 1, 15)),
+        ):
+            with self.subTest(create=create):
+                with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                    create()
+                    # A page cached now, before commit, would show the old data under this version
+                    version = get_page_cache_version()
+                self.assertTrue(callbacks)
+                self.assertNotEqual(get_page_cache_version(), version)
+
+    @override_settings(MIDDLEWARE=PUBLIC_MIDDLEWARE)
+    def test_staff_etag_changes_with_each_login(self):
+        staff = get_user_model().objects.create_user('staff', is_staff=True)
+        url = reverse('core:home')
+        self.client.force_login(staff)
+        self.client.get(url)  # sets the CSRF cookie, as the login page would
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.logout()
+        self.client.force_login(staff)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Last-Modified'))
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    @override_settings(MIDDLEWARE=PUBLIC_MIDDLEWARE)
+    def test_visitor_etag_is_stable(self):
+        url = reverse('core:home')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_conditional_views_must_define_validators(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'NoValidatorsView'):
+            type('NoValidatorsView', (ConditionalGetMixin, TemplateView), {})
+
+
+class RunningTotalsTests(TestCase):
+    """Saves and deletes keep the active goal's totals and the impact rollups exact."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.goal = FundraisingGoal.objects.create(goal_title='Drive', target_amount=Decimal('10000'))
+        cls.site = DistributionSite.objects.create(name='Hall', city_state='Duluth, MN')
+
+    def assert_totals(self, amount, meals, volunteers):
+        goal = FundraisingGoal.objects.get(pk=self.goal.pk)
+        self.assertEqual((goal.current_amount, goal.meals_funded, goal.volunteers_count), (Decimal(amount), meals, volunteers))
+        # The incrementally maintained rollups match a rebuild from the source tables
+        rows = ImpactRollup.objects.exclude(amount_raised=0, meals_funded=0, volunteers=0)
+        incremental = set(rows.values_list('period', 'start', 'amount_raised', 'meals_funded', 'volunteers'))
+        rebuild_rollups()
+        self.assertEqual(set(rows.values_list('period', 'start', 'amount_raised', 'meals_funded', 'volunteers')), incremental)
+
+    def test_donations(self):
+        donation = Donation.objects.create(amount=Decimal('25.50'), received_at=date(2026, 1, 15))
+        self.assert_totals('25.50', 0, 0)
+        self.assertEqual(ImpactRollup.objects.get(period='week', start=date(2026, 1, 12)).amount_raised, Decimal('25.50'))
+        donation.amount, donation.received_at = Decimal('40'), date(2026, 2, 2)
+        donation.save()
+        self.assert_totals('40', 0, 0)
+        self.assertFalse(ImpactRollup.objects.filter(period='day', start=date(2026, 1, 15)).exclude(amount_raised=0).exists())
+        Donation.objects.create(amount=Decimal('10'), received_at=date(2026, 2, 2))
+        donation.delete()
+        self.assert_totals('10', 0, 0)
+
+    def test_distributions(self):
+        distribution = MealKitDistribution.objects.create(
+            distribution_date=date(2026, 3, 1), site=self.site, meal_kits_count=120,
+        )
+        self.assert_totals('0', 120, 0)
+        distribution.meal_kits_count = 80
+        distribution.save()
+        self.assert_totals('0', 80, 0)
+        distribution.delete()
+        self.assert_totals('0', 0, 0)
+
+    def test_volunteers(self):
+        volunteer = VolunteerSignUp.objects.create(first_name='Ana', last_name='Cruz', email='ana@example.com', region='tc')
+        VolunteerSignUp.objects.create(first_name='Tou', last_name='Vang', email='tou@example.com', region='gmn')
+        self.assert_totals('0', 0, 2)
+        volunteer.status = 'inactive'
+        volunteer.save()
+        self.assert_totals('0', 0, 1)
+        volunteer.status = 'assigned'
+        volunteer.save()
+        self.assert_totals('0', 0, 2)
+        volunteer.delete()
+        self.assert_totals('0', 0, 1)
+
+    def test_deferred_and_unrelated_saves(self):
+        donation = Donation.objects.create(amount=Decimal('30'), received_at=date(2026, 1, 15))
+        deferred = Donation.objects.only('note').get(pk=donation.pk)
+        deferred.note = 'Thank-you card sent'
+        deferred.save()
+        self.assert_totals('30', 0, 0)
+        deferred = Donation.objects.only('note').get(pk=donation.pk)
+        deferred.delete()
+        self.assert_totals('0', 0, 0)
+
+    def test_loaded_rows_apply_only_their_change(self):
+        Donation.objects.create(amount=Decimal('30'), received_at=date(2026, 1, 15))
+        with mock.patch('core.totals.contribution', wraps=totals.contribution) as spy:
+            donation = Donation.objects.get()
+            list(Donation.objects.all())
+        spy.assert_not_called()  # loading rows costs nothing extra, only saving does
+        donation.amount = Decimal('45')
+        donation.save()
+        donation.amount = Decimal('50')
+        donation.save()
+        self.assert_totals('50', 0, 0)
+
+    def test_page_cache_is_invalidated_once_per_save(self):
+        for save in (
+            lambda: Donation.objects.create(amount=Decimal('25'), received_at=date(2026, 1, 15)),
+            lambda: MealKitDistribution.objects.create(distribution_date=date(2026, 3, 1), site=self.site, meal_kits_count=5),
+            lambda: VolunteerSignUp.objects.create(first_name='Ana', last_name='Cruz', email='ana@example.com', region='tc'),
+        ):
+            with self.subTest(save=save):
+                version = get_page_cache_version()
+                with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                    save()
+                    self.assertEqual(get_page_cache_version(), version)  # not before commit
+                self.assertEqual(callbacks.count(invalidate_page_cache), 1)
+                self.assertNotEqual(get_page_cache_version(), version)
+
+    def test_only_one_goal_can_be_active(self):
+        second = FundraisingGoal(goal_title='Fall drive', target_amount=Decimal('5000'))
+        with self.assertRaisesMessage(ValidationError, 'already active'):
+            second.full_clean()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            second.save()
+        FundraisingGoal.objects.create(goal_title='Old drive', target_amount=Decimal('5000'), is_active=False)
+
+    def test_dry_run_keeps_the_checkpoint(self):
+        Donation.objects.create(amount=Decimal('30'), received_at=date(2026, 1, 15))
+        FundraisingGoal.objects.update(current_amount=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / 'totals.json'
+            call_command('recompute_totals', checkpoint=str(checkpoint), dry_run=True, stdout=io.StringIO())
+            self.assertFalse(checkpoint.exists())
+            checkpoint.write_text('{}')
+            call_command('recompute_totals', checkpoint=str(checkpoint), dry_run=True, stdout=io.StringIO())
+            self.assertEqual(checkpoint.read_text(), '{}')
+        self.assertEqual(FundraisingGoal.objects.get().current_amount, 0)
+
+
+class TaskMoveViewTests(TestCase):
+    """The drag-and-drop endpoint applies moves and refuses ones based on a stale card."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user('staff', is_staff=True)
+        cls.task = Task.objects.create(title='Call site host', status='to_do')
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+        self.url = reverse('core:task_move', args=[self.task.pk])
+
+    def test_move_returns_the_new_card(self):
+        loaded = Task.objects.get(pk=self.task.pk).updated_at.isoformat()
+        response = self.client.post(self.url, {'status': 'done', 'assigned_to': self.staff.pk, 'updated_at': loaded})
+        self.assertEqual(response.status_code, 200)
+        card = response.json()['task']
+        self.assertEqual((card['status'], card['assigned_to']), ('done', self.staff.pk))
+        self.assertNotEqual(card['updated_at'], loaded)
+
+    def test_stale_updated_at_returns_409(self):
+        stale = Task.objects.get(pk=self.task.pk).updated_at.isoformat()
+        self.client.post(self.url, {'status': 'in_progress', 'updated_at': stale})
+        response = self.client.post(self.url, {'status': 'done', 'updated_at': stale})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['task']['status'], 'in_progress')
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, 'in_progress')
+
+    def test_invalid_input_returns_400(self):
+        for data in ({'status': 'archived'}, {'assigned_to': 999999}):
+            with self.subTest(data=data):
+                self.assertEqual(self.client.post(self.url, data).status_code, 400)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, 'to_do')
+
+
+@override_settings(MIDDLEWARE=PUBLIC_MIDDLEWARE, RATELIMIT_ENABLED=True, RATELIMIT_RATES={})
+class RateLimitTests(TestCase):
+    """Public form POSTs beyond the per-IP or per-e-mail rate get 429 without touching the database."""
+
+    def setUp(self):
+        cache.clear()
+
+    def contact(self, i, ip='203.0.113.7'):
+        data = {'name': 'Sam', 'email': f'sam{i}@example.com', 'subject': 'Hi', 'message': 'Hello'}
+        return self.client.post(reverse('core:contact'), data, HTTP_X_REAL_IP=ip)
+
+    def volunteer(self, ip):
+        data = {'first_name': 'Ana', 'last_name': 'Cruz', 'email': 'Ana@Example.com', 'region': 'tc'}
+        return self.client.post(reverse('core:volunteer'), data, HTTP_X_REAL_IP=ip)
+
+    def test_ip_limit(self):
+        for i in range(5):
+            self.assertEqual(self.contact(i).status_code, 302)
+        with self.assertNumQueries(0):
+            response = self.contact(5)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '120')
+        self.assertEqual(ContactMessage.objects.count(), 5)
+        self.assertEqual(self.contact(6, ip='198.51.100.2').status_code, 302)
+
+    def test_email_limit_across_ips(self):
+        for i in range(3):
+            self.assertEqual(self.volunteer(f'198.51.100.{i}').status_code, 302)
+        with self.assertNumQueries(0):
+            response = self.volunteer('198.51.100.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(VolunteerSignUp.objects.count(), 3)
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_disabled(self):
+        for i in range(7):
+            self.assertEqual(self.contact(i).status_code, 302)
+        self.assertEqual(ContactMessage.objects.count(), 7)
+
+
+class AssignmentPlanTests(TestCase):
+    """plan_assignments fills only active sites with room, in the volunteer's region or open to any."""
+
+    def volunteer(self, region, **kwargs):
+        return VolunteerSignUp.objects.create(
+            first_name='Vol', last_name=f'{region}{VolunteerSignUp.objects.count()}',
+            email=f'vol{VolunteerSignUp.objects.count()}@example.com', region=region, **kwargs,
+        )
+
+    def test_capacity_and_region(self):
+        metro = DistributionSite.objects.create(name='Metro', city_state='St Paul, MN', region='tc', capacity_volunteers=2)
+        north = DistributionSite.objects.create(name='North', city_state='Duluth, MN', region='gmn', capacity_volunteers=5)
+        anywhere = DistributionSite.objects.create(name='Anywhere', city_state='Mankato, MN', capacity_volunteers=1)
+        closed = DistributionSite.objects.create(
+            name='Closed', city_state='St Paul, MN', region='tc', capacity_volunteers=5, is_active=False,
+        )
+        DistributionSite.objects.create(name='No room', city_state='St Paul, MN', region='tc', capacity_volunteers=0)
+        self.volunteer('tc', site=metro, status='assigned')
+        self.volunteer('tc', site=metro, status='inactive')  # doesn't take up room
+        tc = [self.volunteer('tc') for _ in range(3)]
+        gmn = self.volunteer('gmn')
+
+        plan = plan_assignments()
+        planned = {load.site.name: load.volunteer_ids for load in plan.sites}
+        self.assertEqual(list(planned), ['Anywhere', 'Metro', 'No room', 'North'])
+        self.assertEqual(planned['No room'], [])  # listed as full
+        self.assertEqual(planned['North'], [gmn.pk])
+        self.assertEqual(len(planned['Metro']), 1)
+        self.assertEqual(len(planned['Anywhere']), 1)
+        self.assertTrue(set(planned['Metro'] + planned['Anywhere']) < {v.pk for v in tc})
+        self.assertEqual(plan.unplaced, {'tc': 1})
+
+        self.assertEqual(apply_plan(plan), 3)
+        for site in (metro, north, anywhere):
+            self.assertLessEqual(site.volunteers.exclude(status='inactive').count(), site.capacity_volunteers)
+        self.assertFalse(closed.volunteers.exists())
+        self.assertEqual(VolunteerSignUp.objects.filter(status='pending').count(), 1)
+        self.assertEqual(plan_assignments().assigned, 0)
+
+    def test_distance_and_overflow(self):
+        DistributionSite.objects.create(name='Duluth Hall', city_state='Duluth, MN', region='gmn', capacity_volunteers=1)
+        DistributionSite.objects.create(name='Mankato Hall', city_state='Mankato, MN', region='gmn', capacity_volunteers=5)
+        DistributionSite.objects.create(name='Rochester Hall', city_state='Rochester, MN', region='gmn', capacity_volunteers=5)
+        near_duluth = [self.volunteer('gmn', zip_code='55802') for _ in range(3)]
+        near_mankato = self.volunteer('gmn', zip_code='56001')
+        no_zip = self.volunteer('gmn')
+
+        with mock.patch('core.assignment.NEAREST_SITES', 1):
+            plan = plan_assignments()
+        planned = {load.site.name: load.volunteer_ids for load in plan.sites}
+        # Nearest site first, earliest sign-up first within a ZIP area
+        self.assertEqual(planned['Duluth Hall'], [near_duluth[0].pk])
+        self.assertIn(near_mankato.pk, planned['Mankato Hall'])
+        # Duluth Hall is full and it is the only direct link: the rest go through the overflow node
+        self.assertEqual(plan.unplaced, {})
+        self.assertEqual(
+            sorted(planned['Mankato Hall'] + planned['Rochester Hall']),
+            sorted([near_duluth[1].pk, near_duluth[2].pk, near_mankato.pk, no_zip.pk]),
+        )
+
+        DistributionSite.objects.filter(name='Duluth Hall').update(capacity_volunteers=3)
+        planned = {load.site.name: load.volunteer_ids for load in plan_assignments().sites}
+        self.assertEqual(planned['Duluth Hall'], [v.pk for v in near_duluth])
+
+
+class DuplicateTests(TestCase):
+    """find_duplicates pairs re-submitted sign-ups; merge_volunteers keeps one and moves the other's pairs."""
+
+    def volunteer(self, first_name, last_name, email, phone='', **kwargs):
+        return VolunteerSignUp.objects.create(
+            first_name=first_name, last_name=last_name, email=email, phone=phone, region='tc', **kwargs,
+        )
+
+    def test_find_duplicates(self):
+        ana = self.volunteer('Ana', 'Cruz', 'ana.cruz@gmail.com', '612-555-0100')
+        ana_again = self.volunteer('Anna', 'Cruz', 'AnaCruz+food@googlemail.com')
+        ana_phone = self.volunteer('Ana', 'Cruz', 'ana@example.org', '+1 (612) 555-0100')
+        ana_typo = self.volunteer('Ana', 'Cruz', 'anacruz@gmial.com')
+        self.volunteer('Tou', 'Vang', 'tou@example.com', '651-555-0199')
+        self.volunteer('Ana', 'Cruz', 'someone.else@example.com')  # same name only
+
+        found = {(first, second): reasons for first, second, _score, reasons in find_duplicates()}
+        self.assertEqual(set(found), {
+            (ana.pk, ana_again.pk), (ana.pk, ana_phone.pk), (ana.pk, ana_typo.pk), (ana_again.pk, ana_typo.pk),
+        })
+        self.assertEqual(found[ana.pk, ana_again.pk], 'email, name')
+        self.assertEqual(found[ana.pk, ana_phone.pk], 'phone, name')
+        self.assertEqual(found[ana.pk, ana_typo.pk], 'name')
+        self.assertEqual(
+            {pair[:2] for pair in find_duplicates(volunteer_ids=[ana_phone.pk])}, {(ana.pk, ana_phone.pk)},
+        )
+
+        self.assertEqual(save_candidates(find_duplicates()), 4)
+        self.assertEqual(save_candidates(find_duplicates()), 0)
+
+    def test_merge_moves_pairs(self):
+        site = DistributionSite.objects.create(name='Hall', city_state='Duluth, MN', capacity_volunteers=5)
+        keep = self.volunteer('Ana', 'Cruz', 'ana@example.com', notes='Mornings')
+        other = self.volunteer(
+            'Ana', 'Cruz', 'Ana@Example.com', '612-555-0100', zip_code='55104', notes='Has a van',
+            site=site, status='assigned',
+        )
+        third = self.volunteer('Anna', 'Cruz', 'anna@example.com')
+        fourth = self.volunteer('Ann', 'Cruz', 'ann@example.com')
+        candidate = DuplicateCandidate.objects.create(first=keep, second=other, score=1, reasons='email, name')
+        moved = DuplicateCandidate.objects.create(first=other, second=third, score=0.7, reasons='name', status='dismissed')
+        DuplicateCandidate.objects.create(first=keep, second=fourth, score=0.7, reasons='name')
+        DuplicateCandidate.objects.create(first=other, second=fourth, score=0.8, reasons='name')  # keep has it already
+        Job.objects.all().delete()
+
+        merge_volunteers(candidate, keep)
+        keep.refresh_from_db()
+        self.assertFalse(VolunteerSignUp.objects.filter(pk=other.pk).exists())
+        self.assertEqual((keep.phone, keep.zip_code), ('612-555-0100', '55104'))
+        self.assertEqual(keep.notes, 'Mornings\nHas a van')
+        self.assertEqual((keep.site, keep.status), (site, 'assigned'))
+        self.assertEqual(
+            set(DuplicateCandidate.objects.values_list('first', 'second', 'status')),
+            {(keep.pk, third.pk, 'dismissed'), (keep.pk, fourth.pk, 'open')},
+        )
+        self.assertTrue(DuplicateCandidate.objects.filter(pk=moved.pk).exists())
+        self.assertEqual(
+            list(Job.objects.values_list('name', 'payload')), [('find_volunteer_duplicates', {'volunteer_ids': [keep.pk]})],
+        )
+        with self.assertRaises(ValueError):
+            merge_volunteers(DuplicateCandidate.objects.get(pk=moved.pk), fourth)
+
+
+class SelfHostedAssetTests(TestCase):
+    """The built assets are used by default, with the CDNs as a fallback until build_assets has run."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dist = Path(tmp.name)
+        patcher = mock.patch('core.templatetags.core_assets.DIST_DIR', self.dist)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_falls_back_to_cdn_before_build(self):
+        self.assertEqual(vendor_url('bootstrap.min.css'), VENDOR_FILES['bootstrap.min.css'])
+        self.assertEqual(logo_url(48), '/static/core/images/logo.png')
+        self.assertNotIn('favicon.ico', favicon_links())
+
+    def test_uses_built_files(self):
+        for name in ('bootstrap.min.css', 'logo-96.png', 'favicon.ico'):
+            (self.dist / name).touch()
+        self.assertEqual(vendor_url('bootstrap.min.css'), '/static/core/dist/bootstrap.min.css')
+        self.assertEqual(logo_url(48), '/static/core/dist/logo-96.png')
+        self.assertIn('/static/core/dist/favicon.ico', favicon_links())
+        with self.settings(SELF_HOSTED_ASSETS=False):
+            self.assertEqual(vendor_url('bootstrap.min.css'), VENDOR_FILES['bootstrap.min.css'])
+
+    def test_check_warns_about_missing_build(self):
+        with mock.patch('core.assets.DIST_DIR', self.dist), self.settings(
+            DEBUG=False, STATIC_MANIFEST=True, STATIC_ROOT=self.dist,
+        ):
+            self.assertEqual([w.id for w in check_built_assets()], ['core.W001', 'core.W002'])
+            with self.settings(DEBUG=True):
+                self.assertEqual(check_built_assets(), [])
+
+
+class StaffCacheBackendTests(TestCase):
+    """Staff sessions come from the staff cache but end on deactivation or a password change, signal or not."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user('staff', password='old password', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.staff)
+        self.url = reverse('core:about')
+
+    def assert_logged_in(self, expected):
+        self.assertEqual(self.client.get(self.url).wsgi_request.user.is_authenticated, expected)
+
+    def test_cached_user(self):
+        self.assert_logged_in(True)
+        with self.assertNumQueries(1):  # the is_active/password check; the session is cached
+            request = self.client.get(self.url).wsgi_request
+            self.assertEqual(request.user, self.staff)
+
+    def test_deactivated_with_update(self):
+        self.assert_logged_in(True)
+        get_user_model().objects.filter(pk=self.staff.pk).update(is_active=False)
+        self.assert_logged_in(False)
+
+    def test_password_changed_with_update(self):
+        self.assert_logged_in(True)
+        get_user_model().objects.filter(pk=self.staff.pk).update(password=make_password('new password'))
+        self.assert_logged_in(False)
+
+    def test_password_changed_with_save(self):
+        self.assert_logged_in(True)
+        self.staff.set_password('new password')
+        self.staff.save()
+        self.assert_logged_in(False)
+
+    def test_sessions_from_model_backend_stay_valid(self):
+        self.client.force_login(self.staff, backend='django.contrib.auth.backends.ModelBackend')
+        self.assert_logged_in(True)
+
+
+class ExportTests(TestCase):
+    """Admin exports stream the changelist's filtered rows without running its count queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.volunteers = [
+            VolunteerSignUp.objects.create(
+                first_name='Ana', last_name='Cruz', email='ana@example.com', region='tc',
+                phone='+1 612-555-0100', notes='=HYPERLINK("http://example.com")',
+            ),
+            VolunteerSignUp.objects.create(
+                first_name='Tou', last_name='Vang', email='tou@example.com', region='tc', notes='-2+3',
+            ),
+            VolunteerSignUp.objects.create(first_name='Lee', last_name='Her', email='lee@example.com', region='gmn'),
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, fmt, **params):
+        response = self.client.get(reverse('admin:core_volunteersignup_export', args=[fmt]), params)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_keeps_filters_and_escapes_formulas(self):
+        with CaptureQueriesContext(connection) as queries:
+            content = self.export('csv', region__exact='tc')
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql']])
+        self.assertTrue(content.startswith('\ufeffid,first_name,'))
+        rows = {row['email']: row for row in csv.DictReader(io.StringIO(content.lstrip('\ufeff')))}
+        self.assertEqual(set(rows), {'ana@example.com', 'tou@example.com'})
+        self.assertEqual(rows['ana@example.com']['phone'], '+1 612-555-0100')
+        self.assertEqual(rows['ana@example.com']['notes'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(rows['tou@example.com']['notes'], "'-2+3")
+
+    def test_jsonl_and_negative_amounts(self):
+        Donation.objects.create(amount=Decimal('-25.50'), received_at=date(2026, 1, 15), note='-25.50 refund')
+        response = self.client.get(reverse('admin:core_donation_export', args=['jsonl']))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['amount'], '-25.50')
+        self.assertEqual(len(self.export('jsonl', q='vang').splitlines()), 1)
+        content = self.client.get(reverse('admin:core_donation_export', args=['csv']))
+        self.assertIn(',-25.50,', b''.join(content.streaming_content).decode())
+
+    def test_export_selected_action(self):
+        response = self.client.post(reverse('admin:core_volunteersignup_changelist'), {
+            'action': 'export_selected_csv', '_selected_action': [self.volunteers[2].pk],
+        })
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode().lstrip('\ufeff'))))
+        self.assertEqual([row['email'] for row in rows], ['lee@example.com'])
+
+    def test_unknown_format_is_refused(self):
+        self.assertEqual(self.client.get(reverse('admin:core_volunteersignup_export', args=['xlsx'])).status_code, 403)
+
+
+class ImportTests(TestCase):
+    """CSV imports: dry runs, upserts on the natural key, per-row errors and the running totals."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.goal = FundraisingGoal.objects.create(goal_title='Drive', target_amount=Decimal('10000'))
+
+    def run_import(self, kind, text, **kwargs):
+        return import_records(kind, io.BytesIO(text.encode()), f'{kind}.csv', **kwargs)
+
+    def test_dry_run_saves_nothing(self):
+        result = self.run_import('donations', 'amount,received_at\n25,2026-01-15\n10,2026-01-16\n', dry_run=True)
+        self.assertEqual((result.rows, result.created, result.dry_run), (2, 2, True))
+        self.assertFalse(Donation.objects.exists())
+        self.assertFalse(ImpactRollup.objects.exists())
+        self.assertEqual(FundraisingGoal.objects.get().current_amount, 0)
+
+    def test_sites_upsert_on_name(self):
+        DistributionSite.objects.create(
+            name='Hall', address='1 Main St', city_state='Duluth, MN', capacity_meals=50, notes='Side door',
+        )
+        result = self.run_import(
+            'sites',
+            'Name,Address,City State,Capacity Meals,Is Active\n'
+            'Hall,2 Main St,"Duluth, MN",80,yes\n'
+            'Depot,9 Rail Rd,"Mankato, MN",,no\n',
+        )
+        self.assertEqual((result.created, result.updated, result.error_count), (1, 1, 0))
+        hall = DistributionSite.objects.get(name='Hall')
+        self.assertEqual((hall.address, hall.capacity_meals, hall.notes), ('2 Main St', 80, 'Side door'))
+        depot = DistributionSite.objects.get(name='Depot')
+        self.assertFalse(depot.is_active)
+        self.assertEqual(depot.capacity_meals, DistributionSite._meta.get_field('capacity_meals').get_default())
+
+    def test_volunteers_match_normalized_email(self):
+        existing = VolunteerSignUp.objects.create(first_name='Ana', last_name='Cruz', email='ana@example.com', region='tc')
+        result = self.run_import(
+            'volunteers',
+            'first_name,last_name,email,region,phone\n'
+            'Ana,Cruz,Ana+food@Example.com,tc,612-555-0100\n'
+            'Tou,Vang,tou@example.com,gmn,\n'
+            'Tou,Vang,TOU@example.com,gmn,651-555-0199\n',  # repeated key: the later row wins
+        )
+        self.assertEqual((result.created, result.updated), (1, 1))
+        existing.refresh_from_db()
+        self.assertEqual((existing.phone, existing.phone_normalized), ('612-555-0100', '6125550100'))
+        tou = VolunteerSignUp.objects.get(email_normalized='tou@example.com')
+        self.assertEqual(tou.phone, '651-555-0199')
+        self.assertEqual(FundraisingGoal.objects.get().volunteers_count, 2)
+        self.assertTrue(Job.objects.filter(name='find_volunteer_duplicates').exists())
+
+    def test_row_errors_are_reported_and_skipped(self):
+        result = self.run_import(
+            'donations',
+            'amount,received_at,source,color\n'
+            '25,2026-01-15,\n'
+            'lots,2026-01-15,\n'
+            '\n'
+            '10,not a date,check\n'
+            '5,2026-01-16,check\n',
+        )
+        self.assertEqual((result.rows, result.created, result.error_count), (4, 2, 2))
+        self.assertEqual([line for line, _message in result.errors], [3, 5])
+        self.assertIn('amount:', result.errors[0][1])
+        self.assertIn('received_at:', result.errors[1][1])
+        self.assertEqual(result.warnings, ['Ignored column(s): color'])
+        self.assertEqual(sorted(Donation.objects.values_list('source', flat=True)), ['check', 'other'])
+        with self.assertRaisesMessage(ImportFileError, 'received_at'):
+            self.run_import('donations', 'amount\n25\n')
+        with self.assertRaises(ImportFileError):
+            import_records('donations', io.BytesIO(b''), 'donations.pdf')
+
+    def test_totals_and_rollups(self):
+        Donation.objects.create(amount=Decimal('5'), received_at=date(2026, 1, 15))
+        self.run_import('donations', 'amount,received_at\n25.50,2026-01-15\n10,2026-02-02\n', batch_size=1)
+        self.assertEqual(FundraisingGoal.objects.get().current_amount, Decimal('40.50'))
+        rows = ImpactRollup.objects.exclude(amount_raised=0)
+        incremental = set(rows.values_list('period', 'start', 'amount_raised'))
+        self.assertIn(('day', date(2026, 1, 15), Decimal('30.50')), incremental)
+        rebuild_rollups()
+        self.assertEqual(set(rows.values_list('period', 'start', 'amount_raised')), incremental)
+
+
+class GeoTests(TestCase):
+    """Offline geocoding, the k-d tree and nearest-site lookups."""
+
+    def setUp(self):
+        cache.clear()  # site index version
+
+    def test_geocode(self):
+        minneapolis = (44.9778, -93.2650)
+        self.assertEqual(geocode_match('Minneapolis, MN'), (minneapolis, 'city'))
+        self.assertEqual(geocode_match('123 Main St\nMinneapolis MN 55401'), (minneapolis, 'city'))
+        self.assertEqual(geocode_match('St. Paul'), ((44.9537, -93.0900), 'city'))
+        self.assertEqual(geocode_match('55104'), ((44.95, -93.09), 'zip3'))  # only the ZIP prefix is known
+        self.assertEqual(geocode_match('Atlantis'), (None, None))
+        self.assertIsNone(geocode(''))
+
+    def test_distance(self):
+        self.assertAlmostEqual(distance_km(44.9778, -93.2650, 46.7867, -92.1005), 220.4, delta=1)
+        self.assertEqual(distance_km(45, -93, 45, -93), 0)
+
+    def test_kdtree_matches_brute_force(self):
+        rng = random.Random(3)
+        points = [(rng.uniform(43.5, 49), rng.uniform(-97, -89.5), i) for i in range(300)]
+        tree = KDTree(points)
+        for _ in range(25):
+            lat, lon = rng.uniform(43.5, 49), rng.uniform(-97, -89.5)
+            for k, accept in ((1, None), (5, None), (4, lambda i: i % 3 == 0)):
+                expected = sorted(
+                    (distance_km(lat, lon, plat, plon), i) for plat, plon, i in points if accept is None or accept(i)
+                )[:k]
+                found = tree.nearest(lat, lon, k, accept)
+                self.assertEqual([i for i, _km in found], [i for _km, i in expected])
+                for (_i, km), (expected_km, _j) in zip(found, expected):
+                    self.assertAlmostEqual(km, expected_km, places=6)
+        self.assertEqual(KDTree([]).nearest(45, -93), [])
+
+    def test_nearest_sites_follow_site_changes(self):
+        duluth = DistributionSite.objects.create(name='Duluth Hall', city_state='Duluth, MN', region='gmn')
+        DistributionSite.objects.create(name='Mankato Hall', city_state='Mankato, MN', region='gmn')
+        metro = DistributionSite.objects.create(name='Metro Hall', city_state='Saint Paul, MN', region='tc')
+        self.assertEqual((duluth.latitude, duluth.longitude), (46.7867, -92.1005))  # geocoded on save
+        here = (44.9778, -93.2650)  # Minneapolis
+        self.assertEqual([s.name for s, _km in nearest_sites(*here, k=2)], ['Metro Hall', 'Mankato Hall'])
+        self.assertEqual([s.name for s, _km in nearest_sites(*here, k=1, region='gmn')], ['Mankato Hall'])
+        with self.assertNumQueries(0):
+            nearest_sites(*here)
+        with self.captureOnCommitCallbacks(execute=True):
+            metro.is_active = False
+            metro.save()
+        self.assertEqual([s.name for s, _km in nearest_sites(*here, k=1)], ['Mankato Hall'])
+
+    def test_coordinates_set_by_hand_are_kept(self):
+        site = DistributionSite.objects.create(name='Hall', city_state='Duluth, MN')
+        DistributionSite.objects.filter(pk=site.pk).update(latitude=46.8, longitude=-92.2)
+        site = DistributionSite.objects.get(pk=site.pk)
+        site.capacity_meals = 100
+        site.save()
+        self.assertEqual((site.latitude, site.longitude), (46.8, -92.2))
+        site.city_state = 'Rochester, MN'
+        site.save()
+        self.assertEqual((site.latitude, site.longitude), (44.0121, -92.4802))
+
+    def test_sites_near_page(self):
+        DistributionSite.objects.create(name='Metro Hall', city_state='Saint Paul, MN')
+        self.client.force_login(get_user_model().objects.create(username='staff', is_staff=True))  # past Coming Soon
+        url = reverse('core:sites_near')
+        response = self.client.get(url, {'q': 'Minneapolis'})
+        self.assertContains(response, 'Metro Hall')
+        self.assertNotContains(response, 'general area')
+        self.assertContains(self.client.get(url, {'q': '55104'}), 'We only know the general area of this ZIP code')
+        self.assertContains(self.client.get(url, {'q': 'Atlantis'}), "We couldn't find")
+
+    def test_deploy_check_warns_without_zip_codes(self):
+        with mock.patch('core.geo.gazetteer', return_value={'zip': {}, 'zip3': {}, 'city': {}}):
+            self.assertEqual([w.id for w in check_gazetteer()], ['core.W003'])
+        with mock.patch('core.geo.gazetteer', return_value={'zip': {'55104': (44.95, -93.17)}, 'zip3': {}, 'city': {}}):
+            self.assertEqual(check_gazetteer(), [])
+
+
+class AnalyticsTests(TestCase):
+    """Analytics panels: correct GROUP BYs within their query budgets, cached until the data changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        north = DistributionSite.objects.create(name='North Hall', city_state='Duluth, MN')
+        south = DistributionSite.objects.create(name='South Hall', city_state='Mankato, MN')
+        day = timezone.localdate().replace(day=1)
+        for amount, source in (('100', 'check'), ('50', 'check'), ('25', 'online')):
+            Donation.objects.create(amount=Decimal(amount), received_at=day, source=source)
+        Donation.objects.create(amount=Decimal('999'), received_at=date(2000, 1, 1))  # outside the period
+        MealKitDistribution.objects.create(distribution_date=day, site=north, meal_kits_count=40, format='raw')
+        MealKitDistribution.objects.create(distribution_date=day, site=north, meal_kits_count=60, format='raw')
+        for cost, status, site in (('300', 'received', north), ('200', 'ordered', None), ('500', 'cancelled', north)):
+            FoodOrder.objects.create(
+                order_date=day, supplier='US Foods', description='Rice', total_cost=Decimal(cost), status=status, site=site,
+            )
+        FoodOrder.objects.create(order_date=day, supplier='Cub Foods', description='Beans', total_cost=None, site=south)
+        cls.day = day
+
+    def setUp(self):
+        cache.clear()
+
+    def test_panels(self):
+        panels = {panel['name']: panel['rows'] for panel in get_panels()}
+        self.assertEqual(
+            [(row['source'], row['amount'], row['count']) for row in panels['donations_by_month']],
+            [('check', Decimal('150'), 2), ('online', Decimal('25'), 1)],
+        )
+        self.assertEqual([(r['site'], r['kits'], r['count']) for r in panels['kits_by_site']], [('North Hall', 100, 2)])
+        # Cancelled and unpriced orders don't count
+        self.assertEqual([(r['supplier'], r['spend']) for r in panels['spend_by_supplier']], [('US Foods', Decimal('500'))])
+        self.assertEqual(
+            [(r['site'], r['month'], r['spend'], r['kits'], r['cost']) for r in panels['cost_per_kit']],
+            [('North Hall', self.day, Decimal('300'), 100, Decimal('3.00'))],
+        )
+
+    def test_panels_keep_their_query_budgets(self):
+        for name, (_title, _compute, budget) in PANELS.items():
+            with self.subTest(panel=name), self.assertNumQueries(budget):
+                _rows, stats = get_panel(name)
+            self.assertEqual((stats['queries'], stats['budget'], stats['cached']), (budget, budget, False))
+        with self.assertNumQueries(0):
+            get_panels()
+
+    @override_settings(DEBUG=True)
+    def test_over_budget_warns_without_failing(self):
+        with self.assertLogs('core.analytics', 'WARNING') as logs, query_budget('test panel', 0) as stats:
+            Donation.objects.count()
+        self.assertEqual(stats['queries'], 1)
+        self.assertIn('test panel: 1 queries, budget is 0', logs.output[0])
+
+    def test_changes_invalidate_and_queue_one_refresh(self):
+        get_panels()
+        with self.captureOnCommitCallbacks(execute=True):
+            for amount in ('5', '6'):
+                Donation.objects.create(amount=Decimal(amount), received_at=self.day, source='cash')
+        self.assertEqual(Job.objects.filter(name='refresh_analytics', status='queued').count(), 1)
+        refresh = jobs.claim_jobs('w1', 10)
+        self.assertEqual([job.name for job in refresh], ['refresh_analytics'])
+        with self.assertNumQueries(sum(budget for _t, _c, budget in PANELS.values()) + 1):  # + marking it done
+            self.assertTrue(jobs.run_job(refresh[0]))
+        with self.assertNumQueries(0):
+            rows, stats = get_panel('donations_by_month')
+        self.assertTrue(stats['cached'])
+        self.assertIn('cash', [row['source'] for row in rows])
+
+    def test_page(self):
+        self.client.force_login(get_user_model().objects.create(username='staff', is_staff=True))
+        response = self.client.get(reverse('core:analytics'), {'months': 12})
+        self.assertContains(response, 'Cost per kit by site and month')
+        self.assertEqual(response.context['months'], 12)
+
+
+class EventImageTests(TestCase):
+    """Event images get WebP/JPEG variants at each width and render as a <picture> with srcsets."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def create_event(self, size, mode='RGB'):
+        buf = io.BytesIO()
+        Image.new(mode, size, (200, 80, 40, 128) if mode == 'RGBA' else (200, 80, 40)).save(buf, 'PNG')
+        event = Event.objects.create(
+            title='Packing day', date=timezone.now(), venue_name='Hall', venue_address='1 Main St',
+            city_state='Duluth, MN', description='', image=SimpleUploadedFile('packing.png', buf.getvalue()),
+        )
+        self.assertEqual(Job.objects.filter(name='generate_event_variants').count(), 1)  # queued, not run inline
+        return event
+
+    def test_variants_at_each_width(self):
+        event = self.create_event((1500, 1000), 'RGBA')
+        self.assertTrue(generate_event_variants(event.pk))
+        event.refresh_from_db()
+        variants = event.image_variants
+        self.assertEqual((variants['source'], variants['width'], variants['height']), (event.image.name, 1500, 1000))
+        self.assertEqual([w for w, _name in variants['webp']], [320, 640, 1024])
+        self.assertEqual([w for w, _name in variants['jpeg']], [320, 640, 1024])
+        self.assertTrue(variants['placeholder'].startswith('data:image/jpeg;base64,'))
+        for width, name in variants['jpeg']:
+            with default_storage.open(name) as f, Image.open(f) as image:
+                self.assertEqual((image.format, image.size), ('JPEG', (width, round(1000 * width / 1500))))
+        self.assertFalse(generate_event_variants(event.pk))  # up to date
+        self.assertTrue(generate_event_variants(event.pk, force=True))
+
+    def test_small_images_are_not_upscaled(self):
+        event = self.create_event((500, 250))
+        generate_event_variants(event.pk)
+        event.refresh_from_db()
+        self.assertEqual([w for w, _name in event.image_variants['webp']], [320, 500])
+
+    def test_removing_the_image_deletes_its_variants(self):
+        event = self.create_event((400, 300))
+        generate_event_variants(event.pk)
+        event.refresh_from_db()
+        names = [name for _w, name in event.image_variants['jpeg']]
+        Event.objects.filter(pk=event.pk).update(image='')
+        self.assertTrue(generate_event_variants(event.pk))
+        self.assertEqual(Event.objects.get(pk=event.pk).image_variants, {})
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+
+    def test_picture_tag(self):
+        event = self.create_event((1500, 1000))
+        plain = event_image(event, sizes='50vw', **{'class': 'card-img-top'})
+        self.assertTrue(plain.startswith('<img src="/media/events/packing'))
+        self.assertNotIn('srcset', plain)
+        generate_event_variants(event.pk)
+        event.refresh_from_db()
+        html = event_image(event, sizes='50vw', **{'class': 'card-img-top'})
+        self.assertTrue(html.startswith('<picture><source type="image/webp" srcset="/media/events/variants/packing'))
+        self.assertIn('-320w.webp 320w, ', html)
+        self.assertIn('-1024w.jpg 1024w" sizes="50vw" width="1500" height="1000" class="card-img-top" alt="Packing day"', html)
+        self.assertIn("background-image: url(&#x27;data:image/jpeg;base64,", html)
+        event.image = 'events/replaced.png'  # variants of the old image are ignored
+        self.assertTrue(event_image(event).startswith('<img src="/media/events/replaced.png"'))
+
+
+class JobQueueTests(TestCase):
+    """Queued jobs are claimed once, retried with backoff and given up on after max_attempts."""
+
+    def setUp(self):
+        patcher = mock.patch.dict(jobs.JOBS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+        jobs.job('test_ok')(lambda **payload: self.calls.append(payload))
+        jobs.job('test_fail', max_attempts=2)(self.fail_job)
+
+    def fail_job(self, **payload):
+        raise RuntimeError('boom')
+
+    def test_claim_and_run(self):
+        queued = jobs.enqueue('test_ok', n=1)
+        later = jobs.enqueue('test_ok', delay=timedelta(minutes=5), n=2)
+        claimed = jobs.claim_jobs('w1', 10)
+        self.assertEqual(claimed, [queued])
+        self.assertEqual((claimed[0].status, claimed[0].attempts, claimed[0].locked_by), ('running', 1, 'w1'))
+        self.assertEqual(jobs.claim_jobs('w2', 10), [])  # already taken; `later` isn't due
+        self.assertIsNone(jobs.claim_job(queued.pk, 'w2'))
+        self.assertTrue(jobs.run_job(claimed[0]))
+        self.assertEqual(self.calls, [{'n': 1}])
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, 'done')
+        self.assertEqual(Job.objects.get(pk=later.pk).status, 'queued')
+
+    @skipUnless(connection.features.has_select_for_update_skip_locked, 'needs SKIP LOCKED')
+    def test_claim_skips_locked_rows(self):
+        jobs.enqueue('test_ok')
+        with CaptureQueriesContext(connection) as queries:
+            jobs.claim_jobs('w1', 10)
+        self.assertTrue(any('SKIP LOCKED' in q['sql'] for q in queries))
+
+    def test_failures_back_off_then_give_up(self):
+        queued = jobs.enqueue('test_fail')
+        before = timezone.now()
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertFalse(jobs.run_job(jobs.claim_job(queued.pk, 'w1')))
+        retry = Job.objects.get(pk=queued.pk)
+        self.assertEqual((retry.status, retry.attempts, retry.locked_by), ('queued', 1, ''))
+        self.assertIn('RuntimeError: boom', retry.last_error)
+        delay = (retry.run_after - before).total_seconds()
+        self.assertTrue(jobs.RETRY_BASE_DELAY * 0.9 <= delay <= jobs.RETRY_BASE_DELAY * 1.1 + 1, delay)
+        self.assertEqual(jobs.claim_jobs('w1', 10), [])  # not due yet
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertFalse(jobs.run_job(jobs.claim_job(queued.pk, 'w1')))
+        failed = Job.objects.get(pk=queued.pk)
+        self.assertEqual((failed.status, failed.attempts), ('failed', 2))
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        with mock.patch('core.jobs.random.uniform', return_value=1):
+            delays = [jobs.retry_delay(n).total_seconds() for n in (1, 2, 3, 20)]
+        self.assertEqual(delays, [jobs.RETRY_BASE_DELAY, jobs.RETRY_BASE_DELAY * 2, jobs.RETRY_BASE_DELAY * 4, jobs.RETRY_MAX_DELAY])
+
+    def test_unknown_job_fails_at_once(self):
+        unknown = Job.objects.create(name='no_such_job')
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertFalse(jobs.run_job(jobs.claim_job(unknown.pk, 'w1')))
+        self.assertEqual(Job.objects.get(pk=unknown.pk).status, 'failed')
+
+    def test_stale_running_jobs_are_requeued(self):
+        old = timezone.now() - jobs.STALE_AFTER - timedelta(minutes=1)
+        lost = Job.objects.create(name='test_ok', status='running', attempts=1, locked_at=old, locked_by='dead')
+        spent = Job.objects.create(name='test_ok', status='running', attempts=5, max_attempts=5, locked_at=old)
+        busy = Job.objects.create(name='test_ok', status='running', attempts=1, locked_at=timezone.now())
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(
+            [Job.objects.get(pk=j.pk).status for j in (lost, spent, busy)], ['queued', 'failed', 'running'],
+        )
+
+    def test_eager_jobs_run_after_commit(self):
+        with self.settings(JOBS_EAGER=True), self.captureOnCommitCallbacks(execute=True):
+            queued = jobs.enqueue('test_ok', n=3)
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [{'n': 3}])
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, 'done')
+        with self.settings(JOBS_EAGER=False), self.captureOnCommitCallbacks(execute=True) as callbacks:
+            jobs.enqueue('test_ok', n=4)
+        self.assertEqual(callbacks, [])  # left for the worker
+
+
+class SeedFakeDataTests(TestCase):
+    """seed_fake_data at a small --scale: valid rows, rebuilt totals, amounts that fit the schema."""
+
+    def seed(self, **options):
+        call_command('seed_fake_data', force=True, as_of=date(2026, 6, 1), stdout=io.StringIO(), **options)
+
+    def test_small_scale_run(self):
+        self.seed(scale=0.001, sites=5, partners=3)
+        self.assertEqual(VolunteerSignUp.objects.count(), 100)
+        self.assertEqual(Donation.objects.count(), 1000)
+        self.assertEqual(MealKitDistribution.objects.count(), 50)
+        self.assertEqual(get_user_model().objects.filter(is_staff=True).count(), 1)  # at least one author
+        goal = FundraisingGoal.objects.get(is_active=True)
+        self.assertEqual(goal.current_amount, Donation.objects.aggregate(total=Sum('amount'))['total'])
+        self.assertEqual(goal.meals_funded, MealKitDistribution.objects.aggregate(total=Sum('meal_kits_count'))['total'])
+        self.assertTrue(ImpactRollup.objects.exists())
+        for model in (Task, MealKitDistribution, FoodOrder, PartnerContact):
+            self.assertTrue(model.objects.exists(), model)
+
+    def test_same_seed_gives_same_rows(self):
+        self.seed(volunteers=20, donations=20, scale=0)
+        first = list(Donation.objects.order_by('pk').values_list('amount', 'received_at', 'donor_name'))
+        Donation.objects.all().delete()
+        self.seed(donations=20, scale=0)
+        self.assertEqual(list(Donation.objects.order_by('pk').values_list('amount', 'received_at', 'donor_name')), first)
+
+    def test_donation_amounts_scale_to_fit_the_goal(self):
+        with mock.patch('core.management.commands.seed_fake_data.MAX_SEEDED_TOTAL', 5000):
+            self.seed(donations=2000, scale=0)
+        total = FundraisingGoal.objects.get(is_active=True).current_amount
+        self.assertLess(total, 5000 * Decimal('1.1'))  # the headroom the real limit leaves
+        self.assertGreater(total, 4000)
+
+
+class BenchmarkCommandTests(TestCase):
+    """The bench_* commands run at a small size and leave no rows behind."""
+
+    def bench(self, name, **options):
+        out = io.StringIO()
+        call_command(name, stdout=out, **options)
+        return out.getvalue()
+
+    def test_bench_kanban(self):
+        output = self.bench('bench_kanban', tasks=30, staff=2, repeat=2)
+        self.assertRegex(output, r'/dashboard/tasks/: \d+ queries, mean')
+        self.assertRegex(output, r'/dashboard/: \d+ queries, mean')
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_bench_volunteer_search(self):
+        output = self.bench('bench_volunteer_search', volunteers=50, repeat=2)
+        self.assertRegex(output, r'50 sign-ups, \w+, search: ')
+        self.assertRegex(output, r"'ana cruz': \d+ matches; ranked mean")
+        self.assertFalse(VolunteerSignUp.objects.exists())
+
+    def test_bench_assignment(self):
+        site = DistributionSite.objects.create(name='Real site', city_state='Duluth, MN', capacity_volunteers=5)
+        output = self.bench('bench_assignment', volunteers=200, sites=3, repeat=2)
+        self.assertRegex(output, r'200 pending sign-ups, 3 sites, room for \d+')
+        self.assertRegex(output, r'plan: \d+ placed, \d+ left pending; \d+ queries, mean')
+        self.assertRegex(output, r'apply: \d+ rows updated')
+        self.assertEqual(list(DistributionSite.objects.all()), [site])
+        self.assertTrue(DistributionSite.objects.get().is_active)
+        self.assertFalse(VolunteerSignUp.objects.exists())
+
+    def test_bench_coming_soon(self):
+        output = self.bench('bench_coming_soon', requests=5)
+        self.assertRegex(output, r'no cookie: [\d,]+ req/s, status 200')
+        self.assertRegex(output, r'If-None-Match: [\d,]+ req/s, status 304')
+        self.assertRegex(output, r'stale session cookie: [\d,]+ req/s, status 200')
+        with self.settings(MIDDLEWARE=PUBLIC_MIDDLEWARE), self.assertRaises(CommandError):
+            self.bench('bench_coming_soon', requests=5)
@@ -0,0 +1,89 @@
+"""
+Running fundraising totals on the active FundraisingGoal.
+current_amount, meals_funded and volunteers_count are derived from Donation,
+MealKitDistribution and VolunteerSignUp rows: each save/delete applies its delta with an
+atomic F() update (see core/signals.py), so no page ever needs a full-table SUM.
+Run `python manage.py recompute_totals` to rebuild them from scratch.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import invalidate_page_cache
+from .models import FundraisingGoal, Donation, MealKitDistribution, VolunteerSignUp
+
+ZERO = (Decimal('0'), 0, 0)
+
+# Fields each model's contribution is computed from (read straight from __dict__ so
+# deferred fields are never loaded just to track totals).
+TRACKED_FIELDS = {
+    Donation: ('amount',),
+    MealKitDistribution: ('meal_kits_count',),
+    VolunteerSignUp: ('status',),
+}
+
+
+def contribution(instance, data=None):
+    """
+    (amount, meals, volunteers) this row adds to the totals, or None if fields are deferred.
+    `data` is read instead of the current values if given (e.g. instance._loaded_values).
+    """
+    data = instance.__dict__ if data is None else data
+    fields = TRACKED_FIELDS[type(instance)]
+    if any(name not in data for name in fields):
+        return None
+    if isinstance(instance, Donation):
+        return (Decimal(data['amount'] or 0), 0, 0)
+    if isinstance(instance, MealKitDistribution):
+        return (Decimal('0'), data['meal_kits_count'] or 0, 0)
+    return (Decimal('0'), 0, 0 if data['status'] == 'inactive' else 1)
+
+
+def stored_contribution(model, pk):
+    """Contribution of the row as currently stored in the DB (fallback for deferred instances)."""
+    values = model.objects.filter(pk=pk).values(*TRACKED_FIELDS[model]).first()
+    if values is None:
+        return ZERO
+    return contribution(model(), values)
+
+
+def apply_delta(amount=Decimal('0'), meals=0, volunteers=0):
+    """
+    Atomically add deltas to the active goal; concurrent writers never lose updates.
+    Returns whether anything changed. .update() sends no signals, so callers invalidate the
+    cached public pages after commit, once per save however many deltas it applied.
+    """
+    if not (amount or meals or volunteers):
+        return False
+    FundraisingGoal.objects.filter(is_active=True).update(
+        current_amount=F('current_amount') + amount,
+        meals_funded=F('meals_funded') + meals,
+        volunteers_count=F('volunteers_count') + volunteers,
+        last_updated=timezone.now(),
+    )
+    return True
+
+
+def set_totals(amount, meals, volunteers):
+    """Overwrite the active goal's totals (used by recompute_totals)."""
+    FundraisingGoal.objects.filter(is_active=True).update(
+        current_amount=amount,
+        meals_funded=meals,
+        volunteers_count=volunteers,
+        last_updated=timezone.now(),
+    )
+    transaction.on_commit(invalidate_page_cache)
+
+
+def progress_percent(goal):
+    """Percent of target raised, capped at 100; 0 when there is no goal or no target."""
+    if not goal:
+        return 0
+    try:
+        pct = float(goal.current_amount / goal.target_amount * 100)
+        return min(100.0, round(pct, 1))
+    except (ZeroDivisionError, TypeError, ArithmeticError):
+        return 0
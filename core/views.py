@@ -1,44 +1,73 @@
 """
 Views for All Minnesota: public pages (no auth) and admin dashboard (LoginRequiredMixin).
-Traditional server-rendered Django only; no API endpoints.
+Traditional server-rendered Django, plus a small JSON endpoint for moving kanban cards.
 """
 
 from decimal import Decimal
 from django.shortcuts import render, redirect, get_object_or_404
+from django.views import View
 from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
-from django.db.models import Q
-
-from django.contrib.auth import get_user_model
-from .models import FundraisingGoal, Event, VolunteerSignUp, ContactMessage, ImpactUpdate, Task
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import JsonResponse
+
+from .analytics import DEFAULT_MONTHS, get_panels
+from .cache import ConditionalGetMixin, PageCacheMixin
+from .dedup import merge_volunteers
+from .geo import KM_PER_MILE, geocode_match, nearest_sites
+from .pagination import CursorPaginationMixin
+from .ratelimit import RateLimitMixin, counters as ratelimit_counters
+from .search import search_volunteers
+from .notifications import queue_staff_notification
+from .kanban import build_board, card_state, move_task, MoveConflict
+from .staff import get_staff_user
+from .rollups import MAX_POINTS, impact_series
+from .totals import progress_percent
+from .models import (
+    FundraisingGoal, Event, VolunteerSignUp, DuplicateCandidate, ContactMessage, ImpactRollup, ImpactUpdate, Task,
+)
 from .forms import VolunteerForm, ContactForm, GoalUpdateForm, EventForm, TaskForm
 
-User = get_user_model()
-
 
 # ---------------------------------------------------------------------------
 # PUBLIC VIEWS (no login required)
 # ---------------------------------------------------------------------------
 
-class HomeView(TemplateView):
-    """Home page: hero, progress bar, about snippet, upcoming events, CTA."""
+def _goal_state():
+    """(pk, last_updated) of the active goal; last_updated moves with every totals change."""
+    return FundraisingGoal.objects.filter(is_active=True).values_list('pk', 'last_updated').first()
+
+
+def _upcoming_events_state():
+    """Count and newest change of upcoming published events; the count drops as events start."""
+    return Event.objects.filter(is_published=True, date__gte=timezone.now()).aggregate(
+        count=Count('pk'), latest=Max('updated_at'),
+    )
+
+
+def _latest(*timestamps):
+    timestamps = [t for t in timestamps if t]
+    return max(timestamps) if timestamps else None
+
+
+class HomeView(PageCacheMixin, ConditionalGetMixin, TemplateView):
+    """Home page: hero, progress bar, about snippet, upcoming events, CTA. Cached for anonymous visitors."""
     template_name = 'core/home.html'
+    page_cache_tracks_events = True
+
+    def get_validators(self):
+        goal, events = _goal_state(), _upcoming_events_state()
+        return (goal, events), _latest(goal and goal[1], events['latest'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         goal = FundraisingGoal.objects.filter(is_active=True).first()
         context['goal'] = goal
-        if goal:
-            try:
-                pct = float(goal.current_amount / goal.target_amount * 100)
-                context['progress_percent'] = min(100.0, round(pct, 1))
-            except (ZeroDivisionError, TypeError):
-                context['progress_percent'] = 0
-        else:
-            context['progress_percent'] = 0
+        context['progress_percent'] = progress_percent(goal)
         # Upcoming published events (date >= today)
         context['upcoming_events'] = Event.objects.filter(
             is_published=True,
@@ -52,12 +81,17 @@ class AboutView(TemplateView):
     template_name = 'core/about.html'
 
 
-class EventsView(ListView):
-    """List upcoming published events (date >= now) ordered by date."""
+class EventsView(PageCacheMixin, ConditionalGetMixin, ListView):
+    """List upcoming published events (date >= now) ordered by date. Cached for anonymous visitors."""
     model = Event
+    page_cache_tracks_events = True
     template_name = 'core/events/list.html'
     context_object_name = 'events'
 
+    def get_validators(self):
+        events = _upcoming_events_state()
+        return events, events['latest']
+
     def get_queryset(self):
         return Event.objects.filter(
             is_published=True,
@@ -65,12 +99,18 @@ class EventsView(ListView):
         ).order_by('date')
 
 
-class EventDetailView(DetailView):
+class EventDetailView(ConditionalGetMixin, DetailView):
     """Single event detail page."""
     model = Event
     template_name = 'core/events/detail.html'
     context_object_name = 'event'
 
+    def get_validators(self):
+        updated_at = self.get_queryset().filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None  # let get() raise the 404
+        return updated_at, updated_at
+
     def get_queryset(self):
         return Event.objects.filter(is_published=True)
 
@@ -80,28 +120,69 @@ class HowItWorksView(TemplateView):
     template_name = 'core/how_it_works.html'
 
 
-class ImpactView(TemplateView):
-    """Public impact page: KPIs and last 10 ImpactUpdate records."""
+class ImpactView(PageCacheMixin, ConditionalGetMixin, TemplateView):
+    """Public impact page: KPIs and last 10 ImpactUpdate records. Cached for anonymous visitors."""
     template_name = 'core/impact.html'
 
+    def get_validators(self):
+        goal = _goal_state()
+        updates = ImpactUpdate.objects.aggregate(count=Count('pk'), latest=Max('updated_at'))
+        return (goal, updates), _latest(goal and goal[1], updates['latest'])
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         goal = FundraisingGoal.objects.filter(is_active=True).first()
         context['goal'] = goal
-        if goal:
-            try:
-                pct = float(goal.current_amount / goal.target_amount * 100)
-                context['progress_percent'] = min(100.0, round(pct, 1))
-            except (ZeroDivisionError, TypeError):
-                context['progress_percent'] = 0
-        else:
-            context['progress_percent'] = 0
+        context['progress_percent'] = progress_percent(goal)
         context['impact_updates'] = ImpactUpdate.objects.select_related('updated_by').order_by('-updated_at')[:10]
         return context
 
 
-class VolunteerView(FormView):
+class ImpactSeriesView(View):
+    """
+    JSON for the impact chart: GET ?period=day|week&points=N (default week, 52 points).
+    Built from the rollup tables and cached until the totals change.
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request, *args, **kwargs):
+        period = request.GET.get('period', 'week')
+        if period not in dict(ImpactRollup.PERIOD_CHOICES):
+            return JsonResponse({'error': 'Unknown period.'}, status=400)
+        try:
+            points = min(MAX_POINTS, max(2, int(request.GET.get('points', 52))))
+        except ValueError:
+            return JsonResponse({'error': 'points must be a number.'}, status=400)
+        response = JsonResponse({'period': period, 'series': impact_series(period, points)})
+        response['Cache-Control'] = 'public, max-age=300'
+        return response
+
+
+class SitesNearView(TemplateView):
+    """Public lookup: nearest active distribution sites to a ZIP code or city (?q=)."""
+    template_name = 'core/sites_near.html'
+    max_results = 5
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()[:100]
+        context['query'] = query
+        if query:
+            point, kind = geocode_match(query)
+            context['found'] = point is not None
+            # Only the ZIP prefix matched: the point is the middle of a large area
+            context['approximate'] = kind == 'zip3'
+            if point:
+                context['sites'] = [
+                    (site, km / KM_PER_MILE) for site, km in nearest_sites(*point, k=self.max_results)
+                ]
+        return context
+
+
+class VolunteerView(RateLimitMixin, FormView):
     """GET: show volunteer form. POST handled by VolunteerSubmitView."""
+    ratelimit_scope = 'volunteer'
+    ratelimit_rates = {'ip': '5/10m', 'email': '3/d'}
     template_name = 'core/volunteer.html'
     form_class = VolunteerForm
     success_url = reverse_lazy('core:volunteer')
@@ -112,13 +193,16 @@ class VolunteerView(FormView):
     def post(self, request, *args, **kwargs):
         form = VolunteerForm(request.POST)
         if form.is_valid():
-            form.save()
+            volunteer = form.save()
+            queue_staff_notification('volunteer', volunteer)
             return redirect(reverse('core:volunteer') + '?submitted=1')
         return render(request, self.template_name, {'form': form})
 
 
-class ContactView(FormView):
+class ContactView(RateLimitMixin, FormView):
     """GET: show contact form."""
+    ratelimit_scope = 'contact'
+    ratelimit_rates = {'ip': '5/10m', 'email': '5/h'}
     template_name = 'core/contact.html'
     form_class = ContactForm
     success_url = reverse_lazy('core:contact')
@@ -129,7 +213,8 @@ class ContactView(FormView):
     def post(self, request, *args, **kwargs):
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            contact = form.save()
+            queue_staff_notification('contact', contact)
             return redirect(reverse('core:contact') + '?submitted=1')
         return render(request, self.template_name, {'form': form})
 
@@ -150,28 +235,9 @@ class AdminDashboardView(LoginRequiredMixin, TemplateView):
         context['recent_contacts'] = ContactMessage.objects.all()[:10]
         context['events'] = Event.objects.all().order_by('-date')
         context['recent_impact'] = ImpactUpdate.objects.select_related('updated_by').order_by('-updated_at')[:5]
+        context['ratelimit_counts'] = ratelimit_counters(['volunteer', 'contact'])
         # Kanban board: tasks by status (optional filter by assigned user)
-        staff_users = User.objects.filter(is_staff=True).order_by('first_name', 'username')
-        tasks = Task.objects.select_related('assigned_to').all()
-        raw_id = self.request.GET.get('assigned_to', '').strip()
-        filter_assigned_to_id = None
-        filter_user = None
-        if raw_id:
-            try:
-                uid = int(raw_id)
-                if staff_users.filter(pk=uid).exists():
-                    tasks = tasks.filter(assigned_to_id=uid)
-                    filter_user = User.objects.get(pk=uid)
-                    filter_assigned_to_id = uid
-            except (ValueError, User.DoesNotExist):
-                pass
-        context['filter_assigned_to_id'] = filter_assigned_to_id
-        context['filter_user'] = filter_user
-        context['backlog'] = tasks.filter(status='backlog').order_by('-order', 'created_at')
-        context['to_do'] = tasks.filter(status='to_do').order_by('-order', 'created_at')
-        context['in_progress'] = tasks.filter(status='in_progress').order_by('-order', 'created_at')
-        context['done'] = tasks.filter(status='done').order_by('-order', 'created_at')
-        context['staff_users'] = staff_users
+        context.update(build_board(self.request.GET.get('assigned_to', '')))
         return context
 
     def post(self, request, *args, **kwargs):
@@ -199,8 +265,28 @@ class AdminDashboardView(LoginRequiredMixin, TemplateView):
         return redirect(redirect_url)
 
 
+class AnalyticsView(LoginRequiredMixin, TemplateView):
+    """Operations analytics: GROUP BY panels from core.analytics, cached until the data changes."""
+    template_name = 'core/admin/analytics.html'
+    login_url = '/admin/login/'
+    month_choices = (6, 12, DEFAULT_MONTHS, 60)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        months = _optional_int(self.request.GET.get('months'))
+        if months not in self.month_choices:
+            months = DEFAULT_MONTHS
+        context['months'] = months
+        context['month_choices'] = self.month_choices
+        context['panels'] = {panel['name']: panel for panel in get_panels(months)}
+        return context
+
+
 class GoalUpdateView(LoginRequiredMixin, UpdateView):
-    """Form to edit current_amount, meals_funded, volunteers_count; on save create ImpactUpdate."""
+    """
+    Form to edit goal title and target; on save create ImpactUpdate from the running totals.
+    Totals (current_amount, meals_funded, volunteers_count) are maintained by core.totals.
+    """
     model = FundraisingGoal
     form_class = GoalUpdateForm
     template_name = 'core/admin/goal_update.html'
@@ -212,16 +298,19 @@ class GoalUpdateView(LoginRequiredMixin, UpdateView):
         return get_object_or_404(FundraisingGoal, is_active=True)
 
     def form_valid(self, form):
-        response = super().form_valid(form)
-        # Create ImpactUpdate with updated_by = request.user
+        # Save only the edited fields so concurrent F() increments to the totals are kept
+        self.object = form.save(commit=False)
+        self.object.save(update_fields=[*form.Meta.fields, 'last_updated'])
+        self.object.refresh_from_db(fields=['current_amount', 'meals_funded', 'volunteers_count'])
+        # Create ImpactUpdate snapshot with updated_by = request.user
         ImpactUpdate.objects.create(
-            amount_raised=form.cleaned_data['current_amount'],
-            meals_funded=form.cleaned_data['meals_funded'],
-            volunteers=form.cleaned_data['volunteers_count'],
+            amount_raised=self.object.current_amount,
+            meals_funded=self.object.meals_funded,
+            volunteers=self.object.volunteers_count,
             updated_by=self.request.user,
         )
         messages.success(self.request, 'Goal updated and impact record created.')
-        return response
+        return redirect(self.get_success_url())
 
 
 class EventCreateView(LoginRequiredMixin, CreateView):
@@ -264,8 +353,8 @@ class EventDeleteView(LoginRequiredMixin, DeleteView):
         return super().form_valid(form)
 
 
-class VolunteerListView(LoginRequiredMixin, ListView):
-    """Paginated list of VolunteerSignUp, searchable by name/email."""
+class VolunteerListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
+    """Cursor-paginated list of VolunteerSignUp; search (name, email, availability, notes) is ranked by relevance."""
     model = VolunteerSignUp
     template_name = 'core/admin/volunteer_list.html'
     context_object_name = 'volunteers'
@@ -273,22 +362,64 @@ class VolunteerListView(LoginRequiredMixin, ListView):
     login_url = '/admin/login/'
 
     def get_queryset(self):
-        qs = VolunteerSignUp.objects.all()
         q = self.request.GET.get('q', '').strip()
         if q:
-            qs = qs.filter(
-                Q(first_name__icontains=q) | Q(last_name__icontains=q) | Q(email__icontains=q)
-            )
-        return qs.order_by('-submitted_at')
+            return search_volunteers(q)
+        return VolunteerSignUp.objects.select_related('site').order_by('-submitted_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['search_query'] = self.request.GET.get('q', '')
+        # Ranked search keeps the best MAX_RESULTS matches; say so when there were more
+        if getattr(self.object_list, 'truncated', False):
+            context['search_truncated_at'] = len(self.object_list)
+        # Nearest site in the volunteer's region, from the in-memory site index (no queries)
+        for volunteer in context['volunteers']:
+            nearest = None
+            if volunteer.latitude is not None:
+                nearest = next(iter(nearest_sites(volunteer.latitude, volunteer.longitude, 1, region=volunteer.region)), None)
+            volunteer.nearest_site = nearest and (nearest[0], nearest[1] / KM_PER_MILE)
         return context
 
 
-class ContactListView(LoginRequiredMixin, ListView):
-    """Paginated list of ContactMessage records."""
+class DuplicateListView(LoginRequiredMixin, ListView):
+    """Open duplicate candidates (core/dedup.py), most likely first, each pair side by side."""
+    model = DuplicateCandidate
+    template_name = 'core/admin/duplicate_list.html'
+    context_object_name = 'candidates'
+    paginate_by = 20
+    login_url = '/admin/login/'
+
+    def get_queryset(self):
+        return (
+            DuplicateCandidate.objects.filter(status='open')
+            .select_related('first__site', 'second__site')
+            .order_by('-score', 'pk')
+        )
+
+
+class DuplicateResolveView(LoginRequiredMixin, View):
+    """POST action=keep_first|keep_second (merge the pair into that sign-up) or action=dismiss."""
+    login_url = '/admin/login/'
+
+    def post(self, request, pk):
+        candidate = get_object_or_404(
+            DuplicateCandidate.objects.select_related('first', 'second'), pk=pk, status='open',
+        )
+        action = request.POST.get('action')
+        if action in ('keep_first', 'keep_second'):
+            keep = candidate.first if action == 'keep_first' else candidate.second
+            merge_volunteers(candidate, keep)
+            messages.success(request, f'Merged into {keep} ({keep.email}).')
+        elif action == 'dismiss':
+            candidate.status = 'dismissed'
+            candidate.save(update_fields=['status'])
+            messages.success(request, 'Marked as not a duplicate.')
+        return redirect('core:duplicate_list')
+
+
+class ContactListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
+    """Cursor-paginated list of ContactMessage records."""
     model = ContactMessage
     template_name = 'core/admin/contact_list.html'
     context_object_name = 'contacts'
@@ -310,27 +441,7 @@ class KanbanBoardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        staff_users = User.objects.filter(is_staff=True).order_by('first_name', 'username')
-        tasks = Task.objects.select_related('assigned_to').all()
-        raw_id = self.request.GET.get('assigned_to', '').strip()
-        filter_assigned_to_id = None
-        filter_user = None
-        if raw_id:
-            try:
-                uid = int(raw_id)
-                if staff_users.filter(pk=uid).exists():
-                    tasks = tasks.filter(assigned_to_id=uid)
-                    filter_user = User.objects.get(pk=uid)
-                    filter_assigned_to_id = uid
-            except (ValueError, User.DoesNotExist):
-                pass
-        context['filter_assigned_to_id'] = filter_assigned_to_id
-        context['filter_user'] = filter_user
-        context['backlog'] = tasks.filter(status='backlog').order_by('-order', 'created_at')
-        context['to_do'] = tasks.filter(status='to_do').order_by('-order', 'created_at')
-        context['in_progress'] = tasks.filter(status='in_progress').order_by('-order', 'created_at')
-        context['done'] = tasks.filter(status='done').order_by('-order', 'created_at')
-        context['staff_users'] = staff_users
+        context.update(build_board(self.request.GET.get('assigned_to', '')))
         return context
 
     def post(self, request, *args, **kwargs):
@@ -358,6 +469,52 @@ class KanbanBoardView(LoginRequiredMixin, TemplateView):
         return redirect(redirect_url)
 
 
+def _optional_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TaskMoveView(LoginRequiredMixin, View):
+    """
+    JSON endpoint for drag-and-drop: change status, reassign and/or reorder one task.
+    POST fields: status, assigned_to, above_id, below_id (neighbours after the drop) and
+    updated_at (as loaded by the client; a mismatch returns 409 with the current card).
+    """
+    login_url = '/admin/login/'
+    raise_exception = True
+    http_method_names = ['post']
+
+    def post(self, request, pk):
+        status = request.POST.get('status') or None
+        if status and status not in dict(Task.STATUS_CHOICES):
+            return JsonResponse({'error': 'Invalid status.'}, status=400)
+        assigned_to = ...
+        if 'assigned_to' in request.POST:
+            assigned_to = _optional_int(request.POST['assigned_to'])
+            if assigned_to is not None and get_staff_user(assigned_to) is None:
+                return JsonResponse({'error': 'Unknown staff user.'}, status=400)
+        with transaction.atomic():
+            task = get_object_or_404(Task.objects.select_for_update(), pk=pk)
+            try:
+                move_task(
+                    task,
+                    status=status,
+                    assigned_to=assigned_to,
+                    above_id=_optional_int(request.POST.get('above_id')),
+                    below_id=_optional_int(request.POST.get('below_id')),
+                    expected_updated_at=request.POST.get('updated_at'),
+                )
+            except MoveConflict:
+                return JsonResponse(
+                    {'error': 'This task was changed by someone else. Reload to see the latest board.',
+                     'task': card_state(task)},
+                    status=409,
+                )
+        return JsonResponse({'task': card_state(task)})
+
+
 class TaskCreateView(LoginRequiredMixin, CreateView):
     """Create a new task."""
     model = Task
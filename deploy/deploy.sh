@@ -3,7 +3,8 @@
 set -e
 cd /var/www/allminnesota
 sudo -u allminnesota git pull
-sudo -u allminnesota bash -c 'cd /var/www/allminnesota && source venv/bin/activate && pip install -r requirements.txt && python manage.py migrate && python manage.py collectstatic --noinput'
+sudo -u allminnesota bash -c 'cd /var/www/allminnesota && source venv/bin/activate && pip install -r requirements.txt && python manage.py migrate && python manage.py build_assets && python manage.py generate_event_images && python manage.py shell -c "from core.cache import invalidate_page_cache; invalidate_page_cache()"'
 sudo chmod -R o+rX /var/www/allminnesota/staticfiles /var/www/allminnesota/media 2>/dev/null || true
 sudo systemctl restart gunicorn-allminnesota
+sudo systemctl restart allminnesota-worker 2>/dev/null || true
 echo "Deploy done."